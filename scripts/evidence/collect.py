@@ -4,21 +4,23 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-try:
-    import yaml
-except Exception as exc:  # noqa: BLE001
-    raise SystemExit(
-        f"PyYAML is required. Install with: uvx --with pyyaml python <script>\n{exc}"
-    )
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lib"))
+
+import yaml_io  # noqa: E402
+
+
+MANIFEST_VERSION = 1
 
 
 def load_yaml(path: Path) -> dict[str, Any]:
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    data = yaml_io.safe_load(path.read_text(encoding="utf-8"))
     if data is None:
         data = {}
     if not isinstance(data, dict):
@@ -112,35 +114,197 @@ def write_summary(records: list[dict[str, Any]], out_path: Path) -> None:
     out_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(
-        description="Collect evidence YAML records into JSON index"
-    )
-    parser.add_argument("--records-dir", default="evidence/records", type=Path)
-    parser.add_argument("--out", default="evidence/index.json", type=Path)
-    parser.add_argument("--summary", default="evidence/summary/latest.md", type=Path)
-    args = parser.parse_args()
+def load_record_map(
+    records_dir: Path, root: Path | None = None
+) -> dict[str, dict[str, Any]]:
+    """Load every record under records_dir keyed by its index ``_recordPath``.
 
-    records: list[dict[str, Any]] = []
-    for path in sorted(args.records_dir.glob("*.yaml")):
+    Paths are reported relative to ``root`` (the current directory by default)
+    so in-process callers produce the same index as the CLI run from the repo.
+    """
+    base = records_dir if root is None else root / records_dir
+    records: dict[str, dict[str, Any]] = {}
+    for path in sorted(base.glob("*.yaml")):
         if not path.is_file():
             continue
         try:
-            record = load_yaml(path)
-            record["_recordPath"] = str(path)
-            records.append(record)
+            records[str(records_dir / path.name)] = load_yaml(path)
         except Exception as exc:  # noqa: BLE001
             raise SystemExit(f"failed to load {path}: {exc}")
+    return records
+
 
+def build_index(record_map: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
+    records: list[dict[str, Any]] = []
+    for record_path, record in record_map.items():
+        records.append({**record, "_recordPath": record_path})
     records.sort(key=record_timestamp, reverse=True)
+    return records
 
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(
+
+def write_index(records: list[dict[str, Any]], out_path: Path) -> None:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(
         json.dumps(records, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
     )
+
+
+def default_manifest_path(out_path: Path) -> Path:
+    return out_path.with_name(f"{out_path.stem}.manifest.json")
+
+
+def file_fingerprint(path: Path, data: bytes | None = None) -> dict[str, Any]:
+    stat = path.stat()
+    if data is None:
+        data = path.read_bytes()
+    return {
+        "size": stat.st_size,
+        "mtimeNs": stat.st_mtime_ns,
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def load_cached_index(
+    records_dir: Path, index_path: Path, manifest_path: Path
+) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
+    """Return (records, fingerprints) from a previous run, or empty dicts.
+
+    The cache is only trusted when the manifest was written for the same
+    records dir and the index file still hashes to what the manifest recorded.
+    """
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        index_bytes = index_path.read_bytes()
+    except (OSError, ValueError):
+        return {}, {}
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("recordsDir") != str(records_dir)
+        or manifest.get("indexSha256") != hashlib.sha256(index_bytes).hexdigest()
+        or not isinstance(manifest.get("files"), dict)
+    ):
+        return {}, {}
+
+    try:
+        index = json.loads(index_bytes.decode("utf-8"))
+    except ValueError:
+        return {}, {}
+    if not isinstance(index, list):
+        return {}, {}
+
+    records: dict[str, dict[str, Any]] = {}
+    for item in index:
+        if not isinstance(item, dict) or not isinstance(item.get("_recordPath"), str):
+            return {}, {}
+        records[item["_recordPath"]] = {
+            key: value for key, value in item.items() if key != "_recordPath"
+        }
+    fingerprints = manifest["files"]
+    if set(records) != set(fingerprints):
+        return {}, {}
+    return records, fingerprints
+
+
+def load_record_map_incremental(
+    records_dir: Path,
+    index_path: Path,
+    manifest_path: Path,
+    root: Path | None = None,
+) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]], int]:
+    """Like load_record_map, but only re-parse files whose content changed.
+
+    Files whose (size, mtime) match the manifest are taken from the previous
+    index as-is; otherwise the sha256 decides. Returns the record map, the new
+    file fingerprints and the number of YAML files actually parsed.
+    """
+    cached, previous = load_cached_index(records_dir, index_path, manifest_path)
+    base = records_dir if root is None else root / records_dir
+    records: dict[str, dict[str, Any]] = {}
+    fingerprints: dict[str, dict[str, Any]] = {}
+    parsed = 0
+    for path in sorted(base.glob("*.yaml")):
+        if not path.is_file():
+            continue
+        record_path = str(records_dir / path.name)
+        old = previous.get(record_path)
+        stat = path.stat()
+        if (
+            isinstance(old, dict)
+            and old.get("size") == stat.st_size
+            and old.get("mtimeNs") == stat.st_mtime_ns
+        ):
+            records[record_path] = cached[record_path]
+            fingerprints[record_path] = old
+            continue
+
+        fingerprint = file_fingerprint(path)
+        fingerprints[record_path] = fingerprint
+        if isinstance(old, dict) and old.get("sha256") == fingerprint["sha256"]:
+            records[record_path] = cached[record_path]
+            continue
+        try:
+            records[record_path] = load_yaml(path)
+        except Exception as exc:  # noqa: BLE001
+            raise SystemExit(f"failed to load {path}: {exc}")
+        parsed += 1
+    return records, fingerprints, parsed
+
+
+def write_manifest(
+    manifest_path: Path,
+    records_dir: Path,
+    fingerprints: dict[str, dict[str, Any]],
+    index_path: Path,
+) -> None:
+    payload = {
+        "version": MANIFEST_VERSION,
+        "recordsDir": str(records_dir),
+        "indexSha256": hashlib.sha256(index_path.read_bytes()).hexdigest(),
+        "files": dict(sorted(fingerprints.items())),
+    }
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(
+        json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Collect evidence YAML records into JSON index"
+    )
+    parser.add_argument("--records-dir", default="evidence/records", type=Path)
+    parser.add_argument("--out", default="evidence/index.json", type=Path)
+    parser.add_argument("--summary", default="evidence/summary/latest.md", type=Path)
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="reuse the previous index for records whose file content is unchanged",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=None,
+        help="sidecar fingerprint manifest (default: <out stem>.manifest.json)",
+    )
+    args = parser.parse_args()
+
+    if args.incremental:
+        manifest_path = args.manifest or default_manifest_path(args.out)
+        record_map, fingerprints, parsed = load_record_map_incremental(
+            args.records_dir, args.out, manifest_path
+        )
+    else:
+        record_map = load_record_map(args.records_dir)
+        parsed = len(record_map)
+
+    records = build_index(record_map)
+    write_index(records, args.out)
     write_summary(records, args.summary)
+    if args.incremental:
+        write_manifest(manifest_path, args.records_dir, fingerprints, args.out)
 
-    print(f"wrote {args.out} ({len(records)} records)")
+    print(f"wrote {args.out} ({len(records)} records, {parsed} parsed)")
     print(f"wrote {args.summary}")
     return 0
 
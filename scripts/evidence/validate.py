@@ -9,12 +9,9 @@ import sys
 from pathlib import Path
 from typing import Any
 
-try:
-    import yaml
-except Exception as exc:  # noqa: BLE001
-    raise SystemExit(
-        f"PyYAML is required. Install with: uvx --with pyyaml python <script>\n{exc}"
-    )
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lib"))
+
+import yaml_io  # noqa: E402
 
 try:
     import jsonschema
@@ -24,7 +21,7 @@ except Exception:  # noqa: BLE001
 
 def load_yaml(path: Path) -> dict[str, Any]:
     text = path.read_text(encoding="utf-8")
-    data = yaml.safe_load(text)
+    data = yaml_io.safe_load(text)
     if data is None:
         data = {}
     if not isinstance(data, dict):
@@ -36,6 +33,50 @@ def record_files(records_dir: Path) -> list[Path]:
     return sorted([p for p in records_dir.glob("*.yaml") if p.is_file()])
 
 
+REQUIRED_FIELDS = [
+    ("evidenceId",),
+    ("service",),
+    ("env",),
+    ("source", "repo"),
+    ("source", "commit"),
+    ("image", "deployed"),
+    ("deploy", "deployRepoCommit"),
+]
+
+
+def load_schema(schema_path: Path) -> dict[str, Any]:
+    return json.loads(schema_path.read_text(encoding="utf-8"))
+
+
+def validate_record(data: dict[str, Any], schema: dict[str, Any]) -> None:
+    if jsonschema is not None:
+        jsonschema.validate(instance=data, schema=schema)
+        return
+
+    # Fallback minimal checks if jsonschema package is unavailable locally.
+    for key_path in REQUIRED_FIELDS:
+        node: Any = data
+        for key in key_path:
+            if not isinstance(node, dict) or key not in node:
+                raise ValueError(f"missing required field: {'.'.join(key_path)}")
+            node = node[key]
+        if node in ("", None):
+            raise ValueError(f"empty required field: {'.'.join(key_path)}")
+
+
+def validate_records(
+    records: dict[Path, dict[str, Any]], schema: dict[str, Any]
+) -> list[tuple[Path, str]]:
+    """Validate already-loaded records; return (path, error) for each failure."""
+    bad: list[tuple[Path, str]] = []
+    for path, data in records.items():
+        try:
+            validate_record(data, schema)
+        except Exception as exc:  # noqa: BLE001
+            bad.append((path, str(exc)))
+    return bad
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Validate evidence YAML records")
     parser.add_argument("--records-dir", default="evidence/records", type=Path)
@@ -44,7 +85,7 @@ def main() -> int:
     )
     args = parser.parse_args()
 
-    schema = json.loads(args.schema.read_text(encoding="utf-8"))
+    schema = load_schema(args.schema)
     files = record_files(args.records_dir)
 
     bad: list[tuple[Path, str]] = []
@@ -52,29 +93,7 @@ def main() -> int:
     for path in files:
         try:
             data = load_yaml(path)
-            if jsonschema is not None:
-                jsonschema.validate(instance=data, schema=schema)
-            else:
-                # Fallback minimal checks if jsonschema package is unavailable locally.
-                required = [
-                    ("evidenceId",),
-                    ("service",),
-                    ("env",),
-                    ("source", "repo"),
-                    ("source", "commit"),
-                    ("image", "deployed"),
-                    ("deploy", "deployRepoCommit"),
-                ]
-                for key_path in required:
-                    node: Any = data
-                    for key in key_path:
-                        if not isinstance(node, dict) or key not in node:
-                            raise ValueError(
-                                f"missing required field: {'.'.join(key_path)}"
-                            )
-                        node = node[key]
-                    if node in ("", None):
-                        raise ValueError(f"empty required field: {'.'.join(key_path)}")
+            validate_record(data, schema)
         except Exception as exc:  # noqa: BLE001
             bad.append((path, str(exc)))
 
@@ -4,17 +4,32 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import contextlib
+import difflib
+import functools
+import hashlib
 import json
-from dataclasses import dataclass
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, get_args, get_origin, get_type_hints
 
 try:
-    import yaml
+    import yaml  # noqa: F401
 except ImportError as exc:
     raise SystemExit(
         "缺少 PyYAML，请使用 `uvx --with pyyaml python scripts/factory/onboard_services.py` 运行。"
     ) from exc
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lib"))
+
+import compiled_catalog  # noqa: E402
+import yaml_io  # noqa: E402
+
 
 SERVICE_MAP_FILES: dict[str, Path] = {
     "default": Path("release/services.yaml"),
@@ -36,6 +51,10 @@ DEFAULT_PROD_CLUSTER_KUSTOMIZATION_PATH = Path("cluster-prod/kustomization.yaml"
 DEFAULT_DEPLOY_REPO_URL = "https://github.com/BrunoGaoSZ/ljwx-deploy.git"
 DEFAULT_DEPLOY_REF = "main"
 ANNOTATION_PREFIX = "gitops.ljwx.io"
+FINGERPRINT_CACHE_VERSION = 1
+DRIFT_REPORT_VERSION = 1
+# Rendering code: any change to these invalidates every cached fingerprint.
+ONBOARD_CODE_FILES = (Path(__file__).resolve(), Path(yaml_io.__file__).resolve())
 
 
 @dataclass(frozen=True)
@@ -164,6 +183,21 @@ class ResolvedEntry:
     capabilities: tuple[str, ...]
 
 
+@dataclass(frozen=True)
+class CompiledCatalog:
+    resolved_entries: tuple[ResolvedEntry, ...]
+    capabilities: dict[str, CapabilityDefinition]
+
+
+@dataclass(frozen=True)
+class OnboardInputPaths:
+    catalog: Path
+    service_templates: Path
+    ingress_profiles: Path
+    namespace_profiles: Path
+    capability_profiles: Path
+
+
 def read_text_file(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
@@ -182,7 +216,7 @@ def resolve_repo_path(repo_root: Path, path: Path) -> Path:
 def load_yaml_mapping(path: Path) -> dict[str, object]:
     if not path.exists():
         return {}
-    data = yaml.safe_load(read_text_file(path))
+    data = yaml_io.safe_load(read_text_file(path))
     if data is None:
         return {}
     if not isinstance(data, dict):
@@ -191,26 +225,178 @@ def load_yaml_mapping(path: Path) -> dict[str, object]:
 
 
 def dump_yaml_text(payload: dict[str, object]) -> str:
-    return yaml.safe_dump(payload, sort_keys=False, allow_unicode=True)
+    return yaml_io.safe_dump(payload, sort_keys=False, allow_unicode=True)
 
 
 def dump_yaml_documents_text(payloads: list[dict[str, object]]) -> str:
-    return yaml.safe_dump_all(payloads, sort_keys=False, allow_unicode=True)
-
-
-def dump_yaml(path: Path, payload: dict[str, object]) -> None:
-    write_text_file(path, dump_yaml_text(payload))
-
+    return yaml_io.safe_dump_all(payloads, sort_keys=False, allow_unicode=True)
+
+
+def dump_json_text(payload: dict[str, object]) -> str:
+    return json.dumps(payload, indent=2, ensure_ascii=False) + "\n"
+
+
+class FileState:
+    """Files touched by one onboarding run: each read once, written once.
+
+    Writes only update memory until ``flush``. Shared YAML/JSON files stay
+    parsed while entries mutate them and are serialized again only when read
+    as text or flushed, so a dry-run sees exactly the state a real run would.
+    """
+
+    def __init__(self) -> None:
+        self._original: dict[Path, str | None] = {}
+        self._text: dict[Path, str | None] = {}
+        # path -> (kind, payload, dirty)
+        self._docs: dict[Path, tuple[str, dict[str, object], bool]] = {}
+        self._modified: set[Path] = set()
+        self._accessed: set[Path] | None = None
+
+    def _key(self, path: Path) -> Path:
+        key = Path(os.path.normpath(path))
+        if self._accessed is not None:
+            self._accessed.add(key)
+        return key
+
+    @contextlib.contextmanager
+    def tracking(self) -> Iterator[set[Path]]:
+        """Collect every path read or written inside the ``with`` block."""
+        previous, self._accessed = self._accessed, set()
+        try:
+            yield self._accessed
+        finally:
+            if previous is not None:
+                previous.update(self._accessed)
+            self._accessed = previous
+
+    def modified_any(self, paths: Iterable[Path]) -> bool:
+        """Whether this run has written any of ``paths`` so far."""
+        return any(Path(os.path.normpath(path)) in self._modified for path in paths)
+
+    def _load(self, key: Path) -> None:
+        if key in self._original:
+            return
+        text = read_text_file(key) if key.exists() else None
+        self._original[key] = text
+        self._text[key] = text
+
+    def _sync_text(self, key: Path) -> None:
+        doc = self._docs.get(key)
+        if doc is None or not doc[2]:
+            return
+        kind, payload, _dirty = doc
+        if kind == "json":
+            self._text[key] = dump_json_text(payload)
+        else:
+            self._text[key] = dump_yaml_text(payload)
+        self._docs[key] = (kind, payload, False)
+
+    def exists(self, path: Path) -> bool:
+        key = self._key(path)
+        self._load(key)
+        return self._text[key] is not None
+
+    def read_text(self, path: Path) -> str:
+        key = self._key(path)
+        self._load(key)
+        self._sync_text(key)
+        return self._text[key] or ""
+
+    def put_text(self, path: Path, content: str) -> bool:
+        key = self._key(path)
+        self._load(key)
+        self._sync_text(key)
+        if (self._text[key] or "") == content:
+            return False
+        self._text[key] = content
+        self._docs.pop(key, None)
+        self._modified.add(key)
+        return True
 
-def load_json_object(path: Path) -> dict[str, object]:
-    data = json.loads(read_text_file(path))
-    if not isinstance(data, dict):
-        raise ValueError(f"JSON 顶层必须是对象: {path}")
-    return data
+    def yaml_mapping(self, path: Path) -> dict[str, object]:
+        key = self._key(path)
+        doc = self._docs.get(key)
+        if doc is not None and doc[0] == "yaml":
+            return doc[1]
+        text = self.read_text(key) if self.exists(key) else None
+        data = yaml_io.safe_load(text) if text is not None else None
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            raise ValueError(f"YAML 顶层必须是对象: {key}")
+        self._docs[key] = ("yaml", data, False)
+        return data
+
+    def json_object(self, path: Path) -> dict[str, object]:
+        key = self._key(path)
+        doc = self._docs.get(key)
+        if doc is not None and doc[0] == "json":
+            return doc[1]
+        if not self.exists(key):
+            raise FileNotFoundError(f"文件不存在: {key}")
+        data = json.loads(self.read_text(key))
+        if not isinstance(data, dict):
+            raise ValueError(f"JSON 顶层必须是对象: {key}")
+        self._docs[key] = ("json", data, False)
+        return data
+
+    def mark_changed(self, path: Path) -> None:
+        key = self._key(path)
+        kind, payload, _dirty = self._docs[key]
+        self._docs[key] = (kind, payload, True)
+        self._modified.add(key)
+
+    def changed_paths(self) -> list[Path]:
+        changed: list[Path] = []
+        for key in self._original:
+            self._sync_text(key)
+            if self._text[key] is not None and self._text[key] != self._original[key]:
+                changed.append(key)
+        return changed
+
+    def changes(self) -> list[tuple[Path, str | None, str]]:
+        """Return (path, original text or None, new text) per changed file."""
+        return [
+            (key, self._original[key], self._text[key] or "")
+            for key in self.changed_paths()
+        ]
 
+    def export(self) -> tuple[dict[Path, str | None], dict[Path, str]]:
+        """Return (original text of every file seen, new text of changed files)."""
+        changed = self.changed_paths()
+        return dict(self._original), {key: self._text[key] or "" for key in changed}
+
+    def merge(
+        self,
+        seen: dict[Path, str | None],
+        written: dict[Path, str],
+    ) -> bool:
+        """Apply another state's export if it saw the same inputs as this one.
+
+        Returns False without changing anything when a file the other state
+        read has since been changed here; the caller must then redo that work
+        against this state.
+        """
+        for key, text in seen.items():
+            if key not in self._original:
+                continue
+            self._sync_text(key)
+            if self._text[key] != text:
+                return False
+        for key, text in seen.items():
+            if key not in self._original:
+                self._original[key] = text
+                self._text[key] = text
+        for key, text in written.items():
+            self.put_text(key, text)
+        return True
 
-def dump_json(path: Path, payload: dict[str, object]) -> None:
-    write_text_file(path, json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
+    def flush(self) -> list[Path]:
+        written = self.changed_paths()
+        for key in written:
+            write_text_file(key, self._text[key] or "")
+            self._original[key] = self._text[key]
+        return written
 
 
 def expect_mapping(value: object, label: str) -> dict[str, object]:
@@ -948,6 +1134,140 @@ def load_platform_profiles(
     )
 
 
+def load_onboarding_inputs(
+    repo_root: Path,
+    paths: OnboardInputPaths,
+) -> CompiledCatalog:
+    service_templates = load_service_templates(repo_root, paths.service_templates)
+    ingress_profiles = load_ingress_profiles(repo_root, paths.ingress_profiles)
+    entries = load_catalog(
+        resolve_repo_path(repo_root, paths.catalog),
+        service_templates,
+        ingress_profiles,
+    )
+    profiles = load_platform_profiles(
+        repo_root,
+        paths.namespace_profiles,
+        paths.capability_profiles,
+    )
+    return CompiledCatalog(
+        resolved_entries=tuple(resolve_entry(entry, profiles) for entry in entries),
+        capabilities=profiles.capabilities,
+    )
+
+
+def onboarding_source_paths(paths: OnboardInputPaths) -> list[Path]:
+    return [*(getattr(paths, item.name) for item in fields(paths)), *ONBOARD_CODE_FILES]
+
+
+def to_plain(value: object) -> object:
+    if is_dataclass(value):
+        return {
+            item.name: to_plain(getattr(value, item.name)) for item in fields(value)
+        }
+    if isinstance(value, (tuple, list)):
+        return [to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def dataclass_field_types(cls: type) -> tuple[tuple[str, object], ...]:
+    hints = get_type_hints(cls)
+    return tuple((item.name, hints[item.name]) for item in fields(cls))
+
+
+def from_plain(annotation: object, value: object) -> object:
+    """Rebuild a value of ``annotation`` (dataclass, tuple, dict, scalar)."""
+    if isinstance(annotation, type) and is_dataclass(annotation):
+        if not isinstance(value, dict):
+            raise ValueError(f"{annotation.__name__} 需要对象")
+        return annotation(
+            **{
+                name: from_plain(field_type, value[name])
+                for name, field_type in dataclass_field_types(annotation)
+            }
+        )
+    origin = get_origin(annotation)
+    if origin is tuple:
+        args = get_args(annotation)
+        if not isinstance(value, list):
+            raise ValueError(f"{annotation} 需要列表")
+        if len(args) == 2 and args[1] is Ellipsis:
+            return tuple(from_plain(args[0], item) for item in value)
+        return tuple(from_plain(arg, item) for arg, item in zip(args, value))
+    if origin is dict:
+        _key_type, value_type = get_args(annotation)
+        if not isinstance(value, dict):
+            raise ValueError(f"{annotation} 需要对象")
+        return {key: from_plain(value_type, item) for key, item in value.items()}
+    return value
+
+
+def compiled_catalog_payload(
+    catalog: CompiledCatalog,
+    sources: dict[str, str | None],
+) -> dict[str, object]:
+    return {
+        "version": compiled_catalog.COMPILED_CATALOG_VERSION,
+        "sources": sources,
+        "capabilities": to_plain(catalog.capabilities),
+        "entries": [
+            {"key": entry_key(resolved_entry.entry), **to_plain(resolved_entry)}
+            for resolved_entry in catalog.resolved_entries
+        ],
+    }
+
+
+def compiled_catalog_from_payload(payload: dict[str, object]) -> CompiledCatalog:
+    entries = payload["entries"]
+    if not isinstance(entries, list):
+        raise ValueError("compiled catalog entries 必须是列表")
+    return CompiledCatalog(
+        resolved_entries=tuple(
+            from_plain(
+                ResolvedEntry,
+                {key: value for key, value in item.items() if key != "key"},
+            )
+            for item in entries
+        ),
+        capabilities=from_plain(
+            dict[str, CapabilityDefinition], payload["capabilities"]
+        ),
+    )
+
+
+def load_compiled_onboarding_inputs(
+    repo_root: Path,
+    paths: OnboardInputPaths,
+    snapshot_path: Path | None,
+    write_snapshot: bool = True,
+) -> CompiledCatalog:
+    """Resolve the catalog, reusing the compiled snapshot when still current.
+
+    A fresh snapshot is only written with ``write_snapshot`` (not on dry-run).
+    """
+    sources = onboarding_source_paths(paths)
+    if snapshot_path is not None:
+        payload = compiled_catalog.load(snapshot_path, repo_root, sources)
+        if payload is not None:
+            try:
+                return compiled_catalog_from_payload(payload)
+            except (KeyError, TypeError, ValueError):
+                pass
+
+    catalog = load_onboarding_inputs(repo_root, paths)
+    if snapshot_path is not None and write_snapshot:
+        compiled_catalog.write(
+            snapshot_path,
+            compiled_catalog_payload(
+                catalog, compiled_catalog.source_digests(repo_root, sources)
+            ),
+        )
+    return catalog
+
+
 def resolve_entry_capabilities(
     entry: OnboardEntry,
     registry_profile: RegistryProfile,
@@ -1012,8 +1332,8 @@ def resolve_entry(entry: OnboardEntry, profiles: PlatformProfiles) -> ResolvedEn
     )
 
 
-def ensure_service_mapping(path: Path, entry: OnboardEntry, dry_run: bool) -> bool:
-    payload = load_yaml_mapping(path)
+def ensure_service_mapping(path: Path, entry: OnboardEntry, state: FileState) -> bool:
+    payload = state.yaml_mapping(path)
     services_obj = payload.get("services")
     services = services_obj if isinstance(services_obj, dict) else {}
     payload["services"] = services
@@ -1042,13 +1362,13 @@ def ensure_service_mapping(path: Path, entry: OnboardEntry, dry_run: bool) -> bo
             envs[entry.environment] = desired
             changed = True
 
-    if changed and not dry_run:
-        dump_yaml(path, payload)
+    if changed:
+        state.mark_changed(path)
     return changed
 
 
-def ensure_smoke_target(path: Path, entry: OnboardEntry, dry_run: bool) -> bool:
-    payload = load_json_object(path)
+def ensure_smoke_target(path: Path, entry: OnboardEntry, state: FileState) -> bool:
+    payload = state.json_object(path)
     targets_obj = payload.get("targets")
     targets = targets_obj if isinstance(targets_obj, list) else []
     payload["targets"] = targets
@@ -1080,8 +1400,8 @@ def ensure_smoke_target(path: Path, entry: OnboardEntry, dry_run: bool) -> bool:
             targets.append(desired)
             changed = True
 
-    if changed and not dry_run:
-        dump_json(path, payload)
+    if changed:
+        state.mark_changed(path)
     return changed
 
 
@@ -1090,7 +1410,7 @@ def ensure_argocd_app_file(
     entry: OnboardEntry,
     deploy_repo_url: str,
     deploy_ref: str,
-    dry_run: bool,
+    state: FileState,
 ) -> bool:
     if not entry.generate_argocd_app:
         return False
@@ -1123,14 +1443,7 @@ def ensure_argocd_app_file(
             },
         },
     }
-    content = dump_yaml_text(payload)
-    app_path = repo_root / entry.argocd_app_file
-    current = app_path.read_text(encoding="utf-8") if app_path.exists() else ""
-    if current == content:
-        return False
-    if not dry_run:
-        write_text_file(app_path, content)
-    return True
+    return state.put_text(repo_root / entry.argocd_app_file, dump_yaml_text(payload))
 
 
 def build_deployment_doc(
@@ -1225,17 +1538,16 @@ def build_deployment_doc(
 def ensure_kustomization_resource(
     kustomization_path: Path,
     resource_name: str,
-    dry_run: bool,
+    state: FileState,
 ) -> bool:
-    root = load_yaml_mapping(kustomization_path)
+    root = state.yaml_mapping(kustomization_path)
     resources_obj = root.get("resources")
     resources = resources_obj if isinstance(resources_obj, list) else []
     root["resources"] = resources
     if resource_name in resources:
         return False
     resources.append(resource_name)
-    if not dry_run:
-        dump_yaml(kustomization_path, root)
+    state.mark_changed(kustomization_path)
     return True
 
 
@@ -1289,13 +1601,13 @@ def build_ingress_doc(entry: OnboardEntry) -> dict[str, object]:
 def ensure_generated_ingress_artifacts(
     repo_root: Path,
     entry: OnboardEntry,
-    dry_run: bool,
+    state: FileState,
 ) -> int:
     if not entry.public_host or not entry.generate_ingress:
         return 0
 
     overlay_path = repo_root / entry.overlay_path
-    if not overlay_path.exists():
+    if not state.exists(overlay_path):
         raise ValueError(
             f"overlay kustomization 不存在，无法生成 ingress: {overlay_path}"
         )
@@ -1304,13 +1616,10 @@ def ensure_generated_ingress_artifacts(
     ingress_content = dump_yaml_text(build_ingress_doc(entry))
     changes = 0
 
-    current = ingress_path.read_text(encoding="utf-8") if ingress_path.exists() else ""
-    if current != ingress_content:
+    if state.put_text(ingress_path, ingress_content):
         changes += 1
-        if not dry_run:
-            write_text_file(ingress_path, ingress_content)
 
-    if ensure_kustomization_resource(overlay_path, "ingress.yaml", dry_run):
+    if ensure_kustomization_resource(overlay_path, "ingress.yaml", state):
         changes += 1
 
     return changes
@@ -1319,7 +1628,7 @@ def ensure_generated_ingress_artifacts(
 def scaffold_app_manifest(
     repo_root: Path,
     resolved_entry: ResolvedEntry,
-    dry_run: bool,
+    state: FileState,
 ) -> int:
     entry = resolved_entry.entry
     if not entry.scaffold_app:
@@ -1399,11 +1708,8 @@ def scaffold_app_manifest(
         overlay_path: overlay_content,
     }
     for file_path, content in files_to_write.items():
-        current = file_path.read_text(encoding="utf-8") if file_path.exists() else ""
-        if current != content:
+        if state.put_text(file_path, content):
             changes += 1
-            if not dry_run:
-                write_text_file(file_path, content)
     return changes
 
 
@@ -1487,7 +1793,7 @@ def ensure_namespace_baseline_file(
     repo_root: Path,
     resolved_entry: ResolvedEntry,
     cluster_root: Path,
-    dry_run: bool,
+    state: FileState,
 ) -> bool:
     path = (
         repo_root
@@ -1497,12 +1803,7 @@ def ensure_namespace_baseline_file(
     content = dump_yaml_documents_text(
         build_namespace_baseline_documents(resolved_entry)
     )
-    current = path.read_text(encoding="utf-8") if path.exists() else ""
-    if current == content:
-        return False
-    if not dry_run:
-        write_text_file(path, content)
-    return True
+    return state.put_text(path, content)
 
 
 def ensure_cluster_application_file(
@@ -1511,7 +1812,7 @@ def ensure_cluster_application_file(
     deploy_repo_url: str,
     deploy_ref: str,
     cluster_root: Path,
-    dry_run: bool,
+    state: FileState,
 ) -> bool:
     application_path = (
         repo_root
@@ -1546,30 +1847,20 @@ def ensure_cluster_application_file(
             },
         },
     }
-    content = dump_yaml_text(payload)
-    current = (
-        application_path.read_text(encoding="utf-8")
-        if application_path.exists()
-        else ""
-    )
-    if current == content:
-        return False
-    if not dry_run:
-        write_text_file(application_path, content)
-    return True
+    return state.put_text(application_path, dump_yaml_text(payload))
 
 
 def ensure_cluster_kustomization_resources(
     repo_root: Path,
     cluster_kustomization_path: Path,
     entry: OnboardEntry,
-    dry_run: bool,
+    state: FileState,
 ) -> int:
     resolved_path = resolve_repo_path(repo_root, cluster_kustomization_path)
-    if not resolved_path.exists():
+    if not state.exists(resolved_path):
         raise ValueError(f"cluster kustomization 不存在: {resolved_path}")
 
-    root = load_yaml_mapping(resolved_path)
+    root = state.yaml_mapping(resolved_path)
     resources_obj = root.get("resources")
     resources = resources_obj if isinstance(resources_obj, list) else []
     root["resources"] = resources
@@ -1582,8 +1873,8 @@ def ensure_cluster_kustomization_resources(
         if item not in resources:
             resources.append(item)
             changed += 1
-    if changed > 0 and not dry_run:
-        dump_yaml(resolved_path, root)
+    if changed > 0:
+        state.mark_changed(resolved_path)
     return changed
 
 
@@ -1800,7 +2091,7 @@ def ensure_runtime_contract_artifacts(
     resolved_entry: ResolvedEntry,
     capability_definitions: dict[str, CapabilityDefinition],
     cluster_root: Path,
-    dry_run: bool,
+    state: FileState,
 ) -> int:
     entry = resolved_entry.entry
     overlay_dir = (repo_root / entry.overlay_path).parent
@@ -1828,7 +2119,7 @@ def ensure_runtime_contract_artifacts(
             resolved_entry.runtime_secret_profile.contract_secret_names,
         ),
     }
-    existing_readme = read_text_file(readme_path) if readme_path.exists() else ""
+    existing_readme = state.read_text(readme_path)
 
     files_to_write: dict[Path, str] = {
         contract_doc_path: dump_yaml_text(contract_payload),
@@ -1849,119 +2140,648 @@ def ensure_runtime_contract_artifacts(
 
     changes = 0
     for file_path, content in files_to_write.items():
-        current = file_path.read_text(encoding="utf-8") if file_path.exists() else ""
-        if current != content:
+        if state.put_text(file_path, content):
             changes += 1
-            if not dry_run:
-                write_text_file(file_path, content)
     return changes
 
 
-def apply_onboarding(
+@dataclass(frozen=True)
+class EntryJob:
+    resolved_entry: ResolvedEntry
+    capability_definitions: dict[str, CapabilityDefinition]
+    cluster_kustomization_path: Path
+    cluster_bootstrap: bool
+    deploy_repo_url: str
+    deploy_ref: str
+
+    @property
+    def cluster_root(self) -> Path:
+        return self.cluster_kustomization_path.parent
+
+
+@dataclass
+class EntryArtifacts:
+    scaffold_changes: int
+    ingress_changes: int
+    argocd_app_changed: bool
+    runtime_contract_changes: int
+    namespace_baseline_changed: bool
+    cluster_application_changed: bool
+    seen: dict[Path, str | None] = field(default_factory=dict)
+    written: dict[Path, str] = field(default_factory=dict)
+
+
+def render_entry_artifacts(
     repo_root: Path,
-    entries: list[OnboardEntry],
-    profiles: PlatformProfiles,
-    dry_run: bool,
-    cluster_bootstrap: bool,
-    cluster_kustomization_path: Path,
-    deploy_repo_url: str,
-    deploy_ref: str,
-) -> int:
-    changed_files = 0
-    for entry in entries:
-        resolved_entry = resolve_entry(entry, profiles)
-        entry_cluster_kustomization_path = default_cluster_kustomization_for_entry(
-            entry,
-            cluster_kustomization_path,
+    job: EntryJob,
+    state: FileState,
+) -> EntryArtifacts:
+    resolved_entry = job.resolved_entry
+    entry = resolved_entry.entry
+    scaffold_changes = scaffold_app_manifest(repo_root, resolved_entry, state)
+    ingress_changes = ensure_generated_ingress_artifacts(repo_root, entry, state)
+    argocd_app_changed = ensure_argocd_app_file(
+        repo_root,
+        entry,
+        job.deploy_repo_url,
+        job.deploy_ref,
+        state,
+    )
+    runtime_contract_changes = ensure_runtime_contract_artifacts(
+        repo_root,
+        resolved_entry,
+        job.capability_definitions,
+        job.cluster_root,
+        state,
+    )
+    namespace_baseline_changed = False
+    cluster_application_changed = False
+    if job.cluster_bootstrap:
+        namespace_baseline_changed = ensure_namespace_baseline_file(
+            repo_root,
+            resolved_entry,
+            job.cluster_root,
+            state,
         )
-        entry_cluster_root = entry_cluster_kustomization_path.parent
-        print(f"[onboard] 处理服务: {entry.service}/{entry.environment}")
-
-        for map_key in ("default", *entry.profiles):
-            path = repo_root / SERVICE_MAP_FILES[map_key]
-            if ensure_service_mapping(path, entry, dry_run):
-                changed_files += 1
-                print(f"  - 已更新映射: {path}")
-
-        for profile in entry.profiles:
-            smoke_path = repo_root / SMOKE_TARGET_FILES[profile]
-            if ensure_smoke_target(smoke_path, entry, dry_run):
-                changed_files += 1
-                print(f"  - 已更新 smoke 目标: {smoke_path}")
-
-        scaffold_changes = scaffold_app_manifest(repo_root, resolved_entry, dry_run)
-        if scaffold_changes > 0:
-            changed_files += scaffold_changes
-            print(f"  - 已生成应用骨架: {scaffold_changes} 个文件")
-
-        ingress_changes = ensure_generated_ingress_artifacts(repo_root, entry, dry_run)
-        if ingress_changes > 0:
-            changed_files += ingress_changes
-            print(f"  - 已生成公网入口: {ingress_changes} 个文件")
-
-        if ensure_argocd_app_file(
+        cluster_application_changed = ensure_cluster_application_file(
             repo_root,
             entry,
-            deploy_repo_url,
-            deploy_ref,
-            dry_run,
+            job.deploy_repo_url,
+            job.deploy_ref,
+            job.cluster_root,
+            state,
+        )
+    return EntryArtifacts(
+        scaffold_changes=scaffold_changes,
+        ingress_changes=ingress_changes,
+        argocd_app_changed=argocd_app_changed,
+        runtime_contract_changes=runtime_contract_changes,
+        namespace_baseline_changed=namespace_baseline_changed,
+        cluster_application_changed=cluster_application_changed,
+    )
+
+
+def render_entry_artifacts_job(repo_root: Path, job: EntryJob) -> EntryArtifacts:
+    """Process-pool worker: render one entry against a private FileState."""
+    state = FileState()
+    artifacts = render_entry_artifacts(repo_root, job, state)
+    artifacts.seen, artifacts.written = state.export()
+    return artifacts
+
+
+MISSING = object()
+
+
+def diff_values(
+    before: object,
+    after: object,
+    path: list[object],
+    out: list[dict[str, object]],
+) -> None:
+    """Append add/remove/replace operations turning ``before`` into ``after``."""
+    if before is MISSING:
+        out.append({"op": "add", "path": path, "after": after})
+        return
+    if after is MISSING:
+        out.append({"op": "remove", "path": path, "before": before})
+        return
+    if isinstance(before, dict) and isinstance(after, dict):
+        for key in before:
+            diff_values(before[key], after.get(key, MISSING), [*path, key], out)
+        for key in after:
+            if key not in before:
+                diff_values(MISSING, after[key], [*path, key], out)
+        return
+    if isinstance(before, list) and isinstance(after, list):
+        for index in range(max(len(before), len(after))):
+            diff_values(
+                before[index] if index < len(before) else MISSING,
+                after[index] if index < len(after) else MISSING,
+                [*path, index],
+                out,
+            )
+        return
+    if type(before) is not type(after) or before != after:
+        out.append({"op": "replace", "path": path, "before": before, "after": after})
+
+
+def parse_for_diff(path: Path, text: str | None) -> tuple[str, object]:
+    """Return (format, parsed value) for a drift report; MISSING if absent."""
+    if path.suffix == ".json":
+        return "json", MISSING if text is None else json.loads(text)
+    if path.suffix in {".yaml", ".yml"}:
+        if text is None:
+            return "yaml", MISSING
+        documents = list(yaml_io.safe_load_all(text))
+        return "yaml", documents[0] if len(documents) == 1 else documents
+    return "text", MISSING if text is None else text
+
+
+def build_drift_report(
+    repo_root: Path,
+    state: FileState,
+    dry_run: bool,
+) -> dict[str, object]:
+    """Per-file, per-key-path drift computed from the run's in-memory state.
+
+    Structured files list key paths (mapping keys and list indexes, with
+    multi-document YAML prefixed by the document index); other files, and
+    structured files that only differ in formatting, carry a unified diff.
+    """
+    files: list[dict[str, object]] = []
+    for path, original, text in state.changes():
+        rel_path = Path(os.path.relpath(path, repo_root)).as_posix()
+        item: dict[str, object] = {
+            "path": rel_path,
+            "status": "added" if original is None else "modified",
+        }
+        file_format, before = parse_for_diff(path, original)
+        _format, after = parse_for_diff(path, text)
+        item["format"] = file_format
+        changes: list[dict[str, object]] = []
+        if file_format != "text":
+            diff_values(before, after, [], changes)
+            item["changes"] = changes
+        if not changes:
+            # Plain text, or a structured file whose drift is formatting only.
+            item["diff"] = "".join(
+                difflib.unified_diff(
+                    (original or "").splitlines(keepends=True),
+                    text.splitlines(keepends=True),
+                    fromfile=f"a/{rel_path}",
+                    tofile=f"b/{rel_path}",
+                )
+            )
+        files.append(item)
+    files.sort(key=lambda item: str(item["path"]))
+    return {
+        "version": DRIFT_REPORT_VERSION,
+        "dryRun": dry_run,
+        "fileCount": len(files),
+        "files": files,
+    }
+
+
+def entry_key(entry: OnboardEntry) -> str:
+    return f"{entry.service}/{entry.environment}"
+
+
+def entry_fingerprint(job: EntryJob) -> str:
+    """Digest of everything that feeds one entry's rendered artifacts."""
+    resolved_entry = job.resolved_entry
+    payload = repr(
+        (
+            resolved_entry,
+            [
+                (name, job.capability_definitions.get(name))
+                for name in resolved_entry.capabilities
+            ],
+            job.cluster_root.as_posix(),
+            job.cluster_bootstrap,
+            job.deploy_repo_url,
+            job.deploy_ref,
+        )
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def text_digest(text: str | None) -> str | None:
+    if text is None:
+        return None
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def tool_digest() -> str:
+    digest = hashlib.sha256()
+    for path in ONBOARD_CODE_FILES:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class FingerprintCache:
+    """Entry fingerprints and rendered-file digests from earlier runs.
+
+    An entry is fresh when its fingerprint is unchanged and every file its
+    last render read still has the recorded content in the current run's
+    FileState; rendering it again would then change nothing, so the render
+    is skipped. Shared maps and kustomizations are always checked.
+    """
+
+    def __init__(self, path: Path, repo_root: Path) -> None:
+        self.path = path
+        self.repo_root = repo_root
+        self.tool = tool_digest()
+        self.entries: dict[str, dict[str, object]] = {}
+        try:
+            payload = json.loads(read_text_file(path))
+        except (OSError, ValueError):
+            return
+        if (
+            isinstance(payload, dict)
+            and payload.get("version") == FINGERPRINT_CACHE_VERSION
+            and payload.get("tool") == self.tool
+            and isinstance(payload.get("entries"), dict)
         ):
+            self.entries = payload["entries"]
+
+    def is_fresh(self, key: str, fingerprint: str, state: FileState) -> bool:
+        cached = self.entries.get(key)
+        if not isinstance(cached, dict) or cached.get("fingerprint") != fingerprint:
+            return False
+        files = cached.get("files")
+        if not isinstance(files, dict):
+            return False
+        for rel_path, digest in files.items():
+            path = self.repo_root / rel_path
+            text = state.read_text(path) if state.exists(path) else None
+            if text_digest(text) != digest:
+                return False
+        return True
+
+    def files(self, key: str) -> list[Path]:
+        """Files the entry's last recorded render read."""
+        cached = self.entries.get(key)
+        files = cached.get("files") if isinstance(cached, dict) else None
+        if not isinstance(files, dict):
+            return []
+        return [self.repo_root / rel_path for rel_path in files]
+
+    def record(
+        self,
+        key: str,
+        fingerprint: str,
+        paths: list[Path],
+        state: FileState,
+    ) -> None:
+        if not paths:
+            self.entries.pop(key, None)
+            return
+        files: dict[str, str | None] = {}
+        for path in sorted(paths):
+            text = state.read_text(path) if state.exists(path) else None
+            rel_path = os.path.relpath(path, self.repo_root)
+            files[Path(rel_path).as_posix()] = text_digest(text)
+        self.entries[key] = {"fingerprint": fingerprint, "files": files}
+
+    def save(self, keys: list[str]) -> None:
+        payload = {
+            "version": FINGERPRINT_CACHE_VERSION,
+            "tool": self.tool,
+            "entries": {key: self.entries[key] for key in keys if key in self.entries},
+        }
+        write_text_file(self.path, dump_json_text(payload))
+
+
+def entry_output_prefixes(job: EntryJob) -> list[str]:
+    """Repo-relative files and directories an entry's render owns."""
+    entry = job.resolved_entry.entry
+    overlay_dir = Path(entry.overlay_path).parent
+    prefixes = [f"{overlay_dir.as_posix()}/"]
+    if entry.scaffold_app:
+        prefixes.append(f"{(overlay_dir.parent.parent / 'base').as_posix()}/")
+    if entry.generate_argocd_app:
+        prefixes.append(Path(entry.argocd_app_file).as_posix())
+    if job.cluster_bootstrap:
+        cluster_root = job.cluster_root.as_posix()
+        prefixes.append(f"{cluster_root}/namespace-{entry.deploy_namespace}.yaml")
+        prefixes.append(
+            f"{cluster_root}/{entry.service}-{entry.environment}-application.yaml"
+        )
+    return prefixes
+
+
+def git_changed_files(repo_root: Path, base_ref: str) -> set[str] | None:
+    """Files changed since ``base_ref`` (committed, staged, unstaged, untracked)."""
+    try:
+        diff = subprocess.run(
+            ["git", "diff", "--name-only", "--relative", base_ref, "--"],
+            cwd=repo_root,
+            text=True,
+            capture_output=True,
+            check=True,
+        )
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard"],
+            cwd=repo_root,
+            text=True,
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {
+        line.strip()
+        for line in (diff.stdout + untracked.stdout).splitlines()
+        if line.strip()
+    }
+
+
+def git_show_to(repo_root: Path, base_ref: str, rel_path: str, target: Path) -> bool:
+    try:
+        proc = subprocess.run(
+            ["git", "show", f"{base_ref}:./{rel_path}"],
+            cwd=repo_root,
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(proc.stdout)
+    return True
+
+
+def select_changed_entries(
+    repo_root: Path,
+    base_ref: str,
+    input_paths: OnboardInputPaths,
+    entry_jobs: list[EntryJob],
+    build_jobs: Callable[[Path, OnboardInputPaths], list[EntryJob]],
+) -> set[str] | None:
+    """Keys of entries affected by changes since ``base_ref``.
+
+    An entry is affected when its fingerprint differs from the one computed
+    from the ``base_ref`` versions of the catalog and profile files, or when
+    one of the files its render owns changed. Returns None (meaning every
+    entry) when git is unavailable, the onboarding code itself changed, or
+    the base inputs cannot be loaded.
+    """
+    changed = git_changed_files(repo_root, base_ref)
+    if changed is None:
+        return None
+    for code_path in ONBOARD_CODE_FILES:
+        try:
+            rel_code_path = code_path.relative_to(repo_root.resolve()).as_posix()
+        except ValueError:
+            continue
+        if rel_code_path in changed:
+            return None
+
+    rel_inputs: dict[str, str] = {}
+    for name, path in asdict(input_paths).items():
+        try:
+            rel_inputs[name] = (
+                resolve_repo_path(repo_root, path)
+                .resolve()
+                .relative_to(repo_root.resolve())
+                .as_posix()
+            )
+        except ValueError:
+            return None
+
+    selected: set[str] = set()
+    if changed & set(rel_inputs.values()):
+        with tempfile.TemporaryDirectory(prefix="onboard-base-") as tmp:
+            base_root = Path(tmp)
+            for rel_path in rel_inputs.values():
+                if not git_show_to(repo_root, base_ref, rel_path, base_root / rel_path):
+                    return None
+            base_paths = OnboardInputPaths(
+                **{name: Path(rel_path) for name, rel_path in rel_inputs.items()}
+            )
+            try:
+                base_jobs = build_jobs(base_root, base_paths)
+            except (ValueError, yaml_io.YAMLError):
+                return None
+        base_fingerprints = {
+            entry_key(job.resolved_entry.entry): entry_fingerprint(job)
+            for job in base_jobs
+        }
+        for job in entry_jobs:
+            key = entry_key(job.resolved_entry.entry)
+            if base_fingerprints.get(key) != entry_fingerprint(job):
+                selected.add(key)
+
+    for job in entry_jobs:
+        prefixes = entry_output_prefixes(job)
+        if any(
+            path == prefix or (prefix.endswith("/") and path.startswith(prefix))
+            for path in changed
+            for prefix in prefixes
+        ):
+            selected.add(entry_key(job.resolved_entry.entry))
+    return selected
+
+
+def apply_entry(
+    repo_root: Path,
+    job: EntryJob,
+    pending: concurrent.futures.Future[EntryArtifacts] | None,
+    state: FileState,
+    cache: FingerprintCache | None = None,
+    render: bool = True,
+    fingerprint: str = "",
+) -> tuple[int, bool]:
+    """Apply one entry; returns (changed files, whether its artifacts rendered).
+
+    ``render`` is decided by the caller (selection and cache freshness); a
+    rendered entry is recorded in ``cache`` under ``fingerprint``.
+    """
+    entry = job.resolved_entry.entry
+    key = entry_key(entry)
+    changed_files = 0
+    print(f"[onboard] 处理服务: {entry.service}/{entry.environment}")
+
+    for map_key in ("default", *entry.profiles):
+        path = repo_root / SERVICE_MAP_FILES[map_key]
+        if ensure_service_mapping(path, entry, state):
+            changed_files += 1
+            print(f"  - 已更新映射: {path}")
+
+    for profile in entry.profiles:
+        smoke_path = repo_root / SMOKE_TARGET_FILES[profile]
+        if ensure_smoke_target(smoke_path, entry, state):
+            changed_files += 1
+            print(f"  - 已更新 smoke 目标: {smoke_path}")
+
+    if not render:
+        artifacts = EntryArtifacts(0, 0, False, 0, False, False)
+    else:
+        # A pooled render only counts if it saw the files as they are now.
+        # When an earlier entry touched the same files, or the worker failed
+        # (possibly on a file an earlier entry creates), render again here in
+        # catalog order; genuine errors then surface exactly as in a serial run.
+        artifacts = None
+        seen: Iterable[Path] = ()
+        if pending is not None and pending.exception() is None:
+            artifacts = pending.result()
+            seen = artifacts.seen
+            if not state.merge(artifacts.seen, artifacts.written):
+                artifacts = None
+        if artifacts is None:
+            with state.tracking() as seen:
+                artifacts = render_entry_artifacts(repo_root, job, state)
+        if cache is not None:
+            cache.record(key, fingerprint, list(seen), state)
+
+    if artifacts.scaffold_changes > 0:
+        changed_files += artifacts.scaffold_changes
+        print(f"  - 已生成应用骨架: {artifacts.scaffold_changes} 个文件")
+
+    if artifacts.ingress_changes > 0:
+        changed_files += artifacts.ingress_changes
+        print(f"  - 已生成公网入口: {artifacts.ingress_changes} 个文件")
+
+    if artifacts.argocd_app_changed:
+        changed_files += 1
+        print(f"  - 已生成 Argo Application: {entry.argocd_app_file}")
+
+    if artifacts.runtime_contract_changes > 0:
+        changed_files += artifacts.runtime_contract_changes
+        print(
+            f"  - 已生成 runtime contract: {artifacts.runtime_contract_changes} 个文件"
+        )
+
+    if job.cluster_bootstrap:
+        if artifacts.namespace_baseline_changed:
+            changed_files += 1
+            print(
+                "  - 已生成 namespace baseline: "
+                f"{job.cluster_root.as_posix()}/namespace-{entry.deploy_namespace}.yaml"
+            )
+        if artifacts.cluster_application_changed:
             changed_files += 1
-            print(f"  - 已生成 Argo Application: {entry.argocd_app_file}")
+            print(
+                "  - 已生成 cluster application: "
+                f"{job.cluster_root.as_posix()}/{entry.service}-{entry.environment}-application.yaml"
+            )
 
-        runtime_contract_changes = ensure_runtime_contract_artifacts(
+        cluster_kustomization_changes = ensure_cluster_kustomization_resources(
             repo_root,
-            resolved_entry,
-            profiles.capabilities,
-            entry_cluster_root,
-            dry_run,
+            job.cluster_kustomization_path,
+            entry,
+            state,
         )
-        if runtime_contract_changes > 0:
-            changed_files += runtime_contract_changes
-            print(f"  - 已生成 runtime contract: {runtime_contract_changes} 个文件")
+        if cluster_kustomization_changes > 0:
+            changed_files += cluster_kustomization_changes
+            print(
+                "  - 已更新 cluster kustomization: "
+                f"{cluster_kustomization_changes} 条资源引用"
+            )
+    return changed_files, render
 
-        if cluster_bootstrap and entry.cluster_bootstrap:
-            if ensure_namespace_baseline_file(
-                repo_root,
-                resolved_entry,
-                entry_cluster_root,
-                dry_run,
-            ):
-                changed_files += 1
-                print(
-                    "  - 已生成 namespace baseline: "
-                    f"{entry_cluster_root.as_posix()}/namespace-{entry.deploy_namespace}.yaml"
+
+def build_entry_jobs(
+    catalog: CompiledCatalog,
+    cluster_bootstrap: bool,
+    cluster_kustomization_path: Path,
+    deploy_repo_url: str,
+    deploy_ref: str,
+) -> list[EntryJob]:
+    entry_jobs: list[EntryJob] = []
+    for resolved_entry in catalog.resolved_entries:
+        entry = resolved_entry.entry
+        entry_jobs.append(
+            EntryJob(
+                resolved_entry=resolved_entry,
+                capability_definitions=catalog.capabilities,
+                cluster_kustomization_path=default_cluster_kustomization_for_entry(
+                    entry,
+                    cluster_kustomization_path,
+                ),
+                cluster_bootstrap=cluster_bootstrap and entry.cluster_bootstrap,
+                deploy_repo_url=deploy_repo_url,
+                deploy_ref=deploy_ref,
+            )
+        )
+    return entry_jobs
+
+
+def apply_onboarding(
+    repo_root: Path,
+    catalog: CompiledCatalog,
+    dry_run: bool,
+    cluster_bootstrap: bool,
+    cluster_kustomization_path: Path,
+    deploy_repo_url: str,
+    deploy_ref: str,
+    jobs: int = 1,
+    selected: set[str] | None = None,
+    cache: FingerprintCache | None = None,
+    drift_report_path: Path | None = None,
+) -> int:
+    changed_files = 0
+    skipped = 0
+    state = FileState()
+    entry_jobs = build_entry_jobs(
+        catalog,
+        cluster_bootstrap,
+        cluster_kustomization_path,
+        deploy_repo_url,
+        deploy_ref,
+    )
+    fingerprints = [
+        entry_fingerprint(job) if cache is not None else "" for job in entry_jobs
+    ]
+    render: list[bool] = []
+    # Entries skipped as fresh, with the files their cached render read.
+    fresh_files: list[list[Path] | None] = []
+    for job, fingerprint in zip(entry_jobs, fingerprints):
+        key = entry_key(job.resolved_entry.entry)
+        fresh = (
+            cache is not None
+            and (selected is None or key in selected)
+            and cache.is_fresh(key, fingerprint, state)
+        )
+        render.append((selected is None or key in selected) and not fresh)
+        fresh_files.append(cache.files(key) if fresh and cache is not None else None)
+
+    # Per-entry artifacts render in worker processes; shared maps, smoke
+    # targets and cluster kustomizations are still updated here in catalog
+    # order, so the result matches a serial run byte for byte.
+    with contextlib.ExitStack() as stack:
+        pending: list[concurrent.futures.Future[EntryArtifacts] | None] = [
+            None
+        ] * len(entry_jobs)
+        to_render = [index for index, wanted in enumerate(render) if wanted]
+        if jobs > 1 and len(to_render) > 1:
+            pool = stack.enter_context(
+                concurrent.futures.ProcessPoolExecutor(
+                    max_workers=min(jobs, len(to_render))
                 )
-            if ensure_cluster_application_file(
-                repo_root,
-                entry,
-                deploy_repo_url,
-                deploy_ref,
-                entry_cluster_root,
-                dry_run,
-            ):
-                changed_files += 1
-                print(
-                    "  - 已生成 cluster application: "
-                    f"{entry_cluster_root.as_posix()}/{entry.service}-{entry.environment}-application.yaml"
+            )
+            for index in to_render:
+                pending[index] = pool.submit(
+                    render_entry_artifacts_job, repo_root, entry_jobs[index]
                 )
-
-            cluster_kustomization_changes = ensure_cluster_kustomization_resources(
+        for index, job in enumerate(entry_jobs):
+            render_entry = render[index]
+            files = fresh_files[index]
+            if files is not None and state.modified_any(files):
+                # Fresh against the files on disk, but an earlier entry has
+                # since rewritten one of its inputs.
+                render_entry = True
+            entry_changes, rendered = apply_entry(
                 repo_root,
-                entry_cluster_kustomization_path,
-                entry,
-                dry_run,
+                job,
+                pending[index],
+                state,
+                cache,
+                render_entry,
+                fingerprints[index],
             )
-            if cluster_kustomization_changes > 0:
-                changed_files += cluster_kustomization_changes
-                print(
-                    "  - 已更新 cluster kustomization: "
-                    f"{cluster_kustomization_changes} 条资源引用"
-                )
-
+            changed_files += entry_changes
+            if not rendered:
+                skipped += 1
+
+    if cache is not None:
+        cache.save([entry_key(job.resolved_entry.entry) for job in entry_jobs])
+    if skipped > 0:
+        print(f"[onboard] 输入未变化，跳过产物渲染: {skipped} 个服务")
+    if drift_report_path is not None:
+        report = build_drift_report(repo_root, state, dry_run)
+        write_text_file(
+            drift_report_path,
+            json.dumps(report, indent=2, ensure_ascii=False, default=str) + "\n",
+        )
+        print(
+            f"[onboard] 漂移报告: {drift_report_path} "
+            f"({report['fileCount']} 个文件)"
+        )
     if dry_run:
         print(f"[onboard] dry-run 完成，预计变更文件数: {changed_files}")
     else:
+        state.flush()
         print(f"[onboard] 执行完成，变更文件数: {changed_files}")
     return changed_files
 
@@ -2037,6 +2857,39 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="dry-run 发现漂移时返回非零退出码",
     )
+    parser.add_argument(
+        "--compiled-catalog",
+        default=str(compiled_catalog.DEFAULT_COMPILED_CATALOG_PATH),
+        help="解析后 catalog 快照（按源文件哈希失效，dry-run 只读不写）；传空字符串关闭",
+    )
+    parser.add_argument(
+        "--drift-report",
+        type=Path,
+        default=None,
+        help="输出 JSON 漂移报告（逐文件、逐 YAML/JSON 键路径的前后值）",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="并行渲染各服务产物的进程数（1 为串行）",
+    )
+    parser.add_argument(
+        "--cache-file",
+        type=Path,
+        default=None,
+        help="指纹缓存文件；输入与产物均未变化的服务跳过渲染",
+    )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="只渲染受 --base-ref 以来 git 变更影响的服务",
+    )
+    parser.add_argument(
+        "--base-ref",
+        default="HEAD",
+        help="--changed-only 对比的 git revision（默认 HEAD，即未提交的改动）",
+    )
     return parser.parse_args()
 
 
@@ -2048,23 +2901,81 @@ def main() -> int:
         print(f"未找到 catalog 文件: {catalog_path}")
         return 1
 
-    service_templates = load_service_templates(repo_root, args.service_templates)
-    ingress_profiles = load_ingress_profiles(repo_root, args.ingress_profiles)
-    entries = load_catalog(catalog_path, service_templates, ingress_profiles)
-    profiles = load_platform_profiles(
+    if args.jobs < 1:
+        print("--jobs 必须 >= 1")
+        return 1
+
+    input_paths = OnboardInputPaths(
+        catalog=catalog_path,
+        service_templates=args.service_templates,
+        ingress_profiles=args.ingress_profiles,
+        namespace_profiles=args.namespace_profiles,
+        capability_profiles=args.capability_profiles,
+    )
+    catalog = load_compiled_onboarding_inputs(
         repo_root,
-        args.namespace_profiles,
-        args.capability_profiles,
+        input_paths,
+        (
+            resolve_repo_path(repo_root, Path(args.compiled_catalog))
+            if args.compiled_catalog
+            else None
+        ),
+        write_snapshot=not args.dry_run,
     )
+
+    selected: set[str] | None = None
+    if args.changed_only:
+
+        def build_jobs(root: Path, paths: OnboardInputPaths) -> list[EntryJob]:
+            return build_entry_jobs(
+                load_onboarding_inputs(root, paths),
+                args.cluster_bootstrap,
+                args.cluster_kustomization,
+                args.deploy_repo_url,
+                args.deploy_ref,
+            )
+
+        selected = select_changed_entries(
+            repo_root,
+            args.base_ref,
+            input_paths,
+            build_entry_jobs(
+                catalog,
+                args.cluster_bootstrap,
+                args.cluster_kustomization,
+                args.deploy_repo_url,
+                args.deploy_ref,
+            ),
+            build_jobs,
+        )
+        if selected is None:
+            print(f"[onboard] 无法基于 {args.base_ref} 的 git diff 缩小范围，处理全部服务")
+        else:
+            print(
+                f"[onboard] --changed-only: {len(selected)} 个服务受 "
+                f"{args.base_ref} 以来的变更影响"
+            )
+
+    cache = None
+    if args.cache_file is not None:
+        cache = FingerprintCache(resolve_repo_path(repo_root, args.cache_file), repo_root)
+
     changed_files = apply_onboarding(
         repo_root=repo_root,
-        entries=entries,
-        profiles=profiles,
+        catalog=catalog,
         dry_run=args.dry_run,
         cluster_bootstrap=args.cluster_bootstrap,
         cluster_kustomization_path=args.cluster_kustomization,
         deploy_repo_url=args.deploy_repo_url,
         deploy_ref=args.deploy_ref,
+        jobs=args.jobs,
+        selected=selected,
+        cache=cache,
+        drift_report_path=(
+            None
+            if args.drift_report is None
+            else resolve_repo_path(repo_root, args.drift_report)
+        ),
     )
     if args.dry_run and args.fail_on_drift and changed_files > 0:
         print(f"[onboard] dry-run 检测到漂移，失败退出: {changed_files} 个文件")
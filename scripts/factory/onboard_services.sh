@@ -12,9 +12,25 @@ CLUSTER_KUSTOMIZATION_PATH="${ONBOARD_CLUSTER_KUSTOMIZATION:-cluster/kustomizati
 DEPLOY_REPO_URL="${ONBOARD_DEPLOY_REPO_URL:-https://github.com/BrunoGaoSZ/ljwx-deploy.git}"
 DEPLOY_REF="${ONBOARD_DEPLOY_REF:-main}"
 FAIL_ON_DRIFT="${ONBOARD_FAIL_ON_DRIFT:-false}"
+JOBS="${ONBOARD_JOBS:-1}"
+CACHE_FILE="${ONBOARD_CACHE_FILE:-}"
+CHANGED_ONLY="${ONBOARD_CHANGED_ONLY:-false}"
+BASE_REF="${ONBOARD_BASE_REF:-HEAD}"
+DRIFT_REPORT="${ONBOARD_DRIFT_REPORT:-}"
+
+OPTIONAL_ARGS=()
+if [[ -n "$CACHE_FILE" ]]; then
+  OPTIONAL_ARGS+=(--cache-file "$CACHE_FILE")
+fi
+if [[ "$CHANGED_ONLY" == "true" ]]; then
+  OPTIONAL_ARGS+=(--changed-only --base-ref "$BASE_REF")
+fi
+if [[ -n "$DRIFT_REPORT" ]]; then
+  OPTIONAL_ARGS+=(--drift-report "$DRIFT_REPORT")
+fi
 
 if [[ "$MODE" == "dry-run" ]]; then
-  EXTRA_ARGS=()
+  EXTRA_ARGS=("${OPTIONAL_ARGS[@]}")
   if [[ "$FAIL_ON_DRIFT" == "true" ]]; then
     EXTRA_ARGS+=(--fail-on-drift)
   fi
@@ -28,6 +44,7 @@ if [[ "$MODE" == "dry-run" ]]; then
     --cluster-kustomization "$CLUSTER_KUSTOMIZATION_PATH" \
     --deploy-repo-url "$DEPLOY_REPO_URL" \
     --deploy-ref "$DEPLOY_REF" \
+    --jobs "$JOBS" \
     "${EXTRA_ARGS[@]}" \
     --dry-run
 else
@@ -40,5 +57,7 @@ else
     --cluster-bootstrap "$CLUSTER_BOOTSTRAP" \
     --cluster-kustomization "$CLUSTER_KUSTOMIZATION_PATH" \
     --deploy-repo-url "$DEPLOY_REPO_URL" \
-    --deploy-ref "$DEPLOY_REF"
+    --deploy-ref "$DEPLOY_REF" \
+    --jobs "$JOBS" \
+    "${OPTIONAL_ARGS[@]}"
 fi
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark pure-Python vs libyaml YAML I/O on evidence records."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import yaml_io
+from yaml_io import yaml
+
+
+def per_record_us(
+    fn: Callable[[Any], Any], items: list[Any], rounds: int
+) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for item in items:
+            fn(item)
+    return (time.perf_counter() - start) / (rounds * len(items)) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records-dir", type=Path, default=Path("evidence/records"))
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    texts = [
+        path.read_text(encoding="utf-8")
+        for path in sorted(args.records_dir.glob("*.yaml"))
+        if path.is_file()
+    ]
+    if not texts:
+        print(f"no records under {args.records_dir}")
+        return 1
+
+    dump_kwargs = {"sort_keys": False, "allow_unicode": True}
+    records = [yaml.load(text, Loader=yaml.SafeLoader) for text in texts]  # noqa: S506
+
+    mismatched = sum(
+        1
+        for text, record in zip(texts, records)
+        if yaml_io.safe_load(text) != record
+        or yaml_io.safe_dump(record, **dump_kwargs)
+        != yaml.dump(record, Dumper=yaml.SafeDumper, **dump_kwargs)
+    )
+
+    load_pure = per_record_us(
+        lambda text: yaml.load(text, Loader=yaml.SafeLoader),  # noqa: S506
+        texts,
+        args.rounds,
+    )
+    load_fast = per_record_us(yaml_io.safe_load, texts, args.rounds)
+    dump_pure = per_record_us(
+        lambda record: yaml.dump(record, Dumper=yaml.SafeDumper, **dump_kwargs),
+        records,
+        args.rounds,
+    )
+    dump_fast = per_record_us(
+        lambda record: yaml_io.safe_dump(record, **dump_kwargs),
+        records,
+        args.rounds,
+    )
+
+    print(
+        json.dumps(
+            {
+                "records": len(texts),
+                "rounds": args.rounds,
+                "libyaml": yaml_io.HAS_LIBYAML,
+                "mismatched": mismatched,
+                "loadUsPerRecord": {
+                    "pure": round(load_pure, 1),
+                    "yamlIo": round(load_fast, 1),
+                    "speedup": round(load_pure / load_fast, 2),
+                },
+                "dumpUsPerRecord": {
+                    "pure": round(dump_pure, 1),
+                    "yamlIo": round(dump_fast, 1),
+                    "speedup": round(dump_pure / dump_fast, 2),
+                },
+            },
+            indent=2,
+        )
+    )
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Compiled onboarding catalog snapshot for ``onboard_services.py``.
+
+``scripts/factory/onboard_services.py`` resolves every catalog entry against
+the service templates and the ingress/namespace/registry/runtime-secret/
+capability profiles, then caches the result as one JSON snapshot under the
+gitignored ``factory/onboarding/.cache/``. The snapshot records the SHA-256 of
+every file it was derived from, including the onboarding code, so the next run
+only needs to hash those few files to know whether it is still current; a stale
+or foreign snapshot reads as ``None`` and onboarding re-parses the raw YAML.
+The CLI prints the resolved entries for debugging.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Iterable
+
+COMPILED_CATALOG_VERSION = 1
+DEFAULT_COMPILED_CATALOG_PATH = Path(
+    "factory/onboarding/.cache/catalog.compiled.json"
+)
+
+
+def file_digest(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def source_key(repo_root: Path, path: Path) -> str:
+    return Path(os.path.relpath(path.resolve(), repo_root.resolve())).as_posix()
+
+
+def source_digests(repo_root: Path, paths: Iterable[Path]) -> dict[str, str | None]:
+    resolved = [path if path.is_absolute() else repo_root / path for path in paths]
+    return {source_key(repo_root, path): file_digest(path) for path in resolved}
+
+
+def load(
+    path: Path = DEFAULT_COMPILED_CATALOG_PATH,
+    repo_root: Path = Path("."),
+    expected_sources: Iterable[Path] | None = None,
+) -> dict[str, Any] | None:
+    """Return the snapshot if every recorded source still has its digest.
+
+    With ``expected_sources`` the snapshot must also have been compiled from
+    exactly those files (e.g. the same ``--catalog``).
+    """
+    snapshot_path = path if path.is_absolute() else repo_root / path
+    try:
+        payload = json.loads(snapshot_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(payload, dict)
+        or payload.get("version") != COMPILED_CATALOG_VERSION
+        or not isinstance(payload.get("sources"), dict)
+        or not isinstance(payload.get("entries"), list)
+    ):
+        return None
+    sources: dict[str, Any] = payload["sources"]
+    if expected_sources is not None:
+        expected = {
+            source_key(repo_root, item if item.is_absolute() else repo_root / item)
+            for item in expected_sources
+        }
+        if expected != set(sources):
+            return None
+    for rel_path, digest in sources.items():
+        if digest is None or file_digest(repo_root / rel_path) != digest:
+            return None
+    return payload
+
+
+def write(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text(
+        json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+    )
+    tmp.replace(path)
+
+
+def entries_by_key(payload: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Map ``service/environment`` to its resolved entry."""
+    return {str(item["key"]): item for item in payload["entries"]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Print resolved services from the compiled onboarding catalog"
+    )
+    parser.add_argument("--path", type=Path, default=DEFAULT_COMPILED_CATALOG_PATH)
+    parser.add_argument("--repo-root", type=Path, default=Path("."))
+    args = parser.parse_args()
+
+    payload = load(args.path, args.repo_root)
+    if payload is None:
+        print(
+            f"compiled catalog missing or stale: {args.path} "
+            "(rerun scripts/factory/onboard_services.py --dry-run)",
+            file=sys.stderr,
+        )
+        return 1
+    print(json.dumps(entries_by_key(payload), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""Pooled keep-alive HTTP client shared by the smoke runner and the promoter.
+
+Connections are kept per (scheme, host, proxy) and reused across requests and
+threads. Idempotent requests are retried on a fresh connection after
+connection-level failures; other methods are only retried when a reused
+keep-alive connection turned out to be closed by the server before it
+answered, which means the request never reached the application. GET and HEAD
+follow redirects like ``urllib.request.urlopen`` did, so callers see the final
+status.
+"""
+
+from __future__ import annotations
+
+import base64
+import http.client
+import ssl
+import threading
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Any
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS", "TRACE"})
+REDIRECT_METHODS = frozenset({"GET", "HEAD"})
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+# Credentials are only resent to the origin they were meant for.
+ORIGIN_BOUND_HEADERS = frozenset({"authorization", "cookie"})
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    status: int
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def text(self, limit: int | None = None) -> str:
+        data = self.body if limit is None else self.body[:limit]
+        return data.decode("utf-8", errors="ignore")
+
+
+def build_ssl_context(verify: bool = True, ca_file: str = "") -> ssl.SSLContext:
+    context = ssl.create_default_context(cafile=ca_file or None)
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+class HttpClient:
+    """Thread-safe keep-alive connection pool with retry-on-idempotent."""
+
+    def __init__(
+        self,
+        verify: bool = True,
+        ca_file: str = "",
+        timeout: float = 10.0,
+        retries: int = 1,
+        max_idle_per_host: int = 8,
+        use_env_proxies: bool = True,
+        max_redirects: int = 5,
+    ) -> None:
+        self.ssl_context = build_ssl_context(verify, ca_file)
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.max_idle_per_host = max(1, max_idle_per_host)
+        self.max_redirects = max(0, max_redirects)
+        self.proxies = urllib.request.getproxies() if use_env_proxies else {}
+        self.connections_opened = 0
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, str, str], list[http.client.HTTPConnection]] = {}
+
+    def __enter__(self) -> "HttpClient":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def _proxy_for(self, scheme: str, host: str) -> urllib.parse.SplitResult | None:
+        proxy = self.proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        if "://" not in proxy:
+            proxy = f"http://{proxy}"
+        return urllib.parse.urlsplit(proxy)
+
+    def _new_connection(
+        self, scheme: str, netloc: str, proxy: urllib.parse.SplitResult | None
+    ) -> http.client.HTTPConnection:
+        if proxy is not None:
+            proxy_host = proxy.netloc.rsplit("@", 1)[-1]
+            if scheme == "https":
+                # CONNECT tunnel through the proxy, then TLS to the origin.
+                conn: http.client.HTTPConnection = http.client.HTTPSConnection(
+                    proxy_host, timeout=self.timeout, context=self.ssl_context
+                )
+                conn.set_tunnel(netloc, headers=_proxy_headers(proxy))
+            else:
+                conn = http.client.HTTPConnection(proxy_host, timeout=self.timeout)
+        elif scheme == "https":
+            conn = http.client.HTTPSConnection(
+                netloc, timeout=self.timeout, context=self.ssl_context
+            )
+        else:
+            conn = http.client.HTTPConnection(netloc, timeout=self.timeout)
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+
+    def _checkout(
+        self, key: tuple[str, str, str], proxy: urllib.parse.SplitResult | None
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._new_connection(key[0], key[1], proxy), False
+
+    def _checkin(
+        self, key: tuple[str, str, str], conn: http.client.HTTPConnection
+    ) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        body: bytes | None = None,
+        timeout: float | None = None,
+        retries: int | None = None,
+        max_body: int | None = None,
+        max_redirects: int | None = None,
+    ) -> HttpResponse:
+        """Send one request and read the response body.
+
+        With ``max_body`` only that many bytes are kept; a longer body is not
+        drained and its connection is dropped instead of pooled. GET/HEAD
+        follow up to ``max_redirects`` redirects (default: the client's);
+        past that limit, and for other methods, the 3xx itself is returned.
+        Raises ``OSError``/``http.client.HTTPException`` once retries are
+        exhausted; HTTP error statuses are returned, not raised.
+        """
+        method = method.upper()
+        send_headers = dict(headers or {})
+        hops = self.max_redirects if max_redirects is None else max(0, max_redirects)
+        while True:
+            response = self._request_once(
+                method, url, send_headers, body, timeout, retries, max_body
+            )
+            location = response.headers.get("location", "")
+            if (
+                hops <= 0
+                or method not in REDIRECT_METHODS
+                or response.status not in REDIRECT_STATUSES
+                or not location
+            ):
+                return response
+            hops -= 1
+            target = urllib.parse.urljoin(url, location)
+            if _origin(target) != _origin(url):
+                send_headers = {
+                    name: value
+                    for name, value in send_headers.items()
+                    if name.lower() not in ORIGIN_BOUND_HEADERS
+                }
+            url = target
+
+    def _request_once(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        body: bytes | None,
+        timeout: float | None,
+        retries: int | None,
+        max_body: int | None,
+    ) -> HttpResponse:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower() or "http"
+        netloc = parts.netloc
+        proxy = self._proxy_for(scheme, parts.hostname or "")
+        key = (scheme, netloc, proxy.geturl() if proxy else "")
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        send_headers = dict(headers)
+        if proxy is not None and scheme == "http":
+            # Plain HTTP through a proxy sends the absolute URL to the proxy.
+            path = urllib.parse.urlunsplit((scheme, netloc, path, "", ""))
+            send_headers.update(_proxy_headers(proxy))
+        request_timeout = self.timeout if timeout is None else timeout
+        budget = self.retries if retries is None else max(0, retries)
+
+        attempt = 0
+        while True:
+            conn, reused = self._checkout(key, proxy)
+            conn.timeout = request_timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(request_timeout)
+            try:
+                conn.request(method, path, body=body, headers=send_headers)
+                resp = conn.getresponse()
+                data = resp.read() if max_body is None else resp.read(max_body)
+            except (OSError, http.client.HTTPException) as exc:
+                conn.close()
+                if reused and isinstance(exc, STALE_CONNECTION_ERRORS):
+                    # The server dropped an idle keep-alive connection; the
+                    # request was never processed, so any method may resend.
+                    continue
+                if attempt < budget and method in IDEMPOTENT_METHODS:
+                    attempt += 1
+                    continue
+                raise
+            response = HttpResponse(
+                status=int(resp.status),
+                body=data,
+                headers={name.lower(): value for name, value in resp.getheaders()},
+            )
+            if resp.will_close or not resp.isclosed():
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            return response
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._idle = self._idle, {}
+        for conns in pools.values():
+            for conn in conns:
+                conn.close()
+
+
+def _origin(url: str) -> tuple[str, str]:
+    parts = urllib.parse.urlsplit(url)
+    return parts.scheme.lower(), parts.netloc.lower()
+
+
+def _proxy_headers(proxy: urllib.parse.SplitResult) -> dict[str, str]:
+    if proxy.username is None:
+        return {}
+    user = urllib.parse.unquote(proxy.username)
+    password = urllib.parse.unquote(proxy.password or "")
+    raw = f"{user}:{password}"
+    token = base64.b64encode(raw.encode("utf-8")).decode("ascii")
+    return {"Proxy-Authorization": f"Basic {token}"}
@@ -0,0 +1,100 @@
+"""Shared YAML I/O with the libyaml fast path.
+
+Loading uses ``CSafeLoader`` whenever PyYAML was built with libyaml; it builds
+the same Python objects as ``SafeLoader``. Dumping uses ``CSafeDumper`` only
+for payloads whose output is known to be byte-identical to ``SafeDumper``
+(single-line printable strings and short non-empty string keys, pure ASCII
+unless ``allow_unicode`` is set, and only the dump options in
+``_FAST_DUMP_OPTIONS``); anything else, such as multi-line shell scripts in
+manifests, goes through the pure Python emitter so written files never change
+formatting. Without libyaml both
+directions fall back to the pure Python classes.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable
+
+try:
+    import yaml
+except Exception as exc:  # noqa: BLE001
+    raise SystemExit(
+        f"PyYAML is required. Install with: uvx --with pyyaml python <script>\n{exc}"
+    )
+
+YAMLError = yaml.YAMLError
+
+SafeLoader: type = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+FastSafeDumper: type | None = getattr(yaml, "CSafeDumper", None)
+HAS_LIBYAML = bool(getattr(yaml, "__with_libyaml__", False)) and (
+    FastSafeDumper is not None
+)
+
+# libyaml and the pure emitter pick different scalar styles or line folding
+# for line breaks, tabs, C0/C1 controls, U+2028/2029, BOM and astral
+# characters, and different simple-key length limits.
+_EMITTER_UNSAFE = re.compile(
+    "[^\x20-\x7e\u00a0-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd]"
+)
+_MAX_SIMPLE_KEY_BYTES = 100
+# Options whose effect both emitters implement the same way. Without
+# allow_unicode they escape non-ASCII text differently, so then only ASCII
+# payloads qualify.
+_FAST_DUMP_OPTIONS = frozenset(
+    {"allow_unicode", "default_flow_style", "explicit_start", "sort_keys"}
+)
+
+
+def _unsafe_text(text: str, ascii_only: bool) -> bool:
+    return bool(_EMITTER_UNSAFE.search(text)) or (ascii_only and not text.isascii())
+
+
+def _emits_identically(data: Any, ascii_only: bool) -> bool:
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            if _unsafe_text(item, ascii_only):
+                return False
+        elif isinstance(item, dict):
+            for key, value in item.items():
+                if (
+                    not isinstance(key, str)
+                    or not key
+                    or len(key.encode("utf-8")) > _MAX_SIMPLE_KEY_BYTES
+                    or _unsafe_text(key, ascii_only)
+                ):
+                    return False
+                stack.append(value)
+        elif isinstance(item, list):
+            stack.extend(item)
+        elif item is not None and not isinstance(item, (bool, int, float)):
+            return False
+    return True
+
+
+def _dumper_for(documents: Iterable[Any], options: dict[str, Any]) -> type:
+    if not HAS_LIBYAML or not set(options) <= _FAST_DUMP_OPTIONS:
+        return yaml.SafeDumper
+    ascii_only = not options.get("allow_unicode")
+    if all(_emits_identically(doc, ascii_only) for doc in documents):
+        return FastSafeDumper  # type: ignore[return-value]
+    return yaml.SafeDumper
+
+
+def safe_load(stream: Any) -> Any:
+    return yaml.load(stream, Loader=SafeLoader)  # noqa: S506
+
+
+def safe_load_all(stream: Any) -> Iterable[Any]:
+    return yaml.load_all(stream, Loader=SafeLoader)  # noqa: S506
+
+
+def safe_dump(data: Any, **kwargs: Any) -> str:
+    return yaml.dump(data, Dumper=_dumper_for([data], kwargs), **kwargs)
+
+
+def safe_dump_all(documents: Iterable[Any], **kwargs: Any) -> str:
+    documents = list(documents)
+    return yaml.dump_all(documents, Dumper=_dumper_for(documents, kwargs), **kwargs)
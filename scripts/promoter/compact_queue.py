@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Move old terminal queue entries into monthly archive segments.
+
+``release/queue.yaml`` only needs the hot working set: pending entries, recent
+terminal entries and the latest promoted release of every service/env (smoke
+resolves its source queueId from it). Older promoted/superseded/failed entries
+are appended to ``release/archive/<YYYY-MM>.jsonl`` keyed by their terminal
+timestamp, one ``{"state": ..., "entry": ...}`` object per line so the queue
+state survives archival, and ``release/archive/index.json`` keeps the compact
+id/digest view that duplicate checks need without reading the segments.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lib"))
+
+import yaml_io  # noqa: E402
+
+
+QUEUE_STATES = ("pending", "promoted", "failed", "superseded")
+TERMINAL_STATES = ("promoted", "superseded", "failed")
+TERMINAL_TS_FIELDS = {
+    "promoted": "promotedAt",
+    "superseded": "supersededAt",
+    "failed": "failedAt",
+}
+ARCHIVE_INDEX_VERSION = 1
+DEFAULT_ARCHIVE_DIR = Path("release/archive")
+ARCHIVE_INDEX_FILE = "index.json"
+
+
+def now_utc() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def now_rfc3339() -> str:
+    return now_utc().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_ts(value: Any) -> datetime:
+    if not isinstance(value, str) or not value:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    normalized = value.strip().replace("Z", "+00:00")
+    try:
+        parsed = datetime.fromisoformat(normalized)
+    except ValueError:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def load_yaml(path: Path) -> dict[str, Any]:
+    payload = yaml_io.safe_load(path.read_text(encoding="utf-8"))
+    if payload is None:
+        return {}
+    if not isinstance(payload, dict):
+        raise ValueError(f"queue root must be mapping: {path}")
+    return payload
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(path)
+
+
+def entry_id(entry: dict[str, Any]) -> str:
+    return str(entry.get("id", "")).strip()
+
+
+def entry_digest(entry: dict[str, Any]) -> str:
+    source = entry.get("source", {}) if isinstance(entry.get("source"), dict) else {}
+    digest = str(source.get("digest", "")).strip()
+    if digest:
+        return digest
+
+    ghcr = str(source.get("ghcr", "")).strip()
+    if "@" in ghcr:
+        return ghcr.rsplit("@", 1)[1]
+    return ""
+
+
+def service_env_key(entry: dict[str, Any]) -> str:
+    service = str(entry.get("service", "")).strip()
+    env = str(entry.get("env", "")).strip()
+    return f"{service}/{env}"
+
+
+def terminal_ts(state: str, entry: dict[str, Any]) -> datetime:
+    ts = parse_ts(entry.get(TERMINAL_TS_FIELDS[state]))
+    if ts == datetime.min.replace(tzinfo=timezone.utc):
+        ts = parse_ts(entry.get("createdAt"))
+    return ts
+
+
+def segment_name(ts: datetime) -> str:
+    if ts == datetime.min.replace(tzinfo=timezone.utc):
+        return "undated"
+    return ts.strftime("%Y-%m")
+
+
+def empty_index() -> dict[str, Any]:
+    return {"version": ARCHIVE_INDEX_VERSION, "ids": {}, "digests": {}}
+
+
+def load_archive_index(path: Path) -> dict[str, Any]:
+    """Read the archive index; a missing or foreign file is an empty archive."""
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return empty_index()
+    if (
+        not isinstance(payload, dict)
+        or payload.get("version") != ARCHIVE_INDEX_VERSION
+        or not isinstance(payload.get("ids"), dict)
+        or not isinstance(payload.get("digests"), dict)
+    ):
+        return empty_index()
+    return payload
+
+
+def index_entry(
+    index: dict[str, Any], segment: str, state: str, entry: dict[str, Any]
+) -> None:
+    eid = entry_id(entry)
+    if eid:
+        index["ids"][eid] = segment
+    # Duplicate-digest checks only look at releases that actually went out;
+    # the queue state decides that, not the entry's free-form status field.
+    if state != "promoted":
+        return
+    digest = entry_digest(entry)
+    if digest:
+        index["digests"].setdefault(service_env_key(entry), {})[digest] = eid
+
+
+def write_archive_index(path: Path, index: dict[str, Any]) -> None:
+    payload = {
+        "version": ARCHIVE_INDEX_VERSION,
+        "generatedAt": now_rfc3339(),
+        "ids": dict(sorted(index["ids"].items())),
+        "digests": {
+            key: dict(sorted(digests.items()))
+            for key, digests in sorted(index["digests"].items())
+        },
+    }
+    write_text_atomic(path, json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
+
+
+def read_segment(path: Path) -> list[tuple[str, dict[str, Any]]]:
+    """(state, entry) pairs of one segment, in append order."""
+    if not path.exists():
+        return []
+    records: list[tuple[str, dict[str, Any]]] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        item = json.loads(line)
+        if (
+            isinstance(item, dict)
+            and item.get("state") in TERMINAL_STATES
+            and isinstance(item.get("entry"), dict)
+        ):
+            records.append((item["state"], item["entry"]))
+    return records
+
+
+def append_segment(path: Path, records: list[tuple[str, dict[str, Any]]]) -> int:
+    """Append entries not already in the segment; returns how many were written.
+
+    Skipping ids already present keeps a rerun after an interrupted compaction
+    (segment appended, queue not yet rewritten) from duplicating history.
+    """
+    present = {entry_id(entry) for _state, entry in read_segment(path)}
+    fresh = [
+        (state, entry)
+        for state, entry in records
+        if not entry_id(entry) or entry_id(entry) not in present
+    ]
+    if not fresh:
+        return 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as fh:
+        for state, entry in fresh:
+            line = {"state": state, "entry": entry}
+            fh.write(json.dumps(line, ensure_ascii=False, sort_keys=False) + "\n")
+    return len(fresh)
+
+
+def select_archivable(
+    queue: dict[str, list[dict[str, Any]]],
+    cutoff: datetime,
+    keep_latest_promoted: int,
+) -> dict[str, list[tuple[str, dict[str, Any]]]]:
+    """Return archivable (state, entry) pairs per segment, in queue order.
+
+    The newest ``keep_latest_promoted`` promoted entries of each service/env
+    always stay hot regardless of age.
+    """
+    pinned: set[int] = set()
+    by_service_env: dict[str, list[tuple[datetime, dict[str, Any]]]] = {}
+    for entry in queue["promoted"]:
+        by_service_env.setdefault(service_env_key(entry), []).append(
+            (terminal_ts("promoted", entry), entry)
+        )
+    for items in by_service_env.values():
+        items.sort(key=lambda item: item[0], reverse=True)
+        pinned.update(id(entry) for _ts, entry in items[:keep_latest_promoted])
+
+    segments: dict[str, list[tuple[str, dict[str, Any]]]] = {}
+    for state in TERMINAL_STATES:
+        for entry in queue[state]:
+            if id(entry) in pinned:
+                continue
+            ts = terminal_ts(state, entry)
+            if ts >= cutoff:
+                continue
+            segments.setdefault(segment_name(ts), []).append((state, entry))
+    return segments
+
+
+def compact_queue(
+    queue_path: Path,
+    archive_dir: Path,
+    retention_days: int,
+    keep_latest_promoted: int,
+    dry_run: bool,
+) -> dict[str, Any]:
+    raw = load_yaml(queue_path)
+    queue: dict[str, list[dict[str, Any]]] = {}
+    for state in QUEUE_STATES:
+        items = raw.get(state, [])
+        if not isinstance(items, list):
+            raise ValueError(f"queue key must be list: {state}")
+        queue[state] = items
+
+    cutoff = now_utc() - timedelta(days=retention_days)
+    segments = select_archivable(queue, cutoff, keep_latest_promoted)
+    moved = {id(entry) for records in segments.values() for _state, entry in records}
+
+    summary: dict[str, Any] = {
+        "archived": len(moved),
+        "segments": {name: len(records) for name, records in sorted(segments.items())},
+        "remaining": {
+            state: sum(1 for entry in queue[state] if id(entry) not in moved)
+            for state in QUEUE_STATES
+        },
+        "dryRun": dry_run,
+    }
+    if dry_run or not moved:
+        return summary
+
+    # Order matters for crash safety: history first, then the index, and the
+    # queue last, so an interrupted run only ever leaves entries duplicated
+    # between queue and archive (which the next run resolves), never lost.
+    index_path = archive_dir / ARCHIVE_INDEX_FILE
+    index = load_archive_index(index_path)
+    for name, records in sorted(segments.items()):
+        append_segment(archive_dir / f"{name}.jsonl", records)
+        for state, entry in records:
+            index_entry(index, name, state, entry)
+    write_archive_index(index_path, index)
+
+    for state in TERMINAL_STATES:
+        raw[state] = [entry for entry in queue[state] if id(entry) not in moved]
+    write_text_atomic(
+        queue_path, yaml_io.safe_dump(raw, sort_keys=False, allow_unicode=True)
+    )
+    return summary
+
+
+def rebuild_index(archive_dir: Path) -> int:
+    index = empty_index()
+    count = 0
+    for path in sorted(archive_dir.glob("*.jsonl")):
+        for state, entry in read_segment(path):
+            index_entry(index, path.stem, state, entry)
+            count += 1
+    write_archive_index(archive_dir / ARCHIVE_INDEX_FILE, index)
+    return count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Archive old terminal release queue entries into monthly segments"
+    )
+    parser.add_argument("--queue", type=Path, default=Path("release/queue.yaml"))
+    parser.add_argument("--archive-dir", type=Path, default=DEFAULT_ARCHIVE_DIR)
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=30,
+        help="keep terminal entries newer than this many days in the queue",
+    )
+    parser.add_argument(
+        "--keep-latest-promoted",
+        type=int,
+        default=1,
+        help="promoted entries per service/env that always stay in the queue",
+    )
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="regenerate the archive index from the segment files and exit",
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    if args.retention_days < 0 or args.keep_latest_promoted < 0:
+        print("--retention-days and --keep-latest-promoted must be >= 0")
+        return 1
+
+    if args.rebuild_index:
+        count = rebuild_index(args.archive_dir)
+        print(f"rebuilt {args.archive_dir / ARCHIVE_INDEX_FILE} ({count} entries)")
+        return 0
+
+    summary = compact_queue(
+        queue_path=args.queue,
+        archive_dir=args.archive_dir,
+        retention_days=args.retention_days,
+        keep_latest_promoted=args.keep_latest_promoted,
+        dry_run=args.dry_run,
+    )
+    print(json.dumps(summary, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,23 +4,48 @@
 from __future__ import annotations
 
 import argparse
+import base64
 import copy
+import fcntl
+import hashlib
+import http.client
+import json
 import os
 import re
 import shutil
 import subprocess
+import sys
 import tempfile
+import threading
+import time
 import urllib.parse
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
-try:
-    import yaml
-except Exception as exc:  # noqa: BLE001
-    raise SystemExit(
-        f"PyYAML is required. Install with: uvx --with pyyaml python <script>\n{exc}"
-    )
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lib"))
+# Evidence helpers live next to their CLIs in scripts/evidence; import them so
+# a promotion reuses the in-memory queue/records instead of re-spawning Python.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "evidence"))
+
+import collect as evidence_collect  # noqa: E402
+import http_pool  # noqa: E402
+import queue_metrics  # noqa: E402
+import validate as evidence_validate  # noqa: E402
+import yaml_io  # noqa: E402
+
+
+QUEUE_STATES = ("pending", "promoted", "failed", "superseded")
+DEFAULT_STATE_DIR = Path("release/.promoter-state")
+REGISTRY_CACHE_FILE = "registry-readiness.json"
+NOOP_STATE_FILE = "noop-fingerprint.json"
+EVIDENCE_RECORDS_DIR = Path("evidence/records")
+EVIDENCE_SCHEMA_PATH = Path("evidence/schema/evidence.schema.json")
+EVIDENCE_INDEX_PATH = Path("evidence/index.json")
+EVIDENCE_SUMMARY_PATH = Path("evidence/summary/latest.md")
+QUEUE_METRICS_PATH = Path("evidence/metrics/queue-health.json")
+ARCHIVE_INDEX_PATH = Path("release/archive/index.json")
 
 
 def now_rfc3339() -> str:
@@ -49,7 +74,7 @@ def yaml_load(path: Path, default: Any) -> Any:
     if not path.exists():
         return copy.deepcopy(default)
     text = path.read_text(encoding="utf-8")
-    data = yaml.safe_load(text)
+    data = yaml_io.safe_load(text)
     if data is None:
         return copy.deepcopy(default)
     return data
@@ -58,42 +83,156 @@ def yaml_load(path: Path, default: Any) -> Any:
 def yaml_dump(path: Path, data: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(
-        yaml.safe_dump(data, sort_keys=False, allow_unicode=True), encoding="utf-8"
+        yaml_io.safe_dump(data, sort_keys=False, allow_unicode=True), encoding="utf-8"
     )
 
 
 def ensure_queue_shape(queue: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
-    return {
-        "pending": list(queue.get("pending", [])),
-        "promoted": list(queue.get("promoted", [])),
-        "failed": list(queue.get("failed", [])),
-        "superseded": list(queue.get("superseded", [])),
-    }
+    return {state: list(queue.get(state, [])) for state in QUEUE_STATES}
 
 
 def entry_id(entry: dict[str, Any]) -> str:
     return str(entry.get("id", "")).strip()
 
 
-def by_id(entries: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
-    out: dict[str, dict[str, Any]] = {}
-    for e in entries:
-        eid = entry_id(e)
-        if eid:
-            out[eid] = e
-    return out
+def service_env_key(entry: dict[str, Any]) -> tuple[str, str]:
+    return (
+        str(entry.get("service", "")).strip(),
+        str(entry.get("env", "dev")).strip(),
+    )
+
+
+class ReleaseQueue:
+    """release/queue.yaml held as insertion-ordered id -> entry maps per state.
 
+    Upsert, removal, cross-state moves and id lookups are O(1). Each state also
+    keeps a (service, env) -> entries index, maintained by the same calls, so
+    grouping pending releases does not rescan the queue. ``to_dict`` emits the
+    states as lists in the same order the list-based code produced: upserting an
+    existing id keeps its position, new ids are appended.
+    """
 
-def upsert_entry(entries: list[dict[str, Any]], entry: dict[str, Any]) -> None:
-    eid = entry_id(entry)
-    if not eid:
-        entries.append(entry)
-        return
-    for idx, it in enumerate(entries):
-        if entry_id(it) == eid:
-            entries[idx] = entry
+    def __init__(self, payload: dict[str, list[dict[str, Any]]]) -> None:
+        self._entries: dict[str, dict[Any, dict[str, Any]]] = {
+            state: {} for state in QUEUE_STATES
+        }
+        # id(entry) -> (key, group): entries are held by the queue, so their
+        # identity is stable while they are in it.
+        self._slots: dict[str, dict[int, tuple[Any, tuple[str, str]]]] = {
+            state: {} for state in QUEUE_STATES
+        }
+        self._groups: dict[str, dict[tuple[str, str], dict[Any, dict[str, Any]]]] = {
+            state: {} for state in QUEUE_STATES
+        }
+        self._anonymous = 0
+        for state in QUEUE_STATES:
+            for entry in payload.get(state, []):
+                self._add(state, entry)
+
+    def _key(self, state: str, entry: dict[str, Any]) -> Any:
+        eid = entry_id(entry)
+        if eid and eid not in self._entries[state]:
+            return eid
+        # Entries without an id (or repeated ids in one state) cannot be
+        # addressed by id; give them a private key so they still round-trip.
+        self._anonymous += 1
+        return (eid, self._anonymous)
+
+    def _key_of(self, state: str, entry: dict[str, Any]) -> Any:
+        slot = self._slots[state].get(id(entry))
+        if slot is None or self._entries[state].get(slot[0]) is not entry:
+            return None
+        return slot[0]
+
+    def _index(self, state: str, key: Any, entry: dict[str, Any]) -> None:
+        group = service_env_key(entry)
+        self._slots[state][id(entry)] = (key, group)
+        self._groups[state].setdefault(group, {})[key] = entry
+
+    def _unindex(self, state: str, entry: dict[str, Any]) -> None:
+        key, group = self._slots[state].pop(id(entry))
+        members = self._groups[state][group]
+        del members[key]
+        if not members:
+            del self._groups[state][group]
+
+    def _regroup(self, state: str) -> None:
+        self._slots[state] = {}
+        self._groups[state] = {}
+        for key, entry in self._entries[state].items():
+            self._index(state, key, entry)
+
+    def _add(self, state: str, entry: dict[str, Any]) -> None:
+        key = self._key(state, entry)
+        self._entries[state][key] = entry
+        self._index(state, key, entry)
+
+    def entries(self, state: str) -> list[dict[str, Any]]:
+        return list(self._entries[state].values())
+
+    def count(self, state: str) -> int:
+        return len(self._entries[state])
+
+    def contains(self, state: str, eid: str) -> bool:
+        return bool(eid) and eid in self._entries[state]
+
+    def get(self, state: str, eid: str) -> dict[str, Any] | None:
+        return self._entries[state].get(eid) if eid else None
+
+    def find(self, eid: str) -> tuple[str, dict[str, Any]] | None:
+        for state in QUEUE_STATES:
+            entry = self.get(state, eid)
+            if entry is not None:
+                return state, entry
+        return None
+
+    def service_env_groups(
+        self, state: str
+    ) -> dict[tuple[str, str], list[dict[str, Any]]]:
+        """Entries of one state grouped by (service, env), in queue order.
+
+        Read from the maintained index; the lists are copies, so callers may
+        sort them or mutate the queue while walking them.
+        """
+        return {
+            group: list(members.values())
+            for group, members in self._groups[state].items()
+        }
+
+    def upsert(self, state: str, entry: dict[str, Any]) -> None:
+        eid = entry_id(entry)
+        current = self._entries[state].get(eid) if eid else None
+        if current is None:
+            self._add(state, entry)
             return
-    entries.append(entry)
+        self._entries[state][eid] = entry
+        group = self._slots[state].pop(id(current))[1]
+        if service_env_key(entry) == group:
+            self._slots[state][id(entry)] = (eid, group)
+            self._groups[state][group][eid] = entry
+        else:
+            # The replacement moved to another (service, env); rebuild so the
+            # group lists stay in queue order.
+            self._regroup(state)
+
+    def remove(self, state: str, entry: dict[str, Any]) -> None:
+        key = self._key_of(state, entry)
+        if key is not None:
+            self._unindex(state, entry)
+            del self._entries[state][key]
+
+    def move(self, entry: dict[str, Any], src: str, dst: str) -> None:
+        self.remove(src, entry)
+        self.upsert(dst, entry)
+
+    def reorder(self, state: str, entries: list[dict[str, Any]]) -> None:
+        """Rewrite one state to exactly ``entries`` (all currently present)."""
+        keys = [self._key_of(state, entry) for entry in entries]
+        self._entries[state] = {key: self._entries[state][key] for key in keys}
+        self._regroup(state)
+
+    def to_dict(self) -> dict[str, list[dict[str, Any]]]:
+        return {state: self.entries(state) for state in QUEUE_STATES}
 
 
 def get_digest(entry: dict[str, Any]) -> str:
@@ -153,6 +292,201 @@ def harbor_repo_path(harbor_image: str, harbor_url: str) -> str:
     return image_repo
 
 
+MANIFEST_ACCEPTS = (
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "*/*",
+)
+
+
+class HarborProbeSession:
+    """Harbor probes over the shared keep-alive pool, safe across threads."""
+
+    def __init__(
+        self,
+        harbor_url: str,
+        harbor_user: str,
+        harbor_pass: str,
+        harbor_insecure: bool,
+        timeout: float = 10.0,
+    ) -> None:
+        parsed = urllib.parse.urlsplit(harbor_url.strip())
+        self.base_url = harbor_url.rstrip("/")
+        self.origin = (
+            f"{parsed.scheme or 'https'}://{parsed.netloc or host_from_url(harbor_url)}"
+        )
+        self.headers: dict[str, str] = {}
+        if harbor_user or harbor_pass:
+            token = base64.b64encode(
+                f"{harbor_user}:{harbor_pass}".encode("utf-8")
+            ).decode("ascii")
+            self.headers["Authorization"] = f"Basic {token}"
+        self.client = http_pool.HttpClient(
+            verify=not harbor_insecure, timeout=timeout, retries=1
+        )
+
+    def status(self, method: str, path: str, accept: str) -> int:
+        try:
+            resp = self.client.request(
+                method,
+                f"{self.origin}{path}",
+                headers={**self.headers, "Accept": accept},
+            )
+        except (OSError, http.client.HTTPException):
+            return 0
+        return resp.status
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class RegistryReadinessCache:
+    """On-disk manifest readiness cache keyed by (registry host, repo, digest).
+
+    Digests are immutable, so a ready manifest is remembered forever. Misses are
+    remembered for a TTL that doubles with every consecutive miss, capped at
+    ``negative_max_ttl`` seconds.
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self, path: Path | None, negative_ttl: int, negative_max_ttl: int
+    ) -> None:
+        self.path = path
+        self.negative_ttl = max(0, negative_ttl)
+        self.negative_max_ttl = max(self.negative_ttl, negative_max_ttl)
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self.touched: set[str] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(
+        cls, path: Path | None, negative_ttl: int, negative_max_ttl: int
+    ) -> RegistryReadinessCache:
+        cache = cls(path, negative_ttl, negative_max_ttl)
+        if path is None or not path.exists():
+            return cache
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if isinstance(data, dict) and data.get("version") == cls.VERSION:
+            entries = data.get("entries", {})
+            if isinstance(entries, dict):
+                cache.entries = {
+                    str(k): v for k, v in entries.items() if isinstance(v, dict)
+                }
+        return cache
+
+    @staticmethod
+    def key(registry_host: str, repo: str, digest: str) -> str:
+        return f"{registry_host}/{repo}@{digest}"
+
+    def lookup(self, key: str) -> bool | None:
+        """Return the cached readiness, or None when Harbor must be probed."""
+        with self._lock:
+            self.touched.add(key)
+            item = self.entries.get(key)
+            if item is not None and item.get("ready") is True:
+                self.hits += 1
+                return True
+            if item is not None and parse_ts(item.get("retryAfter")) > datetime.now(
+                timezone.utc
+            ):
+                self.hits += 1
+                return False
+            self.misses += 1
+            return None
+
+    def record(self, key: str, ready: bool) -> None:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            if ready:
+                self.entries[key] = {"ready": True, "checkedAt": now_rfc3339()}
+            else:
+                previous = self.entries.get(key, {})
+                failures = int(previous.get("failures", 0)) + 1
+                ttl = min(
+                    self.negative_ttl * (2 ** (failures - 1)), self.negative_max_ttl
+                )
+                self.entries[key] = {
+                    "ready": False,
+                    "failures": failures,
+                    "checkedAt": now_rfc3339(),
+                    "retryAfter": (now + timedelta(seconds=ttl)).strftime(
+                        "%Y-%m-%dT%H:%M:%SZ"
+                    ),
+                }
+            self.dirty = True
+
+    def next_retry_at(self) -> datetime | None:
+        """Earliest backoff expiry among the not-ready digests seen this run."""
+        with self._lock:
+            retries = [
+                parse_ts(self.entries[key].get("retryAfter"))
+                for key in self.touched
+                if key in self.entries and self.entries[key].get("ready") is not True
+            ]
+        return min(retries) if retries else None
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            positive = sum(1 for v in self.entries.values() if v.get("ready") is True)
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "positiveEntries": positive,
+                "negativeEntries": len(self.entries) - positive,
+            }
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        with self._lock:
+            payload = {
+                "version": self.VERSION,
+                "updatedAt": now_rfc3339(),
+                "lastRun": {"hits": self.hits, "misses": self.misses},
+                "entries": dict(sorted(self.entries.items())),
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(
+            json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        )
+        tmp.replace(self.path)
+        self.dirty = False
+
+
+def probe_harbor_manifest(session: HarborProbeSession, repo: str, digest: str) -> bool:
+    prefix = urllib.parse.urlsplit(session.base_url).path.rstrip("/")
+    endpoint = f"{prefix}/v2/{repo}/manifests/{digest}"
+
+    if "/" in repo:
+        project, repository = repo.split("/", 1)
+        project_encoded = urllib.parse.quote(project, safe="")
+        repository_encoded = urllib.parse.quote(repository, safe="")
+        digest_encoded = urllib.parse.quote(digest, safe="")
+        artifact_endpoint = (
+            f"{prefix}/api/v2.0/projects/{project_encoded}/repositories/"
+            f"{repository_encoded}/artifacts/{digest_encoded}"
+        )
+        if session.status("GET", artifact_endpoint, "application/json") == 200:
+            return True
+
+    for method in ("HEAD", "GET"):
+        for accept in MANIFEST_ACCEPTS:
+            if session.status(method, endpoint, accept) == 200:
+                return True
+    return False
+
+
 def harbor_manifest_ready(
     harbor_image: str,
     digest: str,
@@ -160,6 +494,8 @@ def harbor_manifest_ready(
     harbor_user: str,
     harbor_pass: str,
     harbor_insecure: bool,
+    session: HarborProbeSession | None = None,
+    cache: RegistryReadinessCache | None = None,
 ) -> bool:
     if not harbor_url.strip():
         return False
@@ -168,47 +504,64 @@ def harbor_manifest_ready(
     if not repo or not digest:
         return False
 
-    endpoint = f"{harbor_url.rstrip('/')}/v2/{repo}/manifests/{digest}"
-    base = ["curl", "-sS", "-o", "/dev/null", "-w", "%{http_code}"]
-    if harbor_insecure:
-        base.insert(1, "-k")
-    if harbor_user or harbor_pass:
-        base += ["-u", f"{harbor_user}:{harbor_pass}"]
+    cache_key = RegistryReadinessCache.key(host_from_url(harbor_url), repo, digest)
+    if cache is not None:
+        cached = cache.lookup(cache_key)
+        if cached is not None:
+            return cached
 
-    if "/" in repo:
-        project, repository = repo.split("/", 1)
-        project_encoded = urllib.parse.quote(project, safe="")
-        repository_encoded = urllib.parse.quote(repository, safe="")
-        digest_encoded = urllib.parse.quote(digest, safe="")
-        artifact_endpoint = (
-            f"{harbor_url.rstrip('/')}/api/v2.0/projects/{project_encoded}/repositories/"
-            f"{repository_encoded}/artifacts/{digest_encoded}"
+    owns_session = session is None
+    if session is None:
+        session = HarborProbeSession(
+            harbor_url, harbor_user, harbor_pass, harbor_insecure
         )
-        api_cmd = base + ["-H", "Accept: application/json", artifact_endpoint]
-        api = subprocess.run(api_cmd, text=True, capture_output=True)
-        if api.returncode == 0 and api.stdout.strip() == "200":
-            return True
+    try:
+        ready = probe_harbor_manifest(session, repo, digest)
+    finally:
+        if owns_session:
+            session.close()
 
-    accepts = [
-        "application/vnd.oci.image.manifest.v1+json",
-        "application/vnd.oci.image.index.v1+json",
-        "application/vnd.docker.distribution.manifest.v2+json",
-        "application/vnd.docker.distribution.manifest.list.v2+json",
-        "*/*",
-    ]
-
-    for accept in accepts:
-        head_cmd = base + ["-I", "-H", f"Accept: {accept}", endpoint]
-        head = subprocess.run(head_cmd, text=True, capture_output=True)
-        if head.returncode == 0 and head.stdout.strip() == "200":
-            return True
+    if cache is not None:
+        cache.record(cache_key, ready)
+    return ready
 
-    for accept in accepts:
-        get_cmd = base + ["-X", "GET", "-H", f"Accept: {accept}", endpoint]
-        get = subprocess.run(get_cmd, text=True, capture_output=True)
-        if get.returncode == 0 and get.stdout.strip() == "200":
-            return True
-    return False
+
+def probe_registry_readiness(
+    candidates: set[tuple[str, str]],
+    harbor_url: str,
+    harbor_user: str,
+    harbor_pass: str,
+    harbor_insecure: bool,
+    workers: int,
+    cache: RegistryReadinessCache | None = None,
+) -> dict[tuple[str, str], bool]:
+    """Probe every (image, digest) candidate concurrently over one shared session."""
+    if not candidates or not harbor_url.strip():
+        return {}
+
+    ordered = sorted(candidates)
+    session = HarborProbeSession(harbor_url, harbor_user, harbor_pass, harbor_insecure)
+
+    def probe(candidate: tuple[str, str]) -> bool:
+        image, digest = candidate
+        return harbor_manifest_ready(
+            image,
+            digest,
+            harbor_url,
+            harbor_user,
+            harbor_pass,
+            harbor_insecure,
+            session=session,
+            cache=cache,
+        )
+
+    max_workers = max(1, min(workers, len(ordered)))
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="harbor-probe"
+    ) as pool:
+        results = dict(zip(ordered, pool.map(probe, ordered)))
+    session.close()
+    return results
 
 
 def image_belongs_to_harbor(image_ref: str, harbor_url: str) -> bool:
@@ -283,48 +636,51 @@ def resolve_target(
     return {}
 
 
+def load_archived_ids(path: Path) -> set[str]:
+    """Ids compacted out of the queue into release/archive (see compact_queue.py)."""
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return set()
+    ids = payload.get("ids") if isinstance(payload, dict) else None
+    return {str(eid) for eid in ids} if isinstance(ids, dict) else set()
+
+
 def normalize_pending(
-    queue: dict[str, list[dict[str, Any]]], now: str
-) -> tuple[dict[str, list[dict[str, Any]]], bool]:
+    queue: ReleaseQueue, now: str, archived_ids: set[str] | None = None
+) -> tuple[ReleaseQueue, bool]:
     changed = False
-    pending = queue["pending"]
-    promoted_ids = set(by_id(queue["promoted"]).keys())
-    failed_ids = set(by_id(queue["failed"]).keys())
-    superseded_ids = set(by_id(queue["superseded"]).keys())
-
-    filtered: list[dict[str, Any]] = []
-    for entry in pending:
+    archived = archived_ids or set()
+    for entry in queue.entries("pending"):
         eid = entry_id(entry)
-        if eid and (eid in promoted_ids or eid in failed_ids or eid in superseded_ids):
+        # Archived ids are terminal too: re-enqueueing one must not re-promote
+        # an old digest.
+        if eid and (
+            eid in archived
+            or any(
+                queue.contains(state, eid)
+                for state in ("promoted", "failed", "superseded")
+            )
+        ):
+            queue.remove("pending", entry)
             changed = True
-            continue
-        filtered.append(entry)
-
-    grouped: dict[tuple[str, str], list[dict[str, Any]]] = {}
-    for entry in filtered:
-        key = (
-            str(entry.get("service", "")).strip(),
-            str(entry.get("env", "dev")).strip(),
-        )
-        grouped.setdefault(key, []).append(entry)
 
-    new_pending: list[dict[str, Any]] = []
-    for (_svc, _env), entries in grouped.items():
+    keepers: list[dict[str, Any]] = []
+    for entries in queue.service_env_groups("pending").values():
         entries.sort(key=lambda e: parse_ts(e.get("createdAt")))
-        keeper = entries[-1]
-        new_pending.append(keeper)
+        keepers.append(entries[-1])
 
         for older in entries[:-1]:
+            queue.remove("pending", older)
             moved = copy.deepcopy(older)
             moved["status"] = "superseded"
             moved["supersededAt"] = now
             moved["reason"] = "replaced by newer pending release for same service+env"
-            upsert_entry(queue["superseded"], moved)
+            queue.upsert("superseded", moved)
             changed = True
 
-    if len(new_pending) != len(queue["pending"]):
-        changed = True
-    queue["pending"] = new_pending
+    if changed:
+        queue.reorder("pending", keepers)
     return queue, changed
 
 
@@ -374,8 +730,66 @@ def update_overlay_kustomization(
     return overlay_path, changed, data
 
 
+def resolve_images(
+    target: dict[str, Any], service: str, ghcr_image_repo: str
+) -> tuple[str, str]:
+    harbor_image = (
+        str(target.get("harborImage", "")).strip() if isinstance(target, dict) else ""
+    )
+    deploy_image = (
+        str(target.get("deployImage", "")).strip() if isinstance(target, dict) else ""
+    )
+
+    if not deploy_image and ghcr_image_repo:
+        deploy_image = ghcr_image_repo
+    if not deploy_image and harbor_image:
+        deploy_image = harbor_image
+    if not deploy_image:
+        deploy_image = f"ghcr.io/unknown/{service}"
+    return harbor_image, deploy_image
+
+
+def registry_probe_candidates(
+    pending: list[dict[str, Any]],
+    service_map: dict[str, Any],
+    harbor_url: str,
+    env_allowlist: set[str],
+) -> set[tuple[str, str]]:
+    """Collect the (image, digest) pairs process_pending will ask Harbor about."""
+    candidates: set[tuple[str, str]] = set()
+    for entry in pending:
+        service = str(entry.get("service", "")).strip()
+        env = str(entry.get("env", "dev")).strip() or "dev"
+        if env_allowlist and env not in env_allowlist:
+            continue
+        digest = get_digest(entry)
+        target = resolve_target(service_map, service, env)
+        if not service or not digest:
+            continue
+        if not str(target.get("overlayPath", "")).strip():
+            continue
+        if not str(target.get("kustomizeImageName", "")).strip():
+            continue
+
+        source = (
+            entry.get("source", {}) if isinstance(entry.get("source"), dict) else {}
+        )
+        ghcr_ref = str(source.get("ghcr", "")).strip()
+        harbor_image, deploy_image = resolve_images(
+            target, service, ghcr_repo(ghcr_ref) if ghcr_ref else ""
+        )
+        probe_image = select_registry_probe_image(
+            harbor_image=harbor_image,
+            deploy_image=deploy_image,
+            harbor_url=harbor_url,
+        )
+        if probe_image:
+            candidates.add((probe_image, digest))
+    return candidates
+
+
 def process_pending(
-    queue: dict[str, list[dict[str, Any]]],
+    queue: ReleaseQueue,
     repo_dir: Path,
     service_map: dict[str, Any],
     retry_max: int,
@@ -385,21 +799,38 @@ def process_pending(
     harbor_insecure: bool,
     skip_registry_check: bool,
     env_allowlist: set[str],
+    registry_probe_workers: int = 8,
+    registry_cache: RegistryReadinessCache | None = None,
+    archived_ids: set[str] | None = None,
 ) -> tuple[
-    dict[str, list[dict[str, Any]]],
+    ReleaseQueue,
     dict[Path, dict[str, Any]],
     dict[Path, dict[str, Any]],
     list[dict[str, str]],
     bool,
 ]:
     now = now_rfc3339()
-    queue, changed = normalize_pending(queue, now)
+    queue, changed = normalize_pending(queue, now, archived_ids)
 
     overlay_changes: dict[Path, dict[str, Any]] = {}
     evidence_changes: dict[Path, dict[str, Any]] = {}
     promoted_meta: list[dict[str, str]] = []
 
-    for entry in list(queue["pending"]):
+    registry_ready: dict[tuple[str, str], bool] = {}
+    if (not skip_registry_check) and bool(harbor_url.strip()):
+        registry_ready = probe_registry_readiness(
+            registry_probe_candidates(
+                queue.entries("pending"), service_map, harbor_url, env_allowlist
+            ),
+            harbor_url,
+            harbor_user,
+            harbor_pass,
+            harbor_insecure,
+            workers=registry_probe_workers,
+            cache=registry_cache,
+        )
+
+    for entry in queue.entries("pending"):
         service = str(entry.get("service", "")).strip()
         env = str(entry.get("env", "dev")).strip() or "dev"
         if env_allowlist and env not in env_allowlist:
@@ -423,27 +854,11 @@ def process_pending(
             if isinstance(target, dict)
             else ""
         )
-        harbor_image = (
-            str(target.get("harborImage", "")).strip()
-            if isinstance(target, dict)
-            else ""
-        )
-        deploy_image = (
-            str(target.get("deployImage", "")).strip()
-            if isinstance(target, dict)
-            else ""
-        )
+        harbor_image, deploy_image = resolve_images(target, service, ghcr_image_repo)
         argocd_app = (
             str(target.get("argocdApp", "")).strip() if isinstance(target, dict) else ""
         )
 
-        if not deploy_image and ghcr_image_repo:
-            deploy_image = ghcr_image_repo
-        if not deploy_image and harbor_image:
-            deploy_image = harbor_image
-        if not deploy_image:
-            deploy_image = f"ghcr.io/unknown/{service}"
-
         if not service or not env or not digest or not overlay_rel or not image_name:
             attempts = int(entry.get("attempts", 0)) + 1
             entry["attempts"] = attempts
@@ -453,10 +868,7 @@ def process_pending(
             if attempts >= retry_max:
                 entry["status"] = "failed"
                 entry["failedAt"] = now_rfc3339()
-                queue["pending"] = [
-                    e for e in queue["pending"] if entry_id(e) != entry_id(entry)
-                ]
-                upsert_entry(queue["failed"], entry)
+                queue.move(entry, "pending", "failed")
             changed = True
             continue
 
@@ -467,14 +879,7 @@ def process_pending(
                 deploy_image=deploy_image,
                 harbor_url=harbor_url,
             )
-            if probe_image and not harbor_manifest_ready(
-                probe_image,
-                digest,
-                harbor_url,
-                harbor_user,
-                harbor_pass,
-                harbor_insecure,
-            ):
+            if probe_image and not registry_ready.get((probe_image, digest), False):
                 continue
 
         overlay_path = repo_dir / overlay_rel
@@ -485,10 +890,7 @@ def process_pending(
             if attempts >= retry_max:
                 entry["status"] = "failed"
                 entry["failedAt"] = now_rfc3339()
-                queue["pending"] = [
-                    e for e in queue["pending"] if entry_id(e) != entry_id(entry)
-                ]
-                upsert_entry(queue["failed"], entry)
+                queue.move(entry, "pending", "failed")
             changed = True
             continue
 
@@ -504,7 +906,7 @@ def process_pending(
             changed = True
 
         evidence_id = build_evidence_id(entry, promoted_at)
-        evidence_path = repo_dir / "evidence/records" / f"{evidence_id}.yaml"
+        evidence_path = repo_dir / EVIDENCE_RECORDS_DIR / f"{evidence_id}.yaml"
         existing = yaml_load(evidence_path, default={})
         if not isinstance(existing, dict):
             existing = {}
@@ -555,10 +957,7 @@ def process_pending(
         entry["status"] = "promoted"
         entry["promotedAt"] = promoted_at
         entry["lastError"] = ""
-        queue["pending"] = [
-            e for e in queue["pending"] if entry_id(e) != entry_id(entry)
-        ]
-        upsert_entry(queue["promoted"], entry)
+        queue.move(entry, "pending", "promoted")
 
         promoted_meta.append(
             {
@@ -584,9 +983,50 @@ def run(
     return proc
 
 
-def repo_workdir(args: argparse.Namespace) -> tuple[Path, Path | None]:
+def acquire_repo_lock(path: Path, timeout_seconds: int) -> TextIO:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle = path.open("w", encoding="utf-8")
+    deadline = time.monotonic() + max(0, timeout_seconds)
+    while True:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return handle
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                handle.close()
+                raise SystemExit(
+                    f"another promoter run holds {path} (waited {timeout_seconds}s)"
+                )
+            time.sleep(1)
+
+
+def refresh_cached_clone(repo_dir: Path, url: str, branch: str) -> Path:
+    if (repo_dir / ".git").is_dir():
+        try:
+            run(["git", "rev-parse", "--verify", "HEAD"], cwd=repo_dir)
+            # Re-set the remote every run so a rotated token is picked up.
+            run(["git", "remote", "set-url", "origin", url], cwd=repo_dir)
+            run(["git", "fetch", "--depth", "1", "origin", branch], cwd=repo_dir)
+            run(["git", "reset", "--hard", "FETCH_HEAD"], cwd=repo_dir)
+            # Keep ignored files: promoter state and the evidence manifest live there.
+            run(["git", "clean", "-fd"], cwd=repo_dir)
+            return repo_dir
+        except RuntimeError:
+            # Do not echo the error: git command lines carry the token URL.
+            print(f"cached deploy repo is unusable, re-cloning: {repo_dir}")
+
+    shutil.rmtree(repo_dir, ignore_errors=True)
+    repo_dir.parent.mkdir(parents=True, exist_ok=True)
+    run(["git", "clone", "--depth", "1", "--branch", branch, url, str(repo_dir)])
+    return repo_dir
+
+
+def repo_workdir(
+    args: argparse.Namespace,
+) -> tuple[Path, Path | None, TextIO | None]:
+    """Return (repo_dir, temp root to delete, cache lock to release)."""
     if args.local_repo_dir:
-        return Path(args.local_repo_dir).resolve(), None
+        return Path(args.local_repo_dir).resolve(), None, None
 
     token = args.deploy_repo_token or os.getenv("DEPLOY_REPO_TOKEN", "")
     if not token:
@@ -596,54 +1036,166 @@ def repo_workdir(args: argparse.Namespace) -> tuple[Path, Path | None]:
     if url.startswith("https://"):
         url = url.replace("https://", f"https://x-access-token:{token}@", 1)
 
+    if args.cache_dir:
+        cache_dir = Path(args.cache_dir).resolve()
+        lock = acquire_repo_lock(cache_dir / "promoter.lock", args.cache_lock_timeout)
+        try:
+            repo_dir = refresh_cached_clone(cache_dir / "repo", url, args.push_branch)
+        except BaseException:
+            lock.close()
+            raise
+        return repo_dir, None, lock
+
     tmp = Path(tempfile.mkdtemp(prefix="promoter-"))
     repo_dir = tmp / "repo"
     run(["git", "clone", "--depth", "1", url, str(repo_dir)])
-    return repo_dir, tmp
+    return repo_dir, tmp, None
+
+
+def promoter_state_dir(
+    args: argparse.Namespace, repo_dir: Path, ephemeral_clone: bool = False
+) -> Path:
+    """Where the readiness cache and no-op fingerprint persist between runs.
+
+    With ``--cache-dir`` the state sits next to the cached clone rather than in
+    it, so re-cloning a corrupt cache keeps it.
+    """
+    if args.state_dir:
+        return Path(args.state_dir).resolve()
+    if args.cache_dir:
+        return Path(args.cache_dir).resolve() / "state"
+    if ephemeral_clone:
+        print(
+            "warning: promoter state dir is inside a temporary clone and is "
+            "discarded after this run; set PROMOTER_STATE_DIR or "
+            "PROMOTER_CACHE_DIR to keep the registry cache and no-op state",
+            file=sys.stderr,
+        )
+    return repo_dir / DEFAULT_STATE_DIR
+
+
+def run_fingerprint(
+    args: argparse.Namespace, repo_dir: Path, env_allowlist: set[str]
+) -> str:
+    """Hash the raw inputs that decide what a promoter run does."""
+    digest = hashlib.sha256()
+    for path in (
+        repo_dir / "release/queue.yaml",
+        repo_dir / args.service_map,
+        repo_dir / ARCHIVE_INDEX_PATH,
+        Path(__file__).resolve(),
+    ):
+        digest.update(path.read_bytes() if path.exists() else b"")
+        digest.update(b"\0")
+    settings = {
+        "envAllowlist": sorted(env_allowlist),
+        "harborUrl": args.harbor_url,
+        "harborUser": args.harbor_user,
+        "harborInsecure": bool(args.harbor_insecure),
+        "retryMax": args.retry_max,
+        "serviceMap": str(args.service_map),
+        "skipRegistryCheck": bool(args.skip_registry_check),
+    }
+    digest.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def is_known_noop(path: Path, fingerprint: str) -> bool:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    if not isinstance(state, dict) or state.get("fingerprint") != fingerprint:
+        return False
+    wake_at = state.get("wakeAt")
+    if wake_at and parse_ts(wake_at) <= datetime.now(timezone.utc):
+        return False
+    return True
+
+
+def save_noop_state(path: Path, fingerprint: str, wake_at: datetime | None) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "fingerprint": fingerprint,
+        "recordedAt": now_rfc3339(),
+        "wakeAt": wake_at.strftime("%Y-%m-%dT%H:%M:%SZ") if wake_at else "",
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
 
 
 def validate_queue_shape(queue: dict[str, Any]) -> None:
-    for key in ["pending", "promoted", "failed", "superseded"]:
+    for key in QUEUE_STATES:
         if key not in queue or not isinstance(queue[key], list):
             raise ValueError(f"queue missing list: {key}")
 
 
+def validate_evidence(repo_dir: Path, records: dict[Path, dict[str, Any]]) -> None:
+    if not records:
+        return
+    schema = evidence_validate.load_schema(repo_dir / EVIDENCE_SCHEMA_PATH)
+    bad = evidence_validate.validate_records(records, schema)
+    if bad:
+        details = "\n".join(f"- {path}: {error}" for path, error in bad)
+        raise RuntimeError(f"evidence validation failed:\n{details}")
+
+
+def write_evidence_outputs(
+    repo_dir: Path,
+    record_map: dict[str, dict[str, Any]],
+    fingerprints: dict[str, dict[str, Any]],
+    queue: ReleaseQueue,
+) -> None:
+    index_path = repo_dir / EVIDENCE_INDEX_PATH
+    records = evidence_collect.build_index(record_map)
+    evidence_collect.write_index(records, index_path)
+    evidence_collect.write_summary(records, repo_dir / EVIDENCE_SUMMARY_PATH)
+    evidence_collect.write_manifest(
+        evidence_collect.default_manifest_path(index_path),
+        EVIDENCE_RECORDS_DIR,
+        fingerprints,
+        index_path,
+    )
+    queue_metrics.write_metrics(queue.to_dict(), repo_dir / QUEUE_METRICS_PATH)
+
+
+def commit_message(kind: str, promoted_meta: list[dict[str, str]]) -> str:
+    if not promoted_meta:
+        return f"{kind}(ops): queue normalize [skip ci]"
+    env_set = sorted({item.get("env", "dev") for item in promoted_meta})
+    scope = env_set[0] if len(env_set) == 1 else "multi"
+    if len(promoted_meta) == 1:
+        svc = promoted_meta[0]["service"]
+        tag = promoted_meta[0]["tag"]
+        return f"{kind}({scope}): {svc} {tag} [skip ci]"
+    return f"{kind}({scope}): {len(promoted_meta)} services [skip ci]"
+
+
+def staged_paths(repo_dir: Path) -> str:
+    return run(
+        ["git", "diff", "--cached", "--name-only"], cwd=repo_dir, check=False
+    ).stdout.strip()
+
+
 def commit_and_push(
     repo_dir: Path,
+    queue: ReleaseQueue,
+    evidence_changes: dict[Path, dict[str, Any]],
     promoted_meta: list[dict[str, str]],
     push_branch: str,
     collect_evidence: bool,
     dry_run: bool,
 ) -> None:
+    """Commit the promotion in two phases and push once.
+
+    Phase 1 commits the queue and overlay changes, which is the revision Argo
+    deploys. Phase 2 writes the evidence records exactly once with that commit
+    as ``deployRepoCommit``, regenerates the index/summary/metrics once and
+    commits them on top. A normalize-only run has no evidence and commits once.
+    """
     if dry_run:
         print("DRY_RUN=1, skip commit/push")
         return
 
-    run(["python3", "scripts/evidence/validate.py"], cwd=repo_dir)
-    if collect_evidence:
-        run(
-            [
-                "python3",
-                "scripts/evidence/collect.py",
-                "--out",
-                "evidence/index.json",
-                "--summary",
-                "evidence/summary/latest.md",
-            ],
-            cwd=repo_dir,
-        )
-        run(
-            [
-                "python3",
-                "scripts/promoter/queue_metrics.py",
-                "--queue",
-                "release/queue.yaml",
-                "--out",
-                "evidence/metrics/queue-health.json",
-            ],
-            cwd=repo_dir,
-        )
-
     run(["git", "config", "user.name", "deploy-promoter[bot]"], cwd=repo_dir)
     run(
         [
@@ -655,91 +1207,61 @@ def commit_and_push(
         cwd=repo_dir,
     )
 
-    stage_paths = ["release/queue.yaml", "evidence/records"]
-    if collect_evidence:
-        stage_paths.extend(
-            [
-                "evidence/index.json",
-                "evidence/summary/latest.md",
-                "evidence/metrics/queue-health.json",
-            ]
-        )
-    stage_paths.extend(
+    deploy_paths = ["release/queue.yaml"]
+    deploy_paths.extend(
         item["overlay_path"] for item in promoted_meta if item.get("overlay_path")
     )
-    run(["git", "add", *sorted(set(stage_paths))], cwd=repo_dir)
-    diff = run(
-        ["git", "diff", "--cached", "--name-only"], cwd=repo_dir, check=False
-    ).stdout.strip()
-    if not diff:
-        print("No changes to commit")
-        return
-
-    if promoted_meta:
-        env_set = sorted({item.get("env", "dev") for item in promoted_meta})
-        scope = env_set[0] if len(env_set) == 1 else "multi"
-        if len(promoted_meta) == 1:
-            svc = promoted_meta[0]["service"]
-            tag = promoted_meta[0]["tag"]
-            message = f"promote({scope}): {svc} {tag} [skip ci]"
-        else:
-            message = f"promote({scope}): {len(promoted_meta)} services [skip ci]"
-    else:
-        message = "promote(ops): queue normalize [skip ci]"
-
-    run(["git", "commit", "-m", message], cwd=repo_dir)
-    sha = run(["git", "rev-parse", "HEAD"], cwd=repo_dir).stdout.strip()
-
-    touched = []
-    for item in promoted_meta:
-        path = repo_dir / item["evidence_path"]
-        record = yaml_load(path, default={})
-        if not isinstance(record, dict):
-            continue
-        deploy = (
-            record.get("deploy", {}) if isinstance(record.get("deploy"), dict) else {}
-        )
-        if deploy.get("deployRepoCommit") != sha:
-            deploy["deployRepoCommit"] = sha
-            record["deploy"] = deploy
-            yaml_dump(path, record)
-            touched.append(path)
+    run(["git", "add", *sorted(set(deploy_paths))], cwd=repo_dir)
 
-    if touched:
-        run(["python3", "scripts/evidence/validate.py"], cwd=repo_dir)
-        add_paths = [str(p.relative_to(repo_dir)) for p in touched]
-        if collect_evidence:
-            run(
-                [
-                    "python3",
-                    "scripts/evidence/collect.py",
-                    "--out",
-                    "evidence/index.json",
-                    "--summary",
-                    "evidence/summary/latest.md",
-                ],
-                cwd=repo_dir,
-            )
+    committed = False
+    if evidence_changes:
+        if staged_paths(repo_dir):
             run(
-                [
-                    "python3",
-                    "scripts/promoter/queue_metrics.py",
-                    "--queue",
-                    "release/queue.yaml",
-                    "--out",
-                    "evidence/metrics/queue-health.json",
-                ],
+                ["git", "commit", "-m", commit_message("promote", promoted_meta)],
                 cwd=repo_dir,
             )
-            add_paths.extend(
-                [
-                    "evidence/index.json",
-                    "evidence/summary/latest.md",
-                    "evidence/metrics/queue-health.json",
-                ]
+            committed = True
+        sha = run(["git", "rev-parse", "HEAD"], cwd=repo_dir).stdout.strip()
+        for path, record in evidence_changes.items():
+            deploy = (
+                record.get("deploy", {})
+                if isinstance(record.get("deploy"), dict)
+                else {}
             )
-        run(["git", "add", *add_paths], cwd=repo_dir)
-        run(["git", "commit", "--amend", "--no-edit"], cwd=repo_dir)
+            deploy["deployRepoCommit"] = sha
+            record["deploy"] = deploy
+            yaml_dump(path, record)
+
+    # Untouched records were validated when they were committed; only the
+    # records written by this promotion need checking.
+    validate_evidence(repo_dir, evidence_changes)
+    stage_paths = [str(EVIDENCE_RECORDS_DIR)]
+    if collect_evidence:
+        index_path = repo_dir / EVIDENCE_INDEX_PATH
+        record_map, fingerprints, _ = evidence_collect.load_record_map_incremental(
+            EVIDENCE_RECORDS_DIR,
+            index_path,
+            evidence_collect.default_manifest_path(index_path),
+            root=repo_dir,
+        )
+        write_evidence_outputs(repo_dir, record_map, fingerprints, queue)
+        stage_paths.extend(
+            [
+                str(EVIDENCE_INDEX_PATH),
+                str(EVIDENCE_SUMMARY_PATH),
+                str(QUEUE_METRICS_PATH),
+            ]
+        )
+    run(["git", "add", *stage_paths], cwd=repo_dir)
+
+    if staged_paths(repo_dir):
+        kind = "evidence" if evidence_changes else "promote"
+        run(["git", "commit", "-m", commit_message(kind, promoted_meta)], cwd=repo_dir)
+        committed = True
+
+    if not committed:
+        print("No changes to commit")
+        return
 
     run(["git", "push", "origin", f"HEAD:{push_branch}"], cwd=repo_dir)
 
@@ -758,6 +1280,17 @@ def main() -> int:
     parser.add_argument(
         "--deploy-repo-token", default=os.getenv("DEPLOY_REPO_TOKEN", "")
     )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.getenv("PROMOTER_CACHE_DIR", ""),
+        help="keep the deploy repo clone here between runs (fetch + reset instead of clone)",
+    )
+    parser.add_argument(
+        "--cache-lock-timeout",
+        type=int,
+        default=int(os.getenv("PROMOTER_CACHE_LOCK_TIMEOUT", "300")),
+        help="seconds to wait for another run holding the cache-dir lock",
+    )
     parser.add_argument(
         "--service-map", default=os.getenv("SERVICE_MAP_PATH", "release/services.yaml")
     )
@@ -782,6 +1315,42 @@ def main() -> int:
     parser.add_argument(
         "--retry-max", type=int, default=int(os.getenv("RETRY_MAX", "10"))
     )
+    parser.add_argument(
+        "--registry-probe-workers",
+        type=int,
+        default=int(os.getenv("REGISTRY_PROBE_WORKERS", "8")),
+        help="max concurrent Harbor readiness probes",
+    )
+    parser.add_argument(
+        "--state-dir",
+        default=os.getenv("PROMOTER_STATE_DIR", ""),
+        help=(
+            "persistent promoter state dir (default: <cache-dir>/state, else "
+            "release/.promoter-state in repo)"
+        ),
+    )
+    parser.add_argument(
+        "--registry-cache-negative-ttl",
+        type=int,
+        default=int(os.getenv("REGISTRY_CACHE_NEGATIVE_TTL", "60")),
+        help="seconds to trust a not-ready probe; doubles per consecutive miss",
+    )
+    parser.add_argument(
+        "--registry-cache-negative-max-ttl",
+        type=int,
+        default=int(os.getenv("REGISTRY_CACHE_NEGATIVE_MAX_TTL", "1800")),
+        help="upper bound for the not-ready backoff",
+    )
+    parser.add_argument(
+        "--no-registry-cache",
+        action="store_true",
+        help="always probe Harbor, ignoring the readiness cache",
+    )
+    parser.add_argument(
+        "--no-short-circuit",
+        action="store_true",
+        help="do a full run even if inputs match the last no-op run",
+    )
     parser.add_argument(
         "--dry-run", action="store_true", help="simulate without writing/committing"
     )
@@ -811,16 +1380,32 @@ def main() -> int:
     }
     env_allowlist = parse_env_allowlist(args.env_allowlist)
 
-    repo_dir, tmp_root = repo_workdir(args)
+    repo_dir, tmp_root, repo_lock = repo_workdir(args)
     try:
+        state_dir = promoter_state_dir(args, repo_dir, tmp_root is not None)
+        noop_path = state_dir / NOOP_STATE_FILE
+        fingerprint = run_fingerprint(args, repo_dir, env_allowlist)
+        if not args.no_short_circuit and is_known_noop(noop_path, fingerprint):
+            print(
+                "No changes made (queue, service map and registry backoff unchanged "
+                "since last no-op run)"
+            )
+            return 0
+
         queue_path = repo_dir / "release/queue.yaml"
         queue = yaml_load(queue_path, default={})
         if not isinstance(queue, dict):
             raise ValueError("release/queue.yaml root must be mapping")
-        queue = ensure_queue_shape(queue)
-        validate_queue_shape(queue)
+        queue_payload = ensure_queue_shape(queue)
+        validate_queue_shape(queue_payload)
+        queue = ReleaseQueue(queue_payload)
 
         service_map = load_service_map(repo_dir / args.service_map)
+        registry_cache = RegistryReadinessCache.load(
+            None if args.no_registry_cache else state_dir / REGISTRY_CACHE_FILE,
+            negative_ttl=args.registry_cache_negative_ttl,
+            negative_max_ttl=args.registry_cache_negative_max_ttl,
+        )
 
         queue, overlay_changes, evidence_changes, promoted_meta, changed = (
             process_pending(
@@ -834,10 +1419,30 @@ def main() -> int:
                 harbor_insecure=args.harbor_insecure,
                 skip_registry_check=args.skip_registry_check,
                 env_allowlist=env_allowlist,
+                registry_probe_workers=args.registry_probe_workers,
+                registry_cache=registry_cache,
+                archived_ids=load_archived_ids(repo_dir / ARCHIVE_INDEX_PATH),
             )
         )
+        cache_stats = registry_cache.stats()
+        if cache_stats["hits"] or cache_stats["misses"]:
+            print(
+                "registry readiness cache: "
+                f"hits={cache_stats['hits']} misses={cache_stats['misses']} "
+                f"positive={cache_stats['positiveEntries']} "
+                f"negative={cache_stats['negativeEntries']}"
+            )
+        if not dry_run:
+            registry_cache.save()
 
         if not changed:
+            # Without the readiness cache every run must re-probe Harbor, so
+            # the no-op result cannot be reused.
+            registry_checked = (not args.skip_registry_check) and bool(
+                args.harbor_url.strip()
+            )
+            if not dry_run and not (registry_checked and args.no_registry_cache):
+                save_noop_state(noop_path, fingerprint, registry_cache.next_retry_at())
             print("No changes made (nothing ready or no normalization needed)")
             return 0
 
@@ -847,19 +1452,19 @@ def main() -> int:
             print(f"- evidence changes: {len(evidence_changes)}")
             print(f"- promoted entries: {len(promoted_meta)}")
             print(
-                f"- pending: {len(queue['pending'])}, promoted: {len(queue['promoted'])}, "
-                f"failed: {len(queue['failed'])}, superseded: {len(queue['superseded'])}"
+                f"- pending: {queue.count('pending')}, promoted: {queue.count('promoted')}, "
+                f"failed: {queue.count('failed')}, superseded: {queue.count('superseded')}"
             )
             return 0
 
-        yaml_dump(queue_path, queue)
+        yaml_dump(queue_path, queue.to_dict())
         for path, data in overlay_changes.items():
             yaml_dump(path, data)
-        for path, data in evidence_changes.items():
-            yaml_dump(path, data)
 
         commit_and_push(
             repo_dir=repo_dir,
+            queue=queue,
+            evidence_changes=evidence_changes,
             promoted_meta=promoted_meta,
             push_branch=args.push_branch,
             collect_evidence=not args.skip_evidence_collect,
@@ -870,6 +1475,8 @@ def main() -> int:
     finally:
         if tmp_root is not None and tmp_root.exists():
             shutil.rmtree(tmp_root, ignore_errors=True)
+        if repo_lock is not None:
+            repo_lock.close()
 
 
 if __name__ == "__main__":
@@ -5,16 +5,14 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-try:
-    import yaml
-except Exception as exc:  # noqa: BLE001
-    raise SystemExit(
-        f"PyYAML is required. Install with: uvx --with pyyaml python <script>\n{exc}"
-    )
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lib"))
+
+import yaml_io  # noqa: E402
 
 
 def now_utc() -> datetime:
@@ -39,7 +37,7 @@ def parse_ts(value: Any) -> datetime:
 
 
 def load_yaml(path: Path) -> dict[str, Any]:
-    payload = yaml.safe_load(path.read_text(encoding="utf-8"))
+    payload = yaml_io.safe_load(path.read_text(encoding="utf-8"))
     if payload is None:
         return {}
     if not isinstance(payload, dict):
@@ -155,6 +153,17 @@ def build_metrics(
     }
 
 
+def write_metrics(
+    queue: dict[str, Any], out_path: Path, stale_threshold_seconds: int = 1800
+) -> dict[str, Any]:
+    metrics = build_metrics(ensure_queue_shape(queue), stale_threshold_seconds)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(
+        json.dumps(metrics, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+    )
+    return metrics
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Generate release queue health metrics"
@@ -169,13 +178,7 @@ def main() -> int:
     if args.stale_threshold_seconds < 1:
         raise SystemExit("stale-threshold-seconds must be positive integer")
 
-    queue_payload = ensure_queue_shape(load_yaml(args.queue))
-    metrics = build_metrics(queue_payload, args.stale_threshold_seconds)
-
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(
-        json.dumps(metrics, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
-    )
+    write_metrics(load_yaml(args.queue), args.out, args.stale_threshold_seconds)
     print(f"已写入队列健康指标: {args.out}")
     return 0
 
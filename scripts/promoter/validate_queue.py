@@ -10,12 +10,9 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-try:
-    import yaml
-except Exception as exc:  # noqa: BLE001
-    raise SystemExit(
-        f"PyYAML is required. Install with: uvx --with pyyaml python <script>\n{exc}"
-    )
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lib"))
+
+import yaml_io  # noqa: E402
 
 
 QUEUE_STATES = ("pending", "promoted", "failed", "superseded")
@@ -23,7 +20,7 @@ DIGEST_PATTERN = re.compile(r"^sha256:[0-9a-f]{64}$")
 
 
 def load_yaml(path: Path) -> Any:
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    data = yaml_io.safe_load(path.read_text(encoding="utf-8"))
     return {} if data is None else data
 
 
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Minimal asyncio HTTP load generator for the smoke load stage.
+
+Each of ``concurrency`` workers keeps one HTTP/1.1 keep-alive connection open
+and sends back-to-back ``GET`` requests until ``duration_seconds`` elapse.
+Only the standard library is used, so the stage runs wherever the smoke
+runner runs; environment proxies are ignored because targets are in-cluster
+endpoints.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import ssl
+import sys
+import time
+import urllib.parse
+from typing import Any
+
+USER_AGENT = "ljwx-smoke-load/1"
+BODYLESS_STATUSES = {204, 304}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sample."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self.latencies_ms: list[float] = []
+        self.attempts = 0
+        self.responses = 0
+        self.errors = 0
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, bool]:
+    """Consume one response; returns (status, connection reusable)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed before response")
+    parts = status_line.split(None, 2)
+    if len(parts) < 2:
+        raise ValueError(f"malformed status line: {status_line!r}")
+    version = parts[0].decode("latin-1")
+    status = int(parts[1])
+
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" and (
+        version != "HTTP/1.0" or connection == "keep-alive"
+    )
+    if status in BODYLESS_STATUSES or 100 <= status < 200:
+        return status, keep_alive
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            await reader.readexactly(size + 2)
+        return status, keep_alive
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+        return status, keep_alive
+    await reader.read()
+    return status, False
+
+
+async def _worker(
+    parts: urllib.parse.SplitResult,
+    ssl_context: ssl.SSLContext | None,
+    deadline: float,
+    timeout: float,
+    stats: _Stats,
+) -> None:
+    loop = asyncio.get_running_loop()
+    host = parts.hostname or ""
+    port = parts.port or (443 if ssl_context is not None else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    request = (
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: {parts.netloc}\r\n"
+        f"User-Agent: {USER_AGENT}\r\n"
+        "Accept: */*\r\n"
+        "Connection: keep-alive\r\n\r\n"
+    ).encode("latin-1")
+
+    reader: asyncio.StreamReader | None = None
+    writer: asyncio.StreamWriter | None = None
+    while loop.time() < deadline:
+        if writer is None:
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(host, port, ssl=ssl_context), timeout
+                )
+            except (OSError, asyncio.TimeoutError):
+                stats.attempts += 1
+                stats.errors += 1
+                # Avoid spinning on a refused port until the deadline.
+                await asyncio.sleep(min(0.05, max(0.0, deadline - loop.time())))
+                continue
+
+        stats.attempts += 1
+        started = time.perf_counter()
+        try:
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await asyncio.wait_for(
+                _read_response(reader), timeout  # type: ignore[arg-type]
+            )
+        except (
+            OSError,
+            ValueError,
+            asyncio.TimeoutError,
+            asyncio.IncompleteReadError,
+        ):
+            stats.errors += 1
+            writer.close()
+            reader = writer = None
+            continue
+
+        stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+        stats.responses += 1
+        if status >= 400:
+            stats.errors += 1
+        if not keep_alive:
+            writer.close()
+            reader = writer = None
+
+    if writer is not None:
+        writer.close()
+
+
+async def _run(
+    url: str,
+    concurrency: int,
+    duration_seconds: float,
+    timeout: float,
+    ssl_context: ssl.SSLContext | None,
+) -> tuple[_Stats, float]:
+    parts = urllib.parse.urlsplit(url)
+    loop = asyncio.get_running_loop()
+    stats = _Stats()
+    started = loop.time()
+    deadline = started + duration_seconds
+    await asyncio.gather(
+        *(
+            _worker(parts, ssl_context, deadline, timeout, stats)
+            for _ in range(concurrency)
+        )
+    )
+    return stats, loop.time() - started
+
+
+def run_load(
+    url: str,
+    concurrency: int = 4,
+    duration_seconds: float = 10.0,
+    timeout: float = 5.0,
+    verify: bool = True,
+    ca_file: str = "",
+) -> dict[str, Any]:
+    """Drive ``url`` for ``duration_seconds`` and summarize the run.
+
+    ``errors`` counts connection failures, timeouts and ``4xx/5xx`` responses;
+    ``errorRate`` is errors over attempted requests. Percentiles cover every
+    response received, whatever its status.
+    """
+    ssl_context = None
+    if urllib.parse.urlsplit(url).scheme == "https":
+        ssl_context = ssl.create_default_context(cafile=ca_file or None)
+        if not verify:
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+
+    stats, elapsed = asyncio.run(
+        _run(url, max(1, concurrency), duration_seconds, timeout, ssl_context)
+    )
+    summary: dict[str, Any] = {
+        "concurrency": max(1, concurrency),
+        "durationSeconds": round(elapsed, 2),
+        "requests": stats.attempts,
+        "errors": stats.errors,
+        "errorRate": (
+            round(stats.errors / stats.attempts, 4) if stats.attempts else 1.0
+        ),
+        "rps": round(stats.responses / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+    if stats.latencies_ms:
+        for pct in (50, 95, 99):
+            summary[f"p{pct}Ms"] = round(percentile(stats.latencies_ms, pct), 1)
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a short HTTP load test")
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--duration-seconds", type=float, default=10.0)
+    parser.add_argument("--timeout-seconds", type=float, default=5.0)
+    parser.add_argument("--insecure", action="store_true")
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            run_load(
+                args.url,
+                concurrency=args.concurrency,
+                duration_seconds=args.duration_seconds,
+                timeout=args.timeout_seconds,
+                verify=not args.insecure,
+            )
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
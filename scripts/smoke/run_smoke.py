@@ -7,22 +7,26 @@ import argparse
 import base64
 import json
 import os
+import random
 import re
+import subprocess
+import sys
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Collection, Iterator, TextIO
 
-try:
-    import yaml
-except Exception as exc:  # noqa: BLE001
-    raise SystemExit(
-        f"PyYAML is required. Install with: uvx --with pyyaml python <script>\n{exc}"
-    )
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lib"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "evidence"))
+
+import collect as evidence_collect  # noqa: E402
+import http_pool  # noqa: E402
+import loadgen  # noqa: E402
+import yaml_io  # noqa: E402
 
 
 def now_utc() -> str:
@@ -30,6 +34,9 @@ def now_utc() -> str:
 
 
 QUEUE_STATES = ("pending", "promoted", "failed", "superseded")
+# Deploy repo paths no Argo application renders; commits touching only these
+# leave the deployed manifests unchanged.
+EVIDENCE_ONLY_PREFIX = "evidence/"
 
 
 @dataclass(frozen=True)
@@ -39,6 +46,7 @@ class TargetResult:
     service: str
     source_env: str
     source_queue_id: str
+    plan: TargetPlan | None = None
 
 
 def read_json(path: Path) -> Any:
@@ -46,7 +54,7 @@ def read_json(path: Path) -> Any:
 
 
 def read_yaml(path: Path) -> dict[str, Any]:
-    raw = yaml.safe_load(path.read_text(encoding="utf-8"))
+    raw = yaml_io.safe_load(path.read_text(encoding="utf-8"))
     if raw is None:
         return {}
     if not isinstance(raw, dict):
@@ -55,7 +63,7 @@ def read_yaml(path: Path) -> dict[str, Any]:
 
 
 def read_queue(path: Path) -> dict[str, Any]:
-    raw = yaml.safe_load(path.read_text(encoding="utf-8"))
+    raw = yaml_io.safe_load(path.read_text(encoding="utf-8"))
     if raw is None:
         return {}
     if not isinstance(raw, dict):
@@ -65,7 +73,7 @@ def read_queue(path: Path) -> dict[str, Any]:
 
 def write_yaml(path: Path, payload: dict[str, Any]) -> None:
     path.write_text(
-        yaml.safe_dump(payload, sort_keys=False, allow_unicode=True), encoding="utf-8"
+        yaml_io.safe_dump(payload, sort_keys=False, allow_unicode=True), encoding="utf-8"
     )
 
 
@@ -103,48 +111,164 @@ def record_files(evidence_dir: Path) -> list[Path]:
     return sorted([p for p in evidence_dir.glob("*.yaml") if p.is_file()])
 
 
-def find_record_path(
-    evidence_dir: Path,
-    service: str,
-    environment: str,
-    queue_id: str | None,
-    prefer_pending: bool,
-) -> Path | None:
-    candidates: list[tuple[datetime, Path]] = []
+SMOKE_STATUSES = ("pending", "pass", "fail", "unknown", None)
+# Records whose ``deploy`` is not a mapping match any queueId, as before.
+ANY_QUEUE_ID = object()
+
+
+def load_evidence_records(
+    evidence_dir: Path, index_path: Path | None
+) -> dict[str, dict[str, Any]]:
+    """Load every record once, reusing a fresh evidence index when available.
+
+    With an index whose sidecar manifest still matches the files (see
+    ``collect.py --incremental``) only changed records are parsed. Unreadable
+    records are skipped, matching the previous per-target scan.
+    """
+    if index_path is not None:
+        try:
+            records, _fingerprints, _parsed = (
+                evidence_collect.load_record_map_incremental(
+                    evidence_dir,
+                    index_path,
+                    evidence_collect.default_manifest_path(index_path),
+                )
+            )
+            return records
+        except SystemExit:
+            pass
+
+    records = {}
     for path in record_files(evidence_dir):
         try:
-            record = read_yaml(path)
+            records[str(path)] = read_yaml(path)
         except Exception:  # noqa: BLE001
             continue
+    return records
 
-        if record.get("service") != service or record.get("env") != environment:
-            continue
 
-        deploy = record.get("deploy", {})
-        if (
-            queue_id
-            and isinstance(deploy, dict)
-            and str(deploy.get("queueId", "")) != str(queue_id)
-        ):
-            continue
+class EvidenceRecordIndex:
+    """Newest record path per (service, env, queueId, smoke status).
 
-        smoke_status = (
-            record.get("tests", {}).get("smoke", {}).get("status")
-            if isinstance(record.get("tests"), dict)
-            else None
-        )
-        if smoke_status not in {"pending", "pass", "fail", "unknown", None}:
-            continue
-        if prefer_pending and smoke_status != "pending":
-            continue
+    Built once per run so each target lookup is a handful of dict reads
+    instead of a YAML parse of every record.
+    """
 
-        candidates.append((record_timestamp(record), path))
+    def __init__(self, records: dict[str, dict[str, Any]]) -> None:
+        self._best: dict[tuple[Any, Any, Any, Any], tuple[datetime, int, Path]] = {}
+        self._deploy_commits: dict[Path, str] = {}
+        self._deploy_revisions: dict[str, tuple[str, ...]] = {}
+        for order, (record_path, record) in enumerate(records.items()):
+            if not isinstance(record, dict):
+                continue
+            tests = record.get("tests")
+            smoke_status = (
+                tests.get("smoke", {}).get("status")
+                if isinstance(tests, dict)
+                else None
+            )
+            if smoke_status not in SMOKE_STATUSES:
+                continue
+            deploy = record.get("deploy", {})
+            queue_key = (
+                str(deploy.get("queueId", ""))
+                if isinstance(deploy, dict)
+                else ANY_QUEUE_ID
+            )
+            # The reverse timestamp sort was stable: on ties the record that
+            # comes first in path order wins.
+            candidate = (record_timestamp(record), -order, Path(record_path))
+            if isinstance(deploy, dict) and deploy.get("deployRepoCommit"):
+                self._deploy_commits[candidate[2]] = str(deploy["deployRepoCommit"])
+            service, env = record.get("service"), record.get("env")
+            if not isinstance(service, str) or not isinstance(env, str):
+                continue
+            for key in (
+                (service, env, queue_key, smoke_status),
+                (service, env, None, smoke_status),
+            ):
+                best = self._best.get(key)
+                if best is None or candidate[:2] > best[:2]:
+                    self._best[key] = candidate
+
+    @classmethod
+    def load(
+        cls, evidence_dir: Path, index_path: Path | None = None
+    ) -> "EvidenceRecordIndex":
+        return cls(load_evidence_records(evidence_dir, index_path))
+
+    def find(
+        self,
+        service: str,
+        environment: str,
+        queue_id: str | None,
+        prefer_pending: bool,
+    ) -> Path | None:
+        statuses = ("pending",) if prefer_pending else SMOKE_STATUSES
+        queue_keys = (str(queue_id), ANY_QUEUE_ID) if queue_id else (None,)
+        best: tuple[datetime, int, Path] | None = None
+        for status in statuses:
+            for queue_key in queue_keys:
+                candidate = self._best.get((service, environment, queue_key, status))
+                if candidate is not None and (
+                    best is None or candidate[:2] > best[:2]
+                ):
+                    best = candidate
+        return best[2] if best else None
+
+    def deploy_commit(self, record_path: Path) -> str:
+        """Deploy repo commit the record's release was promoted in, or ''."""
+        return self._deploy_commits.get(record_path, "")
+
+    def deploy_revisions(self, record_path: Path) -> tuple[str, ...]:
+        """Revisions Argo may report for the record's promoted manifests."""
+        commit = self.deploy_commit(record_path)
+        if commit not in self._deploy_revisions:
+            self._deploy_revisions[commit] = deploy_revisions(
+                commit, record_path.parent
+            )
+        return self._deploy_revisions[commit]
 
-    if not candidates:
-        return None
 
-    candidates.sort(key=lambda item: item[0], reverse=True)
-    return candidates[0][1]
+def deploy_revisions(commit: str, repo_dir: Path) -> tuple[str, ...]:
+    """``commit`` plus the later revisions that deploy exactly its manifests.
+
+    The promoter pushes the manifest commit (``deployRepoCommit``) with an
+    evidence-only commit on top, so Argo, tracking the branch, reports the
+    latter. Commits after ``commit`` on HEAD's first-parent chain count until
+    the first one that touches anything outside ``evidence/``. Without usable
+    git history only ``commit`` itself is known.
+    """
+    if not commit:
+        return ()
+    try:
+        proc = subprocess.run(
+            [
+                "git",
+                "log",
+                "--first-parent",
+                "--ancestry-path",
+                "--reverse",
+                "--format=%x00%H",
+                "--name-only",
+                f"{commit}..HEAD",
+            ],
+            cwd=repo_dir,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return (commit,)
+    if proc.returncode != 0:
+        return (commit,)
+    revisions = [commit]
+    for block in proc.stdout.split("\0")[1:]:
+        sha, *paths = [line for line in block.splitlines() if line]
+        if any(not path.startswith(EVIDENCE_ONLY_PREFIX) for path in paths):
+            break
+        revisions.append(sha)
+    return tuple(revisions)
 
 
 def latest_promoted_queue_id(
@@ -196,38 +320,76 @@ def entry_digest(entry: dict[str, Any]) -> str:
     return ""
 
 
-def queue_entry_by_id(
-    queue_payload: dict[str, Any], queue_id: str
-) -> dict[str, Any] | None:
-    for state in QUEUE_STATES:
-        items = queue_payload.get(state, [])
-        if not isinstance(items, list):
-            continue
-        for item in items:
-            if not isinstance(item, dict):
+def read_archive_index(path: Path) -> dict[str, Any]:
+    """Compact id/digest view of release/archive (see compact_queue.py)."""
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"ids": {}, "digests": {}}
+    if not isinstance(raw, dict):
+        return {"ids": {}, "digests": {}}
+    ids = raw.get("ids") if isinstance(raw.get("ids"), dict) else {}
+    digests = raw.get("digests") if isinstance(raw.get("digests"), dict) else {}
+    return {"ids": ids, "digests": digests}
+
+
+class QueueIndex:
+    """Id and released-digest lookups over the queue plus its archive.
+
+    Built once per run; ``add`` keeps it current as entries are enqueued so
+    duplicate checks never rescan the queue.
+    """
+
+    def __init__(
+        self,
+        queue_payload: dict[str, Any],
+        archive_index: dict[str, Any] | None = None,
+    ) -> None:
+        self.by_id: dict[str, dict[str, Any]] = {}
+        self.released: set[tuple[str, str, str]] = set()
+        self.archived_ids: dict[str, Any] = {}
+        for state in QUEUE_STATES:
+            items = queue_payload.get(state, [])
+            if not isinstance(items, list):
                 continue
-            if entry_id(item) == queue_id:
-                return item
-    return None
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                # First match wins, as a state-ordered scan would find it.
+                self.by_id.setdefault(entry_id(item), item)
+                if state in ("pending", "promoted"):
+                    self._index_release(item)
+        if archive_index:
+            self.archived_ids = archive_index["ids"]
+            for key, digests in archive_index["digests"].items():
+                service, _, env = str(key).partition("/")
+                if isinstance(digests, dict):
+                    self.released.update(
+                        (service, env, digest) for digest in digests
+                    )
+
+    def _index_release(self, entry: dict[str, Any]) -> None:
+        self.released.add(
+            (
+                str(entry.get("service", "")).strip(),
+                str(entry.get("env", "")).strip(),
+                entry_digest(entry),
+            )
+        )
 
+    def entry(self, queue_id: str) -> dict[str, Any] | None:
+        return self.by_id.get(queue_id)
 
-def has_release_with_digest(
-    queue_payload: dict[str, Any], service: str, target_env: str, digest: str
-) -> bool:
-    for state in ("pending", "promoted"):
-        items = queue_payload.get(state, [])
-        if not isinstance(items, list):
-            continue
-        for item in items:
-            if not isinstance(item, dict):
-                continue
-            if str(item.get("service", "")).strip() != service:
-                continue
-            if str(item.get("env", "")).strip() != target_env:
-                continue
-            if entry_digest(item) == digest:
-                return True
-    return False
+    def id_taken(self, queue_id: str) -> bool:
+        return queue_id in self.by_id or queue_id in self.archived_ids
+
+    def has_release(self, service: str, target_env: str, digest: str) -> bool:
+        return (service, target_env, digest) in self.released
+
+    def add(self, entry: dict[str, Any]) -> None:
+        """Record a newly enqueued pending entry."""
+        self.by_id.setdefault(entry_id(entry), entry)
+        self._index_release(entry)
 
 
 def safe_token(value: str) -> str:
@@ -279,7 +441,10 @@ def build_prod_pending_entry(
 
 
 def enqueue_prod_from_smoke(
-    queue_payload: dict[str, Any], results: list[TargetResult], target_env: str
+    queue_payload: dict[str, Any],
+    results: list[TargetResult],
+    target_env: str,
+    queue_index: QueueIndex,
 ) -> tuple[int, list[str]]:
     pending = queue_payload.get("pending", [])
     if not isinstance(pending, list):
@@ -296,7 +461,7 @@ def enqueue_prod_from_smoke(
             messages.append(f"[auto-prod] 跳过 {result.service}: 缺少来源 queue_id")
             continue
 
-        source_entry = queue_entry_by_id(queue_payload, result.source_queue_id)
+        source_entry = queue_index.entry(result.source_queue_id)
         if source_entry is None:
             messages.append(
                 f"[auto-prod] 跳过 {result.service}: 未找到来源 queue_id={result.source_queue_id}"
@@ -308,12 +473,7 @@ def enqueue_prod_from_smoke(
             messages.append(f"[auto-prod] 跳过 {result.service}: 来源 digest 为空")
             continue
 
-        if has_release_with_digest(
-            queue_payload=queue_payload,
-            service=result.service,
-            target_env=target_env,
-            digest=digest,
-        ):
+        if queue_index.has_release(result.service, target_env, digest):
             messages.append(
                 f"[auto-prod] 已存在 {result.service}/{target_env} 同 digest 记录，跳过"
             )
@@ -324,11 +484,12 @@ def enqueue_prod_from_smoke(
         )
         base_id = str(entry["id"])
         index = 1
-        while queue_entry_by_id(queue_payload, str(entry["id"])) is not None:
+        while queue_index.id_taken(str(entry["id"])):
             index += 1
             entry["id"] = f"{base_id}-r{index}"
 
         pending.append(entry)
+        queue_index.add(entry)
         enqueued += 1
         messages.append(
             f"[auto-prod] 已入队 {result.service}/{target_env}: {entry['id']}"
@@ -338,7 +499,7 @@ def enqueue_prod_from_smoke(
 
 
 def load_service_map(path: Path) -> dict[str, Any]:
-    raw = yaml.safe_load(path.read_text(encoding="utf-8"))
+    raw = yaml_io.safe_load(path.read_text(encoding="utf-8"))
     if raw is None:
         return {"services": {}}
     if not isinstance(raw, dict):
@@ -414,7 +575,17 @@ def basic_auth_header(username: str, password: str) -> str:
     return f"Basic {token}"
 
 
+def build_http_client(args: argparse.Namespace) -> http_pool.HttpClient:
+    return http_pool.HttpClient(
+        verify=not args.tls_insecure,
+        ca_file=args.ca_file,
+        retries=args.http_retries,
+        max_idle_per_host=max(1, args.concurrency),
+    )
+
+
 def http_request(
+    client: http_pool.HttpClient,
     method: str,
     url: str,
     headers: dict[str, str],
@@ -424,14 +595,10 @@ def http_request(
     data = None
     if payload is not None:
         data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(url, data=data, headers=headers, method=method)
-    try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            body = resp.read(8192).decode("utf-8", errors="ignore")
-            return int(resp.getcode() or 0), body
-    except urllib.error.HTTPError as exc:
-        body = exc.read(8192).decode("utf-8", errors="ignore")
-        return int(exc.code), body
+    resp = client.request(
+        method, url, headers=headers, body=data, timeout=timeout, max_body=8192
+    )
+    return resp.status, resp.text()
 
 
 def build_prod_ready_tag(source_entry: dict[str, Any], prefix: str) -> str:
@@ -457,6 +624,7 @@ def build_prod_ready_tag(source_entry: dict[str, Any], prefix: str) -> str:
 
 
 def harbor_tag_digest(
+    client: http_pool.HttpClient,
     harbor_url: str,
     harbor_user: str,
     harbor_pass: str,
@@ -493,6 +661,7 @@ def harbor_tag_digest(
         headers["Authorization"] = basic_auth_header(harbor_user, harbor_pass)
 
     check_code, check_body = http_request(
+        client,
         method="GET",
         url=artifact_endpoint,
         headers=headers,
@@ -505,6 +674,7 @@ def harbor_tag_digest(
 
     tag_endpoint = f"{artifact_endpoint}/tags"
     create_code, create_body = http_request(
+        client,
         method="POST",
         url=tag_endpoint,
         headers={**headers, "Content-Type": "application/json"},
@@ -520,8 +690,17 @@ def harbor_tag_digest(
     return False, f"创建 tag 失败 http={create_code} body={snippet}"
 
 
+@dataclass(frozen=True)
+class TagJob:
+    result: TargetResult
+    repo_path: str
+    digest: str
+    tag: str
+
+
 def tag_local_harbor_from_smoke(
-    queue_payload: dict[str, Any],
+    client: http_pool.HttpClient,
+    queue_index: QueueIndex,
     results: list[TargetResult],
     service_map: dict[str, Any],
     target_env: str,
@@ -530,12 +709,21 @@ def tag_local_harbor_from_smoke(
     harbor_pass: str,
     tag_prefix: str,
     dry_run: bool,
-) -> tuple[list[TargetResult], int, int, list[str]]:
+    workers: int = 4,
+) -> tuple[list[TargetResult], int, int, list[str], dict[str, int]]:
+    """Tag passing artifacts in Harbor, at most ``workers`` requests at once.
+
+    Resolution runs serially; only the Harbor calls overlap. Messages and the
+    returned results keep smoke target order, and latencies (ms per
+    ``service/env``) cover each artifact check plus tag creation.
+    """
     tagged_results: list[TargetResult] = []
     messages: list[str] = []
+    latencies: dict[str, int] = {}
     tagged_count = 0
     failed_count = 0
 
+    planned: list[TagJob | str] = []
     for result in results:
         if result.outcome != "pass":
             continue
@@ -543,26 +731,22 @@ def tag_local_harbor_from_smoke(
             continue
 
         if not harbor_url.strip():
-            failed_count += 1
-            messages.append("[auto-prod-tag] 缺少 local Harbor 配置，无法执行打标")
+            planned.append("[auto-prod-tag] 缺少 local Harbor 配置，无法执行打标")
             continue
         if not result.source_queue_id:
-            failed_count += 1
-            messages.append(f"[auto-prod-tag] 失败 {result.service}: 缺少来源 queue_id")
+            planned.append(f"[auto-prod-tag] 失败 {result.service}: 缺少来源 queue_id")
             continue
 
-        source_entry = queue_entry_by_id(queue_payload, result.source_queue_id)
+        source_entry = queue_index.entry(result.source_queue_id)
         if source_entry is None:
-            failed_count += 1
-            messages.append(
+            planned.append(
                 f"[auto-prod-tag] 失败 {result.service}: 未找到来源 queue_id={result.source_queue_id}"
             )
             continue
 
         digest = entry_digest(source_entry)
         if not digest:
-            failed_count += 1
-            messages.append(f"[auto-prod-tag] 失败 {result.service}: 来源 digest 为空")
+            planned.append(f"[auto-prod-tag] 失败 {result.service}: 来源 digest 为空")
             continue
 
         target = resolve_service_target(service_map, result.service, result.source_env)
@@ -572,16 +756,46 @@ def tag_local_harbor_from_smoke(
             # Fallback to default naming convention used by new onboarded services.
             repo_path = f"ljwx/{safe_token(result.service)}"
 
-        tag_name = build_prod_ready_tag(source_entry, prefix=tag_prefix)
+        planned.append(
+            TagJob(
+                result=result,
+                repo_path=repo_path,
+                digest=digest,
+                tag=build_prod_ready_tag(source_entry, prefix=tag_prefix),
+            )
+        )
+
+    def run_job(job: TagJob) -> tuple[bool, str, int]:
+        started = time.monotonic()
+        # A 409 (tag already present) counts as success, so a job racing
+        # another for the same artifact/tag stays idempotent.
         ok, detail = harbor_tag_digest(
+            client,
             harbor_url=harbor_url,
             harbor_user=harbor_user,
             harbor_pass=harbor_pass,
-            repo_path=repo_path,
-            digest=digest,
-            target_tag=tag_name,
+            repo_path=job.repo_path,
+            digest=job.digest,
+            target_tag=job.tag,
             dry_run=dry_run,
         )
+        return ok, detail, round((time.monotonic() - started) * 1000)
+
+    jobs = [item for item in planned if isinstance(item, TagJob)]
+    max_workers = max(1, min(workers, len(jobs)))
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="harbor-tag"
+    ) as pool:
+        outcomes = iter(list(pool.map(run_job, jobs)))
+
+    for item in planned:
+        if isinstance(item, str):
+            failed_count += 1
+            messages.append(item)
+            continue
+        ok, detail, elapsed_ms = next(outcomes)
+        result = item.result
+        latencies[f"{result.service}/{result.source_env}"] = elapsed_ms
         if ok:
             tagged_results.append(result)
             tagged_count += 1
@@ -594,83 +808,597 @@ def tag_local_harbor_from_smoke(
                 f"[auto-prod-tag] 失败 {result.service}/{result.source_env}: {detail}"
             )
 
-    return tagged_results, tagged_count, failed_count, messages
+    return tagged_results, tagged_count, failed_count, messages, latencies
 
 
 def http_get(
-    url: str, headers: dict[str, str] | None = None, timeout: float = 5.0
+    client: http_pool.HttpClient,
+    url: str,
+    headers: dict[str, str] | None = None,
+    timeout: float = 5.0,
+    max_bytes: int | None = 4096,
 ) -> tuple[int, str]:
-    req = urllib.request.Request(url, headers=headers or {}, method="GET")
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        body = resp.read(4096).decode("utf-8", errors="ignore")
-        return int(resp.getcode() or 0), body
+    resp = client.request(
+        "GET", url, headers=headers, timeout=timeout, max_body=max_bytes
+    )
+    return resp.status, resp.text()
 
 
-def wait_for_argocd_health(
-    server: str,
-    token: str,
-    app: str,
-    timeout_seconds: int,
-    interval_seconds: int,
-) -> tuple[bool, str]:
-    if not server or not token or not app:
-        return True, "argocd check skipped"
+ARGOCD_LIST_FIELDS = ",".join(
+    [
+        "items.metadata.name",
+        "items.status.sync.status",
+        "items.status.sync.revision",
+        "items.status.health.status",
+        "items.status.operationState.phase",
+        "items.status.operationState.message",
+        "items.status.operationState.syncResult.revision",
+        "items.status.operationState.operation.sync.revision",
+    ]
+)
+ARGOCD_FAILED_OPERATION_PHASES = {"Failed", "Error"}
 
-    end = time.time() + timeout_seconds
-    app_encoded = urllib.parse.quote(app, safe="")
-    url = f"{server.rstrip('/')}/api/v1/applications/{app_encoded}"
-    headers = {"Authorization": f"Bearer {token}"}
 
-    last = ""
-    while time.time() < end:
+@dataclass(frozen=True)
+class PollSchedule:
+    """Delay before poll ``attempt`` (0-based): exponential, capped, jittered."""
+
+    initial_seconds: float
+    max_seconds: float
+    factor: float = 2.0
+    jitter: float = 0.0
+
+    def delay(self, attempt: int) -> float:
+        base = min(
+            self.max_seconds,
+            self.initial_seconds * (self.factor ** min(max(attempt, 0), 32)),
+        )
+        if self.jitter > 0:
+            base *= random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+        return max(0.0, base)
+
+
+def poll_schedule(args: argparse.Namespace) -> PollSchedule:
+    if args.poll_strategy == "fixed":
+        return PollSchedule(
+            initial_seconds=args.interval_seconds,
+            max_seconds=args.interval_seconds,
+            factor=1.0,
+        )
+    return PollSchedule(
+        initial_seconds=min(args.poll_initial_seconds, args.interval_seconds),
+        max_seconds=args.interval_seconds,
+        factor=max(1.0, args.poll_backoff),
+        jitter=min(max(args.poll_jitter, 0.0), 1.0),
+    )
+
+
+def argocd_operation_revision(operation: dict[str, Any]) -> str:
+    result = operation.get("syncResult") or {}
+    revision = result.get("revision") if isinstance(result, dict) else None
+    if not revision:
+        requested = (operation.get("operation") or {}).get("sync") or {}
+        revision = requested.get("revision") if isinstance(requested, dict) else None
+    return str(revision or "")
+
+
+def argocd_terminal_failure(
+    status: dict[str, Any], expected_revisions: Collection[str]
+) -> str:
+    """Describe an Argo state that will not turn healthy on its own, else ''.
+
+    Only states of ``expected_revisions`` (the promoted deploy repo commit and
+    the evidence-only commits on top of it) count: Degraded health once the
+    app is Synced to one of them, and a failed operation for one. Until Argo
+    has picked up the promotion, a Degraded app or a failed sync belongs to an
+    earlier revision and may be fixed by this one, so those keep polling until
+    the timeout, as does everything when no revision is known.
+    """
+    expected = {rev.strip().lower() for rev in expected_revisions if rev.strip()}
+    if not expected:
+        return ""
+    sync_status = status.get("sync") or {}
+    sync = sync_status.get("status")
+    synced_revision = str(sync_status.get("revision") or "").lower()
+    health = status.get("health", {}).get("status")
+    if health == "Degraded" and sync == "Synced" and synced_revision in expected:
+        return f"sync=Synced,health=Degraded,revision={synced_revision}"
+    operation = status.get("operationState") or {}
+    if not isinstance(operation, dict):
+        return ""
+    phase = operation.get("phase")
+    if phase not in ARGOCD_FAILED_OPERATION_PHASES:
+        return ""
+    if argocd_operation_revision(operation).lower() not in expected:
+        return ""
+    message = str(operation.get("message", "")).strip()
+    return f"sync={sync},operation={phase}: {message}".rstrip(": ")
+
+
+class ArgoAppStatusPoller:
+    """Shares one Argo CD application list call per interval across targets.
+
+    Every waiting target asks for a snapshot newer than the one it last saw;
+    the first caller due for a refresh performs the list request while the
+    others block on the condition and are all woken by the same result. The
+    gap between list calls follows ``schedule`` and restarts from its fast
+    end whenever a new target starts waiting.
+    """
+
+    def __init__(
+        self,
+        server: str,
+        token: str,
+        schedule: PollSchedule,
+        client: http_pool.HttpClient,
+        selector: str = "",
+    ) -> None:
+        query = {"fields": ARGOCD_LIST_FIELDS}
+        if selector:
+            query["selector"] = selector
+        self.url = (
+            f"{server.rstrip('/')}/api/v1/applications?"
+            f"{urllib.parse.urlencode(query)}"
+        )
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.schedule = schedule
+        self.client = client
+        self.requests = 0
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._apps: dict[str, dict[str, Any]] = {}
+        self._error = ""
+        self._fetching = False
+        self._next_fetch_at = 0.0
+        self._attempt = 0
+
+    def _fetch(self) -> tuple[dict[str, dict[str, Any]], str]:
+        self.requests += 1
         try:
-            code, body = http_get(url, headers=headers, timeout=8.0)
-            if code < 300:
-                data = json.loads(body)
-                status = data.get("status", {})
-                sync = status.get("sync", {}).get("status")
-                health = status.get("health", {}).get("status")
-                last = f"sync={sync},health={health}"
-                if sync == "Synced" and health == "Healthy":
-                    return True, last
+            code, body = http_get(
+                self.client,
+                self.url,
+                headers=self.headers,
+                timeout=8.0,
+                max_bytes=None,
+            )
+            if code >= 300:
+                return {}, f"argocd list http={code}"
+            items = json.loads(body).get("items") or []
         except Exception as exc:  # noqa: BLE001
-            last = str(exc)
+            return {}, str(exc)
+
+        apps: dict[str, dict[str, Any]] = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            name = str(item.get("metadata", {}).get("name", "")).strip()
+            status = item.get("status")
+            if name:
+                apps[name] = status if isinstance(status, dict) else {}
+        return apps, ""
+
+    def snapshot(
+        self, after: int, timeout: float
+    ) -> tuple[int, dict[str, dict[str, Any]], str]:
+        """Return (generation, apps, error) newer than ``after``.
+
+        Falls back to the latest snapshot when ``timeout`` expires first.
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._cond:
+            if after == 0:
+                self._attempt = 0
+                self._next_fetch_at = min(
+                    self._next_fetch_at, time.monotonic() + self.schedule.delay(0)
+                )
+            while self._generation <= after:
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                if not self._fetching and now >= self._next_fetch_at:
+                    self._fetching = True
+                    self._cond.release()
+                    try:
+                        apps, error = self._fetch()
+                    finally:
+                        self._cond.acquire()
+                    self._apps, self._error = apps, error
+                    self._generation += 1
+                    self._next_fetch_at = time.monotonic() + self.schedule.delay(
+                        self._attempt
+                    )
+                    self._attempt += 1
+                    self._fetching = False
+                    self._cond.notify_all()
+                    break
+                wake_at = deadline if self._fetching else self._next_fetch_at
+                self._cond.wait(timeout=max(0.0, min(wake_at, deadline) - now))
+            return self._generation, self._apps, self._error
 
-        time.sleep(interval_seconds)
 
-    return False, f"argocd wait timeout: {last}"
+@dataclass(frozen=True)
+class WaitResult:
+    """Outcome of one wait phase; ``elapsed_ms`` runs until success or give-up."""
+
+    ok: bool
+    details: str
+    attempts: int = 0
+    elapsed_ms: int = 0
+
+    def event_fields(self) -> dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "latencyMs": self.elapsed_ms,
+            "attempts": self.attempts,
+            "details": self.details,
+        }
+
+
+def elapsed_ms(started: float) -> int:
+    return round((time.monotonic() - started) * 1000)
+
+
+class SmokeEventLog:
+    """Streams one JSON object per smoke phase event to ``--results-jsonl``.
+
+    Each line is flushed as soon as it is written so CI can tail the file
+    during the run; worker threads share one lock. Without a path every
+    ``emit`` is a no-op.
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        self._lock = threading.Lock()
+        self._fh: TextIO | None = None
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = path.open("w", encoding="utf-8")
+
+    def __enter__(self) -> "SmokeEventLog":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        if self._fh is None:
+            return
+        line = json.dumps(
+            {"ts": now_utc(), "event": event, **fields}, ensure_ascii=False
+        )
+        with self._lock:
+            self._fh.write(line + "\n")
+            self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+def wait_for_argocd_health(
+    poller: ArgoAppStatusPoller | None,
+    app: str,
+    timeout_seconds: int,
+    early_fail: bool = True,
+    expected_revisions: Collection[str] = (),
+) -> WaitResult:
+    if poller is None or not app:
+        return WaitResult(True, "argocd check skipped")
+
+    started = time.monotonic()
+    end = started + timeout_seconds
+    generation = 0
+    attempts = 0
+    last = ""
+    while True:
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            break
+        generation, apps, error = poller.snapshot(generation, remaining)
+        attempts += 1
+        if error:
+            last = error
+        elif app not in apps:
+            last = f"app {app} not found"
+        else:
+            status = apps[app]
+            sync = status.get("sync", {}).get("status")
+            health = status.get("health", {}).get("status")
+            last = f"sync={sync},health={health}"
+            if sync == "Synced" and health == "Healthy":
+                return WaitResult(True, last, attempts, elapsed_ms(started))
+            failure = (
+                argocd_terminal_failure(status, expected_revisions)
+                if early_fail
+                else ""
+            )
+            if failure:
+                return WaitResult(
+                    False,
+                    f"argocd terminal state: {failure}",
+                    attempts,
+                    elapsed_ms(started),
+                )
+
+    return WaitResult(
+        False, f"argocd wait timeout: {last}", attempts, elapsed_ms(started)
+    )
 
 
 def wait_for_endpoint(
-    endpoint: str, timeout_seconds: int, interval_seconds: int
-) -> tuple[bool, str]:
-    end = time.time() + timeout_seconds
+    client: http_pool.HttpClient,
+    endpoint: str,
+    timeout_seconds: int,
+    schedule: PollSchedule,
+) -> WaitResult:
+    started = time.monotonic()
+    end = started + timeout_seconds
     last = ""
+    attempt = 0
 
-    while time.time() < end:
+    while time.monotonic() < end:
         try:
-            code, body = http_get(endpoint, timeout=8.0)
+            code, body = http_get(client, endpoint, timeout=8.0)
             if 200 <= code < 400:
                 snippet = body[:120].replace("\n", " ")
-                return True, f"endpoint={code} body='{snippet}'"
+                return WaitResult(
+                    True,
+                    f"endpoint={code} body='{snippet}'",
+                    attempt + 1,
+                    elapsed_ms(started),
+                )
             last = f"http={code}"
-        except urllib.error.HTTPError as exc:
-            last = f"http={exc.code}"
         except Exception as exc:  # noqa: BLE001
             last = str(exc)
 
-        time.sleep(interval_seconds)
+        time.sleep(max(0.0, min(schedule.delay(attempt), end - time.monotonic())))
+        attempt += 1
+
+    return WaitResult(
+        False, f"endpoint wait timeout: {last}", attempt, elapsed_ms(started)
+    )
+
+
+LATENCY_BUDGET_KEYS = ("p50", "p95")
+SMOKE_METRIC_KEYS = ("timeToHealthyMs", "attempts", "latency")
+
+
+def parse_latency_budget(raw: Any) -> dict[str, float] | None:
+    """``{"p50": ms, "p95": ms}`` from a target; None when malformed."""
+    if raw is None:
+        return {}
+    if not isinstance(raw, dict) or not set(raw) <= set(LATENCY_BUDGET_KEYS):
+        return None
+    budget: dict[str, float] = {}
+    for key, value in raw.items():
+        if (
+            isinstance(value, bool)
+            or not isinstance(value, (int, float))
+            or value <= 0
+        ):
+            return None
+        budget[key] = value
+    return budget
+
+
+def sample_endpoint_latency(
+    client: http_pool.HttpClient, endpoint: str, samples: int
+) -> dict[str, Any]:
+    """Time ``samples`` sequential GETs against an already healthy endpoint.
+
+    Runs over the warm keep-alive connection left by the readiness wait, so
+    the numbers reflect request latency rather than connection setup. Each
+    sample reads the whole body: a capped read would time a partial response
+    and drop the connection instead of returning it to the pool.
+    """
+    latencies: list[float] = []
+    errors = 0
+    for _ in range(samples):
+        started = time.perf_counter()
+        try:
+            code, _body = http_get(client, endpoint, timeout=8.0, max_bytes=None)
+        except Exception:  # noqa: BLE001
+            errors += 1
+            continue
+        if not 200 <= code < 400:
+            errors += 1
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    summary: dict[str, Any] = {"samples": samples, "errors": errors}
+    if latencies:
+        summary["p50Ms"] = round(loadgen.percentile(latencies, 50), 1)
+        summary["p95Ms"] = round(loadgen.percentile(latencies, 95), 1)
+    return summary
+
 
-    return False, f"endpoint wait timeout: {last}"
+def latency_budget_violations(
+    latency: dict[str, Any], budget: dict[str, float]
+) -> list[str]:
+    violations: list[str] = []
+    for key in LATENCY_BUDGET_KEYS:
+        if key not in budget:
+            continue
+        measured = latency.get(f"{key}Ms")
+        if measured is None:
+            violations.append(f"{key}=n/a (no successful sample)")
+        elif measured > budget[key]:
+            violations.append(f"{key}={measured:g}ms>{budget[key]:g}ms")
+    return violations
+
+
+LOAD_THRESHOLD_KEYS = ("min_rps", "max_error_rate", "max_p95_ms")
+LOAD_CONFIG_KEYS = ("enabled", "concurrency", "duration_seconds", *LOAD_THRESHOLD_KEYS)
 
 
-def update_smoke_record(path: Path, ok: bool, details: str, dry_run: bool) -> None:
+def parse_load_config(raw: Any) -> dict[str, Any] | None:
+    """Per-target ``load`` block, None when malformed.
+
+    Load testing is opt-in: a target without ``load`` (or with ``false``) is
+    never driven; ``true`` uses the CLI defaults and a mapping overrides them.
+    """
+    if raw is None or raw is False:
+        return {"enabled": False}
+    if raw is True:
+        return {"enabled": True}
+    if not isinstance(raw, dict) or not set(raw) <= set(LOAD_CONFIG_KEYS):
+        return None
+    for key, value in raw.items():
+        if key == "enabled":
+            if not isinstance(value, bool):
+                return None
+        elif (
+            isinstance(value, bool)
+            or not isinstance(value, (int, float))
+            or value < 0
+        ):
+            return None
+    return {"enabled": True, **raw}
+
+
+def load_settings(plan: TargetPlan, args: argparse.Namespace) -> dict[str, Any]:
+    """CLI defaults overridden by the target's ``load`` block."""
+    settings: dict[str, Any] = {
+        "concurrency": args.load_concurrency,
+        "duration_seconds": args.load_duration_seconds,
+        "min_rps": args.load_min_rps,
+        "max_error_rate": args.load_max_error_rate,
+        "max_p95_ms": args.load_max_p95_ms,
+    }
+    settings.update(
+        (key, value) for key, value in plan.load.items() if key != "enabled"
+    )
+    return settings
+
+
+def load_threshold_violations(
+    stats: dict[str, Any], settings: dict[str, Any]
+) -> list[str]:
+    violations: list[str] = []
+    if settings["min_rps"] and stats["rps"] < settings["min_rps"]:
+        violations.append(f"rps={stats['rps']:g}<{settings['min_rps']:g}")
+    if stats["errorRate"] > settings["max_error_rate"]:
+        violations.append(
+            f"errorRate={stats['errorRate']:g}>{settings['max_error_rate']:g}"
+        )
+    if settings["max_p95_ms"]:
+        p95 = stats.get("p95Ms")
+        if p95 is None:
+            violations.append("p95=n/a (no response)")
+        elif p95 > settings["max_p95_ms"]:
+            violations.append(f"p95={p95:g}ms>{settings['max_p95_ms']:g}ms")
+    return violations
+
+
+def update_load_record(
+    path: Path,
+    ok: bool,
+    details: str,
+    stats: dict[str, Any],
+    thresholds: dict[str, Any],
+    dry_run: bool,
+) -> None:
+    record = read_yaml(path)
+    tests = record.setdefault("tests", {})
+    tests["load"] = {
+        "status": "pass" if ok else "fail",
+        "checkedAt": now_utc(),
+        "details": details,
+        **stats,
+        "thresholds": thresholds,
+    }
+    if not dry_run:
+        write_yaml(path, record)
+
+
+def run_load_stage(
+    results: list[TargetResult],
+    args: argparse.Namespace,
+    events: SmokeEventLog,
+) -> tuple[list[TargetResult], int, list[str]]:
+    """Load-test passing auto-promotion candidates one target at a time.
+
+    Only targets that opt in with a ``load`` block are driven, sequentially so
+    they do not skew each other's numbers; ``--dry-run`` sends no load.
+    Returns the results that may still be tagged/enqueued, the number of load
+    failures and the log lines.
+    """
+    kept: list[TargetResult] = []
+    messages: list[str] = []
+    failed = 0
+    for result in results:
+        plan = result.plan
+        if (
+            result.outcome != "pass"
+            or result.source_env == args.prod_env
+            or plan is None
+            or not plan.load.get("enabled", False)
+        ):
+            kept.append(result)
+            continue
+        if args.dry_run:
+            kept.append(result)
+            messages.append(
+                f"[load] DRY_RUN 跳过压测 {plan.service}/{plan.environment}: {plan.endpoint}"
+            )
+            continue
+
+        settings = load_settings(plan, args)
+        stats = loadgen.run_load(
+            plan.endpoint,
+            concurrency=int(settings["concurrency"]),
+            duration_seconds=float(settings["duration_seconds"]),
+            verify=not args.tls_insecure,
+            ca_file=args.ca_file,
+        )
+        violations = load_threshold_violations(stats, settings)
+        ok = not violations
+        summary = (
+            f"rps={stats['rps']:g} errorRate={stats['errorRate']:g} "
+            f"p95={stats.get('p95Ms', 'n/a')}ms"
+        )
+        details = summary if ok else f"{summary}; 未达标: {', '.join(violations)}"
+        thresholds = {key: settings[key] for key in LOAD_THRESHOLD_KEYS}
+        update_load_record(
+            plan.record_path, ok, details, stats, thresholds, args.dry_run
+        )
+        events.emit(
+            "load_test_end",
+            service=plan.service,
+            environment=plan.environment,
+            endpoint=plan.endpoint,
+            ok=ok,
+            **stats,
+            thresholds=thresholds,
+        )
+        if ok:
+            kept.append(result)
+            messages.append(f"[load] 通过 {plan.service}/{plan.environment}: {details}")
+        else:
+            failed += 1
+            messages.append(f"[load] 失败 {plan.service}/{plan.environment}: {details}")
+    return kept, failed, messages
+
+
+def update_smoke_record(
+    path: Path,
+    ok: bool,
+    details: str,
+    dry_run: bool,
+    metrics: dict[str, Any] | None = None,
+) -> None:
     record = read_yaml(path)
     tests = record.setdefault("tests", {})
     smoke = tests.setdefault("smoke", {})
     smoke["status"] = "pass" if ok else "fail"
     smoke["checkedAt"] = now_utc()
     smoke["details"] = details
+    # Drop numbers from an earlier run that this run did not get to measure.
+    for key in SMOKE_METRIC_KEYS:
+        smoke.pop(key, None)
+    smoke.update(metrics or {})
 
     deploy = record.setdefault("deploy", {})
     if isinstance(deploy, dict):
@@ -680,16 +1408,34 @@ def update_smoke_record(path: Path, ok: bool, details: str, dry_run: bool) -> No
         write_yaml(path, record)
 
 
-def run_target(
-    target: dict[str, Any], args: argparse.Namespace, queue_payload: dict[str, Any]
-) -> TargetResult:
+@dataclass(frozen=True)
+class TargetPlan:
+    service: str
+    environment: str
+    app: str
+    endpoint: str
+    queue_id: str
+    record_path: Path
+    latency_budget_ms: dict[str, float]
+    load: dict[str, Any]
+    deploy_revisions: tuple[str, ...] = ()
+
+
+def plan_target(
+    target: dict[str, Any],
+    args: argparse.Namespace,
+    queue_payload: dict[str, Any],
+    records: EvidenceRecordIndex,
+) -> TargetPlan | TargetResult:
     service = str(target.get("service", "")).strip()
     environment = str(target.get("environment", "dev")).strip()
     queue_id = str(target.get("queue_id", "")).strip()
     app = str(target.get("argocd_app", "")).strip()
     endpoint = str(target.get("endpoint", "")).strip()
+    latency_budget = parse_latency_budget(target.get("latency_budget_ms"))
+    load = parse_load_config(target.get("load"))
 
-    if not service or not endpoint:
+    if not service or not endpoint or latency_budget is None or load is None:
         return TargetResult(
             outcome="fail",
             message=f"invalid target: {target}",
@@ -703,16 +1449,14 @@ def run_target(
         service=service,
         env=environment,
     )
-    record_path = find_record_path(
-        evidence_dir=args.evidence_dir,
+    record_path = records.find(
         service=service,
         environment=environment,
         queue_id=resolved_queue_id or None,
         prefer_pending=True,
     )
     if not record_path:
-        record_path = find_record_path(
-            evidence_dir=args.evidence_dir,
+        record_path = records.find(
             service=service,
             environment=environment,
             queue_id=resolved_queue_id or None,
@@ -727,46 +1471,152 @@ def run_target(
             source_queue_id=resolved_queue_id,
         )
 
-    ok_argocd, argocd_details = wait_for_argocd_health(
-        server=args.argocd_server,
-        token=args.argocd_token,
+    return TargetPlan(
+        service=service,
+        environment=environment,
         app=app,
+        endpoint=endpoint,
+        queue_id=resolved_queue_id,
+        record_path=record_path,
+        latency_budget_ms=latency_budget,
+        load=load,
+        deploy_revisions=records.deploy_revisions(record_path),
+    )
+
+
+def check_target(
+    plan: TargetPlan,
+    args: argparse.Namespace,
+    argocd: ArgoAppStatusPoller | None,
+    client: http_pool.HttpClient,
+    events: SmokeEventLog,
+) -> tuple[bool, str, dict[str, Any]]:
+    """Network-only part of a smoke run; safe to call from worker threads.
+
+    Returns (ok, details, metrics) where metrics are the ``tests.smoke``
+    measurement fields for the evidence record.
+    """
+    target = {"service": plan.service, "environment": plan.environment}
+    argocd_enabled = argocd is not None and bool(plan.app)
+    if argocd_enabled:
+        events.emit("argocd_wait_start", **target, app=plan.app)
+    argocd_wait = wait_for_argocd_health(
+        poller=argocd,
+        app=plan.app,
         timeout_seconds=args.timeout_seconds,
-        interval_seconds=args.interval_seconds,
+        early_fail=not args.no_argocd_early_fail,
+        expected_revisions=plan.deploy_revisions,
     )
-    if not ok_argocd:
-        update_smoke_record(record_path, False, argocd_details, args.dry_run)
-        return TargetResult(
-            outcome="fail",
-            message=f"{service}: {argocd_details}",
-            service=service,
-            source_env=environment,
-            source_queue_id=resolved_queue_id,
+    if argocd_enabled:
+        events.emit(
+            "argocd_wait_end", **target, app=plan.app, **argocd_wait.event_fields()
         )
+    if not argocd_wait.ok:
+        return False, argocd_wait.details, {"attempts": argocd_wait.attempts}
 
-    ok_endpoint, endpoint_details = wait_for_endpoint(
-        endpoint=endpoint,
+    events.emit("endpoint_wait_start", **target, endpoint=plan.endpoint)
+    endpoint_wait = wait_for_endpoint(
+        client,
+        endpoint=plan.endpoint,
         timeout_seconds=args.timeout_seconds,
-        interval_seconds=args.interval_seconds,
+        schedule=poll_schedule(args),
     )
-
-    details = f"{argocd_details}; {endpoint_details}"
-    update_smoke_record(record_path, ok_endpoint, details, args.dry_run)
-    if ok_endpoint:
-        return TargetResult(
-            outcome="pass",
-            message=f"{service}: {details}",
-            service=service,
-            source_env=environment,
-            source_queue_id=resolved_queue_id,
+    events.emit(
+        "endpoint_wait_end",
+        **target,
+        endpoint=plan.endpoint,
+        **endpoint_wait.event_fields(),
+    )
+    details = f"{argocd_wait.details}; {endpoint_wait.details}"
+    metrics: dict[str, Any] = {
+        "attempts": argocd_wait.attempts + endpoint_wait.attempts
+    }
+    if not endpoint_wait.ok:
+        return False, details, metrics
+    metrics["timeToHealthyMs"] = argocd_wait.elapsed_ms + endpoint_wait.elapsed_ms
+    if args.latency_samples <= 0:
+        return True, details, metrics
+
+    latency = sample_endpoint_latency(client, plan.endpoint, args.latency_samples)
+    violations = latency_budget_violations(latency, plan.latency_budget_ms)
+    if plan.latency_budget_ms:
+        latency["budgetMs"] = dict(plan.latency_budget_ms)
+        latency["withinBudget"] = not violations
+    metrics["latency"] = latency
+    events.emit("latency_sample", **target, endpoint=plan.endpoint, **latency)
+    if violations:
+        return (
+            False,
+            f"{details}; latency budget exceeded: {', '.join(violations)}",
+            metrics,
         )
+    return True, details, metrics
+
+
+def finish_target(
+    plan: TargetPlan,
+    ok: bool,
+    details: str,
+    metrics: dict[str, Any],
+    args: argparse.Namespace,
+) -> TargetResult:
+    update_smoke_record(plan.record_path, ok, details, args.dry_run, metrics)
     return TargetResult(
-        outcome="fail",
-        message=f"{service}: {details}",
-        service=service,
-        source_env=environment,
-        source_queue_id=resolved_queue_id,
+        outcome="pass" if ok else "fail",
+        message=f"{plan.service}: {details}",
+        service=plan.service,
+        source_env=plan.environment,
+        source_queue_id=plan.queue_id,
+        plan=plan,
+    )
+
+
+def run_targets(
+    targets: list[dict[str, Any]],
+    args: argparse.Namespace,
+    queue_payload: dict[str, Any],
+    client: http_pool.HttpClient,
+    events: SmokeEventLog,
+) -> Iterator[TargetResult]:
+    """Yield one result per target, in target order.
+
+    Record lookup runs up front and record writes happen on the caller's
+    thread in target order, so evidence files are only ever touched serially;
+    just the Argo/endpoint waits overlap, at most ``args.concurrency`` at once.
+    """
+    records = EvidenceRecordIndex.load(
+        args.evidence_dir, None if args.no_evidence_index else args.evidence_index
+    )
+    planned = [
+        plan_target(target, args, queue_payload, records) for target in targets
+    ]
+    argocd = (
+        ArgoAppStatusPoller(
+            server=args.argocd_server,
+            token=args.argocd_token,
+            schedule=poll_schedule(args),
+            client=client,
+            selector=args.argocd_selector,
+        )
+        if args.argocd_server and args.argocd_token
+        else None
     )
+    workers = max(
+        1, min(args.concurrency, sum(isinstance(p, TargetPlan) for p in planned))
+    )
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        checks = [
+            pool.submit(check_target, item, args, argocd, client, events)
+            if isinstance(item, TargetPlan)
+            else None
+            for item in planned
+        ]
+        for item, check in zip(planned, checks):
+            if check is None:
+                yield item
+                continue
+            ok, details, metrics = check.result()
+            yield finish_target(item, ok, details, metrics, args)
 
 
 def parse_args() -> argparse.Namespace:
@@ -777,11 +1627,118 @@ def parse_args() -> argparse.Namespace:
         "--targets", type=Path, default=Path("scripts/smoke/targets.json")
     )
     parser.add_argument("--queue", type=Path, default=Path("release/queue.yaml"))
+    parser.add_argument(
+        "--archive-index",
+        type=Path,
+        default=Path("release/archive/index.json"),
+        help="归档队列的 id/digest 索引（自动入队去重时使用）",
+    )
     parser.add_argument("--evidence-dir", type=Path, default=Path("evidence/records"))
+    parser.add_argument(
+        "--evidence-index",
+        type=Path,
+        default=Path("evidence/index.json"),
+        help="新鲜（manifest 校验通过）时复用的 evidence 索引，避免重复解析记录",
+    )
+    parser.add_argument(
+        "--no-evidence-index",
+        action="store_true",
+        help="忽略 evidence/index.json，直接解析全部记录",
+    )
     parser.add_argument("--argocd-server", default=os.getenv("ARGOCD_SERVER", ""))
     parser.add_argument("--argocd-token", default=os.getenv("ARGOCD_TOKEN", ""))
+    parser.add_argument(
+        "--argocd-selector",
+        default=os.getenv("ARGOCD_APP_SELECTOR", ""),
+        help="批量查询 Argo 应用状态时使用的 label selector（可选）",
+    )
     parser.add_argument("--timeout-seconds", type=int, default=180)
-    parser.add_argument("--interval-seconds", type=int, default=10)
+    parser.add_argument(
+        "--interval-seconds",
+        type=float,
+        default=10,
+        help="轮询间隔上限（fixed 策略下即固定间隔）",
+    )
+    parser.add_argument(
+        "--poll-strategy",
+        choices=("backoff", "fixed"),
+        default=os.getenv("SMOKE_POLL_STRATEGY", "backoff"),
+        help="backoff: 从 --poll-initial-seconds 指数退避到 --interval-seconds；fixed: 固定间隔",
+    )
+    parser.add_argument("--poll-initial-seconds", type=float, default=1.0)
+    parser.add_argument("--poll-backoff", type=float, default=2.0)
+    parser.add_argument(
+        "--poll-jitter",
+        type=float,
+        default=0.2,
+        help="每次等待时间的随机抖动比例（0-1）",
+    )
+    parser.add_argument(
+        "--no-argocd-early-fail",
+        action="store_true",
+        help="Argo 已同步到本次发布提交但 Degraded，或该提交同步操作失败时也继续等待直到超时",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("SMOKE_CONCURRENCY", "4")),
+        help="同时执行的 smoke 目标数上限（1 表示串行）",
+    )
+    parser.add_argument(
+        "--tls-insecure",
+        action="store_true",
+        default=os.getenv("SMOKE_TLS_INSECURE", "").lower() in {"1", "true", "yes"},
+        help="跳过 Argo CD / Harbor / endpoint 的 TLS 证书校验",
+    )
+    parser.add_argument(
+        "--ca-file",
+        default=os.getenv("SMOKE_CA_FILE", ""),
+        help="额外信任的 CA 证书文件（PEM）",
+    )
+    parser.add_argument(
+        "--http-retries",
+        type=int,
+        default=1,
+        help="幂等请求（GET 等）遇到连接错误时的重试次数",
+    )
+    parser.add_argument(
+        "--latency-samples",
+        type=int,
+        default=int(os.getenv("SMOKE_LATENCY_SAMPLES", "5")),
+        help="endpoint 就绪后连续请求的次数，用于计算 p50/p95 延迟（0 表示不采样、不校验延迟预算）",
+    )
+    parser.add_argument(
+        "--load-test",
+        action="store_true",
+        default=os.getenv("SMOKE_LOAD_TEST", "").lower() in {"1", "true", "yes"},
+        help="smoke 通过后、打标/自动入队前对候选目标执行短时压测，未达标则阻止入队",
+    )
+    parser.add_argument("--load-concurrency", type=int, default=4)
+    parser.add_argument("--load-duration-seconds", type=float, default=10.0)
+    parser.add_argument(
+        "--load-min-rps",
+        type=float,
+        default=0.0,
+        help="默认最低 RPS（0 表示不检查；目标可用 load.min_rps 覆盖）",
+    )
+    parser.add_argument(
+        "--load-max-error-rate",
+        type=float,
+        default=0.01,
+        help="默认最大错误率（目标可用 load.max_error_rate 覆盖）",
+    )
+    parser.add_argument(
+        "--load-max-p95-ms",
+        type=float,
+        default=0.0,
+        help="默认 p95 上限毫秒（0 表示不检查；目标可用 load.max_p95_ms 覆盖）",
+    )
+    parser.add_argument(
+        "--results-jsonl",
+        type=Path,
+        default=None,
+        help="逐行写入每个目标各阶段的 JSON 事件（argocd/endpoint 等待开始/结束、耗时、轮询次数）",
+    )
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument(
         "--auto-enqueue-prod",
@@ -839,15 +1796,35 @@ def main() -> int:
     config = read_json(args.targets)
     targets = list(config.get("targets", []))
     queue_payload = ensure_queue_shape(read_queue(args.queue))
+    with build_http_client(args) as client, SmokeEventLog(
+        args.results_jsonl
+    ) as events:
+        return run(args, targets, queue_payload, client, events)
+
 
+def run(
+    args: argparse.Namespace,
+    targets: list[dict[str, Any]],
+    queue_payload: dict[str, Any],
+    client: http_pool.HttpClient,
+    events: SmokeEventLog,
+) -> int:
     passed = 0
     failed = 0
     skipped = 0
     results: list[TargetResult] = []
-    for target in targets:
-        result = run_target(target, args, queue_payload)
+    events.emit("run_start", targets=len(targets), concurrency=args.concurrency)
+    for result in run_targets(targets, args, queue_payload, client, events):
         results.append(result)
         print(result.message)
+        events.emit(
+            "target_end",
+            service=result.service,
+            environment=result.source_env,
+            queueId=result.source_queue_id,
+            outcome=result.outcome,
+            message=result.message,
+        )
         if result.outcome == "pass":
             passed += 1
         elif result.outcome == "fail":
@@ -856,15 +1833,29 @@ def main() -> int:
             skipped += 1
 
     enqueue_candidates = results
+    load_failed = 0
+    if args.load_test:
+        enqueue_candidates, load_failed, load_messages = run_load_stage(
+            results, args, events
+        )
+        for line in load_messages:
+            print(line)
+        failed += load_failed
+
+    queue_index = QueueIndex(
+        queue_payload,
+        read_archive_index(args.archive_index) if args.auto_enqueue_prod else None,
+    )
     auto_tagged_local = 0
     auto_tag_failed = 0
+    auto_tag_latency_ms: dict[str, int] = {}
     if args.auto_tag_local_harbor:
         try:
             service_map = load_service_map(args.service_map)
-        except (OSError, ValueError, yaml.YAMLError) as exc:
+        except (OSError, ValueError, yaml_io.YAMLError) as exc:
             auto_tag_failed = sum(
                 1
-                for item in results
+                for item in enqueue_candidates
                 if item.outcome == "pass" and item.source_env != args.prod_env
             )
             enqueue_candidates = []
@@ -876,9 +1867,11 @@ def main() -> int:
                 auto_tagged_local,
                 auto_tag_failed,
                 tag_messages,
+                auto_tag_latency_ms,
             ) = tag_local_harbor_from_smoke(
-                queue_payload=queue_payload,
-                results=results,
+                client,
+                queue_index=queue_index,
+                results=enqueue_candidates,
                 service_map=service_map,
                 target_env=args.prod_env,
                 harbor_url=args.local_harbor_url,
@@ -886,6 +1879,7 @@ def main() -> int:
                 harbor_pass=args.local_harbor_pass,
                 tag_prefix=args.local_harbor_prod_tag_prefix,
                 dry_run=args.dry_run,
+                workers=args.concurrency,
             )
             for line in tag_messages:
                 print(line)
@@ -897,26 +1891,27 @@ def main() -> int:
             queue_payload=queue_payload,
             results=enqueue_candidates,
             target_env=args.prod_env,
+            queue_index=queue_index,
         )
         for line in enqueue_messages:
             print(line)
         if auto_enqueued > 0 and not args.dry_run:
             write_yaml(args.queue, queue_payload)
 
-    print(
-        json.dumps(
-            {
-                "passed": passed,
-                "failed": failed,
-                "skipped": skipped,
-                "auto_tagged_local_harbor": auto_tagged_local,
-                "auto_tag_local_harbor_failed": auto_tag_failed,
-                "auto_enqueued_prod": auto_enqueued,
-                "dry_run": args.dry_run,
-                "allow_failures": args.allow_failures,
-            }
-        )
-    )
+    summary = {
+        "passed": passed,
+        "failed": failed,
+        "skipped": skipped,
+        "load_failed": load_failed,
+        "auto_tagged_local_harbor": auto_tagged_local,
+        "auto_tag_local_harbor_failed": auto_tag_failed,
+        "auto_tag_latency_ms": auto_tag_latency_ms,
+        "auto_enqueued_prod": auto_enqueued,
+        "dry_run": args.dry_run,
+        "allow_failures": args.allow_failures,
+    }
+    events.emit("run_end", summary=summary)
+    print(json.dumps(summary))
     return 0 if failed == 0 or args.allow_failures else 1
 
 
@@ -31,6 +31,9 @@ uvx --with pyyaml --with jsonschema python scripts/evidence/validate.py
 uvx --with pyyaml --with jsonschema python scripts/evidence/collect.py --out /tmp/evidence-index.json --summary /tmp/evidence-latest.md
 uvx --with pyyaml python scripts/promoter/queue_metrics.py --queue release/queue.yaml --out /tmp/queue-health.json
 
+echo "[verify] run script tests"
+uvx --with pyyaml --with jsonschema --with pytest python -m pytest -q tests
+
 echo "[verify] run promoter dry-run on local repo"
 python3 scripts/promoter/promote.py --dry-run --local-repo-dir .
 echo "[verify] promoter supports local simulation without Harbor via --skip-registry-check"
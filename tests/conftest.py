@@ -0,0 +1,19 @@
+"""Make the script directories importable the way the scripts import each other."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+for rel in (
+    "scripts/lib",
+    "scripts/evidence",
+    "scripts/promoter",
+    "scripts/smoke",
+    "scripts/factory",
+):
+    path = str(REPO_ROOT / rel)
+    if path not in sys.path:
+        sys.path.insert(0, path)
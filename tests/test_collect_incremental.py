@@ -0,0 +1,56 @@
+"""collect.py --incremental must write what a full collect writes."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+COLLECT = REPO_ROOT / "scripts/evidence/collect.py"
+
+
+def _collect(root: Path, name: str, incremental: bool) -> tuple[bytes, bytes]:
+    out = root / name / "index.json"
+    summary = root / name / "latest.md"
+    cmd = [sys.executable, str(COLLECT), "--out", str(out), "--summary", str(summary)]
+    if incremental:
+        cmd.append("--incremental")
+    subprocess.run(cmd, cwd=root, check=True, capture_output=True)
+    return out.read_bytes(), summary.read_bytes()
+
+
+def _assert_same(root: Path) -> None:
+    assert _collect(root, "inc", incremental=True) == _collect(
+        root, "full", incremental=False
+    )
+
+
+def test_incremental_matches_full_collect(tmp_path: Path) -> None:
+    records = tmp_path / "evidence/records"
+    shutil.copytree(REPO_ROOT / "evidence/records", records)
+    paths = sorted(records.glob("*.yaml"))
+    assert len(paths) >= 3
+    _assert_same(tmp_path)
+    # A second incremental run reuses every record.
+    _assert_same(tmp_path)
+
+    # Added record.
+    added = records / "29990101-zz-added-sha-0000001.yaml"
+    shutil.copyfile(paths[0], added)
+    _assert_same(tmp_path)
+
+    # Changed record, same size: only the content hash can tell.
+    text = paths[1].read_text(encoding="utf-8")
+    changed = text.replace("pass", "fail", 1) if "pass" in text else text.upper()
+    assert changed != text and len(changed) == len(text)
+    stat = paths[1].stat()
+    paths[1].write_text(changed, encoding="utf-8")
+    os.utime(paths[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    _assert_same(tmp_path)
+
+    # Deleted record.
+    paths[2].unlink()
+    _assert_same(tmp_path)
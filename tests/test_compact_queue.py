@@ -0,0 +1,66 @@
+"""compact_queue indexes released digests by queue state, also on rebuild."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import yaml
+
+import compact_queue
+
+
+def _entry(eid: str, status: str, field: str, digest: str) -> dict[str, object]:
+    return {
+        "id": eid,
+        "service": "api",
+        "env": "dev",
+        "status": status,
+        field: "2025-01-05T00:00:00Z",
+        "source": {"digest": digest},
+    }
+
+
+def test_digest_index_follows_queue_state(tmp_path: Path) -> None:
+    queue_path = tmp_path / "queue.yaml"
+    archive_dir = tmp_path / "archive"
+    queue_path.write_text(
+        yaml.safe_dump(
+            {
+                "pending": [],
+                # The status field disagrees with the state on purpose.
+                "promoted": [
+                    _entry("p1", "released", "promotedAt", "sha256:p1"),
+                    _entry("p2", "promoted", "promotedAt", "sha256:p2"),
+                ],
+                "failed": [],
+                "superseded": [
+                    _entry("s1", "promoted", "supersededAt", "sha256:s1"),
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    summary = compact_queue.compact_queue(
+        queue_path,
+        archive_dir,
+        retention_days=30,
+        keep_latest_promoted=0,
+        dry_run=False,
+    )
+    assert summary["archived"] == 3
+
+    index_path = archive_dir / compact_queue.ARCHIVE_INDEX_FILE
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    assert index["ids"] == {"p1": "2025-01", "p2": "2025-01", "s1": "2025-01"}
+    assert index["digests"] == {"api/dev": {"sha256:p1": "p1", "sha256:p2": "p2"}}
+    assert [
+        (state, entry["id"])
+        for state, entry in compact_queue.read_segment(archive_dir / "2025-01.jsonl")
+    ] == [("promoted", "p1"), ("promoted", "p2"), ("superseded", "s1")]
+
+    assert compact_queue.rebuild_index(archive_dir) == 3
+    rebuilt = json.loads(index_path.read_text(encoding="utf-8"))
+    assert rebuilt["ids"] == index["ids"]
+    assert rebuilt["digests"] == index["digests"]
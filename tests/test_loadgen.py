@@ -0,0 +1,163 @@
+"""Load stage: loadgen.run_load against a local stub server."""
+
+from __future__ import annotations
+
+import argparse
+import http.server
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import loadgen
+import run_smoke
+
+
+class _StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *_args: object) -> None:
+        pass
+
+    def do_GET(self) -> None:  # noqa: N802
+        server = self.server
+        with server.lock:  # type: ignore[attr-defined]
+            server.total += 1  # type: ignore[attr-defined]
+            seq = server.total  # type: ignore[attr-defined]
+        # /mixed fails every fourth request the server sees.
+        fail = self.path == "/fail" or (self.path == "/mixed" and seq % 4 == 0)
+        if fail:
+            with server.lock:  # type: ignore[attr-defined]
+                server.failed += 1  # type: ignore[attr-defined]
+        body = b"error" if fail else b"ok" * 512
+        self.send_response(500 if fail else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def stub() -> Iterator[http.server.ThreadingHTTPServer]:
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.lock = threading.Lock()  # type: ignore[attr-defined]
+    server.total = 0  # type: ignore[attr-defined]
+    server.failed = 0  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _url(server: http.server.ThreadingHTTPServer, path: str) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_percentile_nearest_rank() -> None:
+    values = [float(v) for v in range(1, 101)]
+    assert loadgen.percentile(values, 50) == 50.0
+    assert loadgen.percentile(values, 95) == 95.0
+    assert loadgen.percentile(values, 99) == 99.0
+    assert loadgen.percentile([7.0, 3.0, 5.0], 50) == 5.0
+    assert loadgen.percentile([4.0], 99) == 4.0
+
+
+def test_run_load_counts_every_request(stub: http.server.ThreadingHTTPServer) -> None:
+    stats = loadgen.run_load(_url(stub, "/ok"), concurrency=3, duration_seconds=0.5)
+
+    assert stats["requests"] > 0
+    assert stats["requests"] == stub.total  # type: ignore[attr-defined]
+    assert stats["errors"] == 0
+    assert stats["errorRate"] == 0.0
+    assert stats["concurrency"] == 3
+    assert stats["rps"] == pytest.approx(
+        stats["requests"] / stats["durationSeconds"], rel=0.05
+    )
+    assert 0 < stats["p50Ms"] <= stats["p95Ms"] <= stats["p99Ms"]
+
+
+def test_run_load_error_rate(stub: http.server.ThreadingHTTPServer) -> None:
+    stats = loadgen.run_load(_url(stub, "/mixed"), concurrency=2, duration_seconds=0.5)
+
+    assert stats["requests"] == stub.total  # type: ignore[attr-defined]
+    assert stats["errors"] == stub.failed  # type: ignore[attr-defined]
+    assert stats["errorRate"] == round(stats["errors"] / stats["requests"], 4)
+    assert 0.2 <= stats["errorRate"] <= 0.3
+
+
+def test_run_load_unreachable_port() -> None:
+    with http.server.ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler) as closed:
+        port = closed.server_address[1]
+    stats = loadgen.run_load(
+        f"http://127.0.0.1:{port}/", concurrency=1, duration_seconds=0.2
+    )
+    assert stats["requests"] == stats["errors"] > 0
+    assert stats["errorRate"] == 1.0
+    assert "p50Ms" not in stats
+
+
+def test_load_config_is_opt_in() -> None:
+    assert run_smoke.parse_load_config(None) == {"enabled": False}
+    assert run_smoke.parse_load_config(False) == {"enabled": False}
+    assert run_smoke.parse_load_config(True) == {"enabled": True}
+    assert run_smoke.parse_load_config({"concurrency": 2}) == {
+        "enabled": True,
+        "concurrency": 2,
+    }
+    assert run_smoke.parse_load_config({"bogus": 1}) is None
+
+
+def _plan(endpoint: str, load: object) -> run_smoke.TargetPlan:
+    parsed = run_smoke.parse_load_config(load)
+    assert parsed is not None
+    return run_smoke.TargetPlan(
+        service="svc",
+        environment="dev",
+        app="",
+        endpoint=endpoint,
+        queue_id="q",
+        record_path=Path("unused.yaml"),
+        latency_budget_ms={},
+        load=parsed,
+    )
+
+
+def _stage_args(dry_run: bool) -> argparse.Namespace:
+    return argparse.Namespace(
+        prod_env="prod",
+        dry_run=dry_run,
+        tls_insecure=False,
+        ca_file="",
+        load_concurrency=1,
+        load_duration_seconds=0.2,
+        load_min_rps=0,
+        load_max_error_rate=0.01,
+        load_max_p95_ms=0,
+    )
+
+
+def test_load_stage_skips_targets_without_opt_in_and_dry_run(
+    stub: http.server.ThreadingHTTPServer,
+) -> None:
+    results = [
+        run_smoke.TargetResult(
+            outcome="pass",
+            message="ok",
+            service="svc",
+            source_env="dev",
+            source_queue_id="q",
+            plan=_plan(_url(stub, "/ok"), load),
+        )
+        for load in (None, True)
+    ]
+
+    kept, failed, messages = run_smoke.run_load_stage(
+        results, _stage_args(dry_run=True), run_smoke.SmokeEventLog(None)
+    )
+    assert kept == results
+    assert failed == 0
+    assert len(messages) == 1 and "DRY_RUN" in messages[0]
+    assert stub.total == 0  # type: ignore[attr-defined]
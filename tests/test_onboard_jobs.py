@@ -0,0 +1,171 @@
+"""onboard_services --jobs N must write exactly what a serial run writes."""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+import onboard_services
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+IGNORED = shutil.ignore_patterns(".git", "__pycache__", ".cache", ".pytest_cache")
+
+# New services: zz-jobs-api dev/demo share the app base the dev entry
+# scaffolds, so the pooled demo render read files that no longer match.
+NEW_ENTRIES = """
+  - service: zz-jobs-api
+    environment: dev
+    template: service-default
+    image_repo: zz-jobs-api
+    ghcr_org: brunogao
+    harbor_registry: harbor.eu.lingjingwanxiang.cn
+    harbor_project: ljwx
+    overlay_name: zz-jobs-api-dev
+    deploy_namespace: zz-jobs-dev
+    smoke_path: /health
+    container_port: 8000
+    health_path: /health
+    argocd_order: 90
+  - service: zz-jobs-api
+    environment: demo
+    template: service-default
+    image_repo: zz-jobs-api
+    ghcr_org: brunogao
+    harbor_registry: harbor.eu.lingjingwanxiang.cn
+    harbor_project: ljwx
+    overlay_name: zz-jobs-api-demo
+    deploy_namespace: zz-jobs-demo
+    smoke_path: /health
+    container_port: 8000
+    health_path: /health
+    argocd_order: 91
+  - service: zz-jobs-worker
+    environment: dev
+    template: service-default
+    image_repo: zz-jobs-worker
+    ghcr_org: brunogao
+    harbor_registry: harbor.eu.lingjingwanxiang.cn
+    harbor_project: ljwx
+    overlay_name: zz-jobs-worker-dev
+    deploy_namespace: zz-jobs-worker-dev
+    smoke_path: /health
+    container_port: 8000
+    health_path: /health
+    argocd_order: 92
+"""
+
+
+def _tree(root: Path) -> Path:
+    shutil.copytree(REPO_ROOT, root, ignore=IGNORED)
+    catalog = root / "factory/onboarding/services.catalog.yaml"
+    catalog.write_text(
+        catalog.read_text(encoding="utf-8").rstrip("\n") + "\n" + NEW_ENTRIES,
+        encoding="utf-8",
+    )
+    return root
+
+
+def _snapshot(root: Path) -> dict[str, bytes]:
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and "__pycache__" not in path.parts
+    }
+
+
+def _onboard(
+    root: Path, jobs: int, cache: onboard_services.FingerprintCache | None = None
+) -> int:
+    paths = onboard_services.OnboardInputPaths(
+        catalog=root / "factory/onboarding/services.catalog.yaml",
+        service_templates=onboard_services.DEFAULT_SERVICE_TEMPLATES_PATH,
+        ingress_profiles=onboard_services.DEFAULT_INGRESS_PROFILES_PATH,
+        namespace_profiles=onboard_services.DEFAULT_NAMESPACE_PROFILES_PATH,
+        capability_profiles=onboard_services.DEFAULT_CAPABILITY_PROFILES_PATH,
+    )
+    return onboard_services.apply_onboarding(
+        repo_root=root,
+        catalog=onboard_services.load_onboarding_inputs(root, paths),
+        dry_run=False,
+        cluster_bootstrap=True,
+        cluster_kustomization_path=onboard_services.DEFAULT_CLUSTER_KUSTOMIZATION_PATH,
+        deploy_repo_url=onboard_services.DEFAULT_DEPLOY_REPO_URL,
+        deploy_ref="main",
+        jobs=jobs,
+        cache=cache,
+    )
+
+
+def test_parallel_render_matches_serial_bytes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    serial_root = _tree(tmp_path / "serial")
+    parallel_root = _tree(tmp_path / "parallel")
+
+    monkeypatch.chdir(serial_root)
+    serial_changes = _onboard(serial_root, jobs=1)
+
+    # Workers are forked, so only renders redone in this process are counted.
+    rerenders: list[str] = []
+    render = onboard_services.render_entry_artifacts
+
+    def counting_render(repo_root, job, state):  # type: ignore[no-untyped-def]
+        rerenders.append(onboard_services.entry_key(job.resolved_entry.entry))
+        return render(repo_root, job, state)
+
+    monkeypatch.chdir(parallel_root)
+    monkeypatch.setattr(onboard_services, "render_entry_artifacts", counting_render)
+    parallel_changes = _onboard(parallel_root, jobs=2)
+
+    assert serial_changes > 0
+    assert parallel_changes == serial_changes
+    # A later entry read a file an earlier one changed, so it was redone here.
+    assert "zz-jobs-api/demo" in rerenders
+    serial_files = _snapshot(serial_root)
+    parallel_files = _snapshot(parallel_root)
+    assert sorted(parallel_files) == sorted(serial_files)
+    assert [
+        rel for rel, data in serial_files.items() if parallel_files[rel] != data
+    ] == []
+
+    # Both trees are now converged: a second run changes nothing.
+    assert _onboard(parallel_root, jobs=2) == 0
+
+
+def test_cached_run_matches_uncached_and_skips_once_fresh(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    plain_root = _tree(tmp_path / "plain")
+    cached_root = _tree(tmp_path / "cached")
+    cache_path = cached_root / "factory/onboarding/.cache/fingerprints.json"
+
+    monkeypatch.chdir(plain_root)
+    plain_changes = _onboard(plain_root, jobs=1)
+    monkeypatch.chdir(cached_root)
+    cache = onboard_services.FingerprintCache(cache_path, cached_root)
+    cached_changes = _onboard(cached_root, jobs=1, cache=cache)
+    assert cached_changes == plain_changes > 0
+    cached_files = _snapshot(cached_root)
+    cached_files.pop(cache_path.relative_to(cached_root).as_posix())
+    assert cached_files == _snapshot(plain_root)
+
+    renders: list[str] = []
+    render = onboard_services.render_entry_artifacts
+
+    def counting_render(repo_root, job, state):  # type: ignore[no-untyped-def]
+        renders.append(onboard_services.entry_key(job.resolved_entry.entry))
+        return render(repo_root, job, state)
+
+    monkeypatch.setattr(onboard_services, "render_entry_artifacts", counting_render)
+    for jobs in (1, 2):
+        cache = onboard_services.FingerprintCache(cache_path, cached_root)
+        assert _onboard(cached_root, jobs=jobs, cache=cache) == 0
+    assert renders == []
+
+    # Losing a rendered file makes its entry stale again, and only that one.
+    (cached_root / "argocd-apps/92-zz-jobs-worker-dev.yaml").unlink()
+    cache = onboard_services.FingerprintCache(cache_path, cached_root)
+    assert _onboard(cached_root, jobs=1, cache=cache) == 1
+    assert renders == ["zz-jobs-worker/dev"]
@@ -0,0 +1,74 @@
+"""ReleaseQueue's (service, env) index must match a rescan of the queue."""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+
+import promote
+
+
+def _rescan(queue: promote.ReleaseQueue, state: str) -> dict[Any, list[Any]]:
+    groups: dict[Any, list[Any]] = {}
+    for entry in queue.entries(state):
+        groups.setdefault(promote.service_env_key(entry), []).append(entry)
+    return groups
+
+
+def test_service_env_index_tracks_every_mutation() -> None:
+    rng = random.Random(20260517)
+    services, envs = ("api", "web", "worker"), ("dev", "demo", "prod")
+
+    def new_entry() -> dict[str, Any]:
+        entry = {"service": rng.choice(services), "env": rng.choice(envs)}
+        # Some entries have no id or reuse one, which takes the private-key path.
+        if rng.random() < 0.8:
+            entry["id"] = f"q{rng.randint(0, 30)}"
+        return entry
+
+    queue = promote.ReleaseQueue(
+        {state: [new_entry() for _ in range(20)] for state in promote.QUEUE_STATES}
+    )
+    for _ in range(2000):
+        state = rng.choice(promote.QUEUE_STATES)
+        entries = queue.entries(state)
+        op = rng.choice(("upsert", "replace", "remove", "move", "reorder"))
+        if op == "upsert" or not entries:
+            queue.upsert(state, new_entry())
+        elif op == "replace":
+            # Same id, sometimes moved to another (service, env).
+            replacement = dict(rng.choice(entries))
+            if rng.random() < 0.3:
+                replacement["service"] = rng.choice(services)
+            queue.upsert(state, replacement)
+        elif op == "remove":
+            queue.remove(state, rng.choice(entries))
+        elif op == "move":
+            queue.move(rng.choice(entries), state, rng.choice(promote.QUEUE_STATES))
+        else:
+            queue.reorder(state, rng.sample(entries, rng.randint(0, len(entries))))
+        for check in promote.QUEUE_STATES:
+            assert queue.service_env_groups(check) == _rescan(queue, check)
+
+
+def test_normalize_pending_supersedes_older_per_service_env() -> None:
+    pending = [
+        {"id": i, "service": s, "env": e, "createdAt": f"2026-01-0{day}T00:00:00Z"}
+        for i, s, e, day in (
+            ("a1", "api", "dev", 2),
+            ("w1", "web", "dev", 1),
+            ("a0", "api", "dev", 1),
+            ("a2", "api", "prod", 1),
+        )
+    ]
+    queue, changed = promote.normalize_pending(
+        promote.ReleaseQueue({"pending": pending}), "2026-01-03T00:00:00Z"
+    )
+    assert changed
+    assert [e["id"] for e in queue.entries("pending")] == ["a1", "w1", "a2"]
+    assert [e["id"] for e in queue.entries("superseded")] == ["a0"]
+    assert list(queue.service_env_groups("pending")) == [
+        ("api", "dev"),
+        ("web", "dev"),
+        ("api", "prod"),
+    ]
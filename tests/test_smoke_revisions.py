@@ -0,0 +1,54 @@
+"""Argo early-fail matches the promoted commit and the evidence commits on top."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import run_smoke
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def _commit(repo: Path, rel: str, text: str) -> str:
+    path = repo / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    _git(repo, "add", rel)
+    _git(repo, "commit", "-q", "-m", rel)
+    return _git(repo, "rev-parse", "HEAD")
+
+
+def _degraded(revision: str) -> dict[str, object]:
+    return {
+        "sync": {"status": "Synced", "revision": revision},
+        "health": {"status": "Degraded"},
+    }
+
+
+def test_deploy_revisions_follow_evidence_only_commits(tmp_path: Path) -> None:
+    _git(tmp_path, "init", "-q")
+    promote = _commit(tmp_path, "apps/api/kustomization.yaml", "v1\n")
+    evidence = _commit(tmp_path, "evidence/records/api.yaml", "deploy: 1\n")
+    smoke = _commit(tmp_path, "evidence/index.json", "[]\n")
+    later = _commit(tmp_path, "apps/api/kustomization.yaml", "v2\n")
+    later_evidence = _commit(tmp_path, "evidence/records/api-2.yaml", "deploy: 2\n")
+
+    records = tmp_path / "evidence/records"
+    assert run_smoke.deploy_revisions(promote, records) == (promote, evidence, smoke)
+    assert run_smoke.deploy_revisions(later, records) == (later, later_evidence)
+    assert run_smoke.deploy_revisions("0" * 40, records) == ("0" * 40,)
+    assert run_smoke.deploy_revisions("", records) == ()
+
+    expected = run_smoke.deploy_revisions(promote, records)
+    assert run_smoke.argocd_terminal_failure(_degraded(evidence), expected)
+    assert run_smoke.argocd_terminal_failure(_degraded(later), expected) == ""
+    assert run_smoke.argocd_terminal_failure(_degraded(evidence), ()) == ""
@@ -0,0 +1,82 @@
+"""yaml_io must emit exactly what the pure-Python SafeDumper emits."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+
+import yaml_io
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DUMP_OPTIONS = (
+    {"sort_keys": False, "allow_unicode": True},
+    {"sort_keys": False, "allow_unicode": False},
+)
+
+
+def _repo_yaml_documents() -> list[tuple[str, list[Any]]]:
+    found: list[tuple[str, list[Any]]] = []
+    for pattern in ("*.yaml", "*.yml"):
+        for path in sorted(REPO_ROOT.rglob(pattern)):
+            if ".git" in path.parts:
+                continue
+            try:
+                text = path.read_text(encoding="utf-8")
+                docs = list(yaml.load_all(text, Loader=yaml.SafeLoader))  # noqa: S506
+            except (OSError, UnicodeDecodeError, yaml.YAMLError):
+                continue
+            found.append((path.relative_to(REPO_ROOT).as_posix(), docs))
+    return found
+
+
+REPO_DOCUMENTS = _repo_yaml_documents()
+
+
+def _pure_dump_all(documents: list[Any], **options: Any) -> str:
+    return yaml.dump_all(documents, Dumper=yaml.SafeDumper, **options)
+
+
+@pytest.mark.parametrize("options", DUMP_OPTIONS, ids=["unicode", "ascii"])
+def test_repo_yaml_round_trips_identically(options: dict[str, Any]) -> None:
+    assert REPO_DOCUMENTS
+    mismatched = [
+        rel
+        for rel, docs in REPO_DOCUMENTS
+        if yaml_io.safe_dump_all(docs, **options) != _pure_dump_all(docs, **options)
+        or [yaml_io.safe_load(yaml_io.safe_dump(doc, **options)) for doc in docs]
+        != docs
+    ]
+    assert mismatched == []
+
+
+@pytest.mark.parametrize("options", DUMP_OPTIONS, ids=["unicode", "ascii"])
+def test_non_ascii_text_matches_pure_emitter(options: dict[str, Any]) -> None:
+    rng = random.Random(20260501)
+    alphabet = "abc xyz-_:#./é中文ü…日本" + "".join(chr(i) for i in range(0x20, 0x7F))
+    for _ in range(500):
+        data = {
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 8))): [
+                "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 160)))
+                for _ in range(3)
+            ]
+            for _ in range(3)
+        }
+        assert yaml_io.safe_dump(data, **options) == yaml.dump(
+            data, Dumper=yaml.SafeDumper, **options
+        )
+
+
+def test_fast_path_needs_unicode_or_ascii_and_known_options() -> None:
+    if not yaml_io.HAS_LIBYAML:
+        pytest.skip("PyYAML built without libyaml")
+    assert yaml_io._dumper_for([{"k": "v"}], {}) is yaml_io.FastSafeDumper
+    assert yaml_io._dumper_for([{"k": "中文"}], {}) is yaml.SafeDumper
+    assert (
+        yaml_io._dumper_for([{"k": "中文"}], {"allow_unicode": True})
+        is yaml_io.FastSafeDumper
+    )
+    assert yaml_io._dumper_for([{"k": "v"}], {"width": 40}) is yaml.SafeDumper